@@ -0,0 +1,95 @@
+# async_trader.py
+# Asyncio twin of Trader, lets market-data and account calls run concurrently on one event loop.
+# Author: Calvin Seamons
+# Last Updated: 18 October, 2026
+
+# Imports
+# ------------------ #
+import asyncio
+import urllib.parse
+
+# From Imports
+# ------------------ #
+from concurrent.futures import ThreadPoolExecutor
+
+# Local File Imports
+# ------------------ #
+from log_obj import Log
+
+class AsyncTrader:
+    """Awaitable Trader calls sharing the Tokens credentials and pooled Client of a sync Trader.
+
+    Calls run on worker threads over the shared keep-alive session and are bounded by a semaphore,
+    so it can be awaited from the same asyncio.run loop the streamer runs on.
+    """
+
+    def __init__(self, tokens, client=None, max_concurrency=16):
+        self.tokens = tokens
+        self.client = client if client is not None else tokens.client
+        self.log = Log()
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        # Own executor sized to the semaphore, the loop default is too small to keep the pool busy.
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="async-trader")
+
+    @classmethod
+    def from_trader(cls, trader, max_concurrency=16):
+        return cls(trader.tokens, client=trader.client, max_concurrency=max_concurrency)
+
+    def _params_parser(self, params: dict):
+        for key in list(params.keys()):
+            if params[key] is None: del params[key]
+        return params
+
+    async def _get(self, path, params=None):
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            response = await loop.run_in_executor(self._executor, lambda: self.client.get(path, params=params))
+        response.raise_for_status()
+        return response.json()
+
+    async def quote(self, symbol_id: str, fields: str = None) -> dict:
+        return await self._get(f'/marketdata/v1/{urllib.parse.quote(symbol_id, safe="")}/quotes',
+                               params=self._params_parser({'fields': fields}))
+
+    async def price_history(self, symbol: str, period_type: str = None, period: int = None,
+                            frequency_type: str = None, frequency: int = None,
+                            start_date: int = None, end_date: int = None,
+                            need_extended_hours_data: bool = None, need_previous_close: bool = None) -> dict:
+        # Dates are epoch milliseconds, same as the pricehistory endpoint expects.
+        return await self._get('/marketdata/v1/pricehistory',
+                               params=self._params_parser({'symbol': symbol, 'periodType': period_type,
+                                                           'period': period, 'frequencyType': frequency_type,
+                                                           'frequency': frequency, 'startDate': start_date,
+                                                           'endDate': end_date,
+                                                           'needExtendedHoursData': need_extended_hours_data,
+                                                           'needPreviousClose': need_previous_close}))
+
+    async def accounts(self, fields: str = None) -> list:
+        return await self._get('/trader/v1/accounts', params=self._params_parser({'fields': fields}))
+
+    async def orders(self, account_hash: str = None, from_entered_time: str = None,
+                     to_entered_time: str = None, max_results: int = None, status: str = None) -> list:
+        # Without an account hash schwab returns orders for every linked account.
+        path = f'/trader/v1/accounts/{account_hash}/orders' if account_hash else '/trader/v1/orders'
+        return await self._get(path, params=self._params_parser({'fromEnteredTime': from_entered_time,
+                                                                 'toEnteredTime': to_entered_time,
+                                                                 'maxResults': max_results,
+                                                                 'status': status}))
+
+    async def gather(self, method, items, return_exceptions=True, **kwargs) -> list:
+        """Run method(item, **kwargs) for every item concurrently, results come back in input order.
+
+        With return_exceptions a failed item holds its exception instead of failing the whole batch.
+        """
+        return await asyncio.gather(*(method(item, **kwargs) for item in items),
+                                    return_exceptions=return_exceptions)
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
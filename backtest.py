@@ -0,0 +1,415 @@
+# backtest.py
+# Backtesting over stored candles, an event mode that runs live Strategy classes and a vectorized mode for parameter sweeps.
+# Author: Calvin Seamons
+# Last Updated: 18 October, 2026
+
+# Imports
+# ------------------ #
+import itertools
+import math
+import numpy as np
+import os
+
+# From Imports
+# ------------------ #
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+# Local File Imports
+# ------------------ #
+import indicators
+from orders import Order
+from strategy import Bar
+
+DAY_MS = 86400000
+BUY_INSTRUCTIONS = {"BUY", "BUY_TO_COVER", "BUY_TO_OPEN", "BUY_TO_CLOSE"}
+
+Fill = namedtuple("Fill", ("order_id", "datetime", "symbol", "quantity", "price", "commission"))
+
+# ----------------------------------------- Cost Models ----------------------------------------- #
+
+class PerShare:
+    def __init__(self, rate=0.005, minimum=1.0):
+        self.rate = rate
+        self.minimum = minimum
+
+    def __call__(self, quantity, price):
+        return max(abs(quantity) * self.rate, self.minimum)
+
+class PerOrder:
+    def __init__(self, fee=0.0):
+        self.fee = fee
+
+    def __call__(self, quantity, price):
+        return self.fee
+
+class PercentOfValue:
+    def __init__(self, rate=0.0005):
+        self.rate = rate
+
+    def __call__(self, quantity, price):
+        return abs(quantity) * price * self.rate
+
+class BpsSlippage:
+    """Market and stop fills move bps against us, limit fills are at the limit."""
+
+    def __init__(self, bps=1.0):
+        self.bps = bps
+
+    def __call__(self, price, side, quantity, bar):
+        return price * (1 + side * self.bps / 10000)
+
+class SpreadSlippage:
+    """Half of a fixed spread against us on every market and stop fill."""
+
+    def __init__(self, spread=0.01):
+        self.spread = spread
+
+    def __call__(self, price, side, quantity, bar):
+        return price + side * self.spread / 2
+
+# ----------------------------------------- Event Mode ------------------------------------------ #
+
+class _SimOrder:
+    __slots__ = ("order_id", "symbol", "side", "quantity", "order_type", "price", "stop_price", "duration",
+                 "children", "group", "eligible_after", "session_day", "triggered", "status")
+
+    def __init__(self, order_id, payload, eligible_after):
+        if payload.get("orderStrategyType") == "OCO":
+            raise ValueError("OCO orders are submitted through Backtest.submit, not built here.")
+        leg = payload["orderLegCollection"][0]
+        self.order_id = order_id
+        self.symbol = leg["instrument"]["symbol"]
+        self.side = 1 if leg["instruction"] in BUY_INSTRUCTIONS else -1
+        self.quantity = float(leg.get("quantity", payload.get("quantity")))
+        self.order_type = payload.get("orderType", "MARKET")
+        if self.order_type == "TRAILING_STOP":
+            raise ValueError("TRAILING_STOP orders aren't simulated.")
+        self.price = float(payload["price"]) if payload.get("price") is not None else None
+        self.stop_price = float(payload["stopPrice"]) if payload.get("stopPrice") is not None else None
+        self.duration = payload.get("duration", "DAY")
+        self.children = payload.get("childOrderStrategies") or () # TRIGGER children, sent once this fills
+        self.group = None # OCO siblings share one list
+        self.eligible_after = eligible_after # Only bars stamped after the one it was submitted on can fill it.
+        self.session_day = None
+        self.triggered = False
+        self.status = "WORKING"
+
+class BacktestContext:
+    """ctx handed to Strategy hooks during a backtest, same surface as strategy.LiveContext."""
+
+    def __init__(self, engine):
+        self._engine = engine
+        self.now = None
+
+    def submit(self, order):
+        return self._engine.submit(order)
+
+    def cancel(self, order_id):
+        return self._engine.cancel(order_id)
+
+    def position(self, symbol):
+        return self._engine.positions.get(symbol, 0.0)
+
+    @property
+    def cash(self):
+        return self._engine.cash
+
+    def history(self, symbol, bars=None):
+        columns = self._engine.data[symbol]
+        end = self._engine.cursor[symbol] + 1
+        start = 0 if bars is None else max(0, end - bars)
+        return {name: column[start:end] for name, column in columns.items()}
+
+class BacktestResult:
+    def __init__(self, timestamps, equity, fills, commission, bars_per_year):
+        self.timestamps = timestamps
+        self.equity = equity
+        self.fills = fills
+        self.commission = commission
+        self.bars_per_year = bars_per_year
+
+    def stats(self) -> dict:
+        equity = self.equity
+        if len(equity) < 2:
+            return {'total_return': 0.0, 'sharpe': 0.0, 'max_drawdown': 0.0, 'fills': len(self.fills),
+                    'commission': self.commission}
+        returns = np.diff(equity) / equity[:-1]
+        return {'total_return': float(equity[-1] / equity[0] - 1), 'sharpe': _sharpe(returns, self.bars_per_year),
+                'max_drawdown': float(_max_drawdown(equity)), 'fills': len(self.fills),
+                'commission': self.commission}
+
+class Backtest:
+    """Replays candles through a Strategy with simulated fills.
+
+    data is {symbol: {column: numpy array}}, what PriceHistoryStore.read/get or Trader.price_history_arrays
+    return. Bars from every symbol are merged into one timeline. An order placed on a bar can only fill on a
+    later bar of its symbol:
+      MARKET            next open
+      LIMIT             open if it's already through the limit, else the limit if the bar trades through it
+      STOP              open if it gapped through the stop, else the stop, then filled like a market order
+      STOP_LIMIT        becomes a LIMIT once the stop is touched, can fill on that same bar
+      *_ON_CLOSE        that bar's close, LIMIT_ON_CLOSE only if the close is inside the limit
+    DAY orders live through the session of the first bar they can fill on, FILL_OR_KILL and
+    IMMEDIATE_OR_CANCEL only get that one bar, GOOD_TILL_CANCEL stays until filled or cancelled.
+    TRIGGER children start working after their parent fills, OCO siblings cancel each other.
+    """
+
+    def __init__(self, data, strategy, cash=100000.0, commission=None, slippage=None, bars_per_year=252):
+        self.data = {symbol: {name: np.asarray(column) for name, column in columns.items()}
+                     for symbol, columns in data.items()}
+        self.strategy = strategy
+        self.starting_cash = cash
+        self.commission = commission if commission is not None else PerOrder(0.0)
+        self.slippage = slippage if slippage is not None else BpsSlippage(0.0)
+        self.bars_per_year = bars_per_year
+
+    @classmethod
+    def from_store(cls, store, strategy, start=None, end=None, **kwargs):
+        """Candles for every strategy.symbols straight out of a PriceHistoryStore, no network."""
+        data = {symbol: store.read(symbol, strategy.frequency_type, strategy.frequency, start, end)
+                for symbol in strategy.symbols}
+        return cls(data, strategy, **kwargs)
+
+    # --- order handling --- #
+    def submit(self, order):
+        payload = order.payload if isinstance(order, Order) else order
+        if payload.get("orderStrategyType") == "OCO":
+            group = []
+            for child in payload["childOrderStrategies"]:
+                group.append(self._add(child))
+            for sim in group:
+                sim.group = group
+            return group[0].order_id
+        return self._add(payload).order_id
+
+    def _add(self, payload):
+        self._next_id += 1
+        sim = _SimOrder(self._next_id, payload, self._now)
+        if sim.symbol not in self.data:
+            raise ValueError(f"No candles loaded for {sim.symbol}.")
+        self.working.setdefault(sim.symbol, []).append(sim)
+        self.orders[sim.order_id] = sim
+        return sim
+
+    def cancel(self, order_id):
+        sim = self.orders.get(order_id)
+        if sim is not None and sim.status == "WORKING":
+            sim.status = "CANCELED"
+        return order_id
+
+    def _fill_price(self, sim, bar):
+        side = sim.side
+        o, h, l, c = bar.open, bar.high, bar.low, bar.close
+        if sim.order_type in ("MARKET_ON_CLOSE", "LIMIT_ON_CLOSE"):
+            if sim.order_type == "LIMIT_ON_CLOSE" and (c - sim.price) * side > 0:
+                return None, False
+            return c, sim.order_type == "MARKET_ON_CLOSE"
+        if sim.order_type == "MARKET":
+            return o, True
+        reference = o
+        if sim.order_type in ("STOP", "STOP_LIMIT") and not sim.triggered:
+            stop = sim.stop_price
+            if side > 0 and h < stop or side < 0 and l > stop:
+                return None, False
+            sim.triggered = True
+            reference = max(o, stop) if side > 0 else min(o, stop)
+            if sim.order_type == "STOP":
+                return reference, True
+        limit = sim.price
+        if side > 0:
+            if reference <= limit:
+                return reference, False
+            return (limit, False) if l <= limit else (None, False)
+        if reference >= limit:
+            return reference, False
+        return (limit, False) if h >= limit else (None, False)
+
+    def _process(self, symbol, bar, stamp, day):
+        orders = self.working.pop(symbol, None)
+        if not orders:
+            return
+        still_working = []
+        for sim in orders:
+            if sim.status != "WORKING":
+                continue
+            if sim.eligible_after >= stamp:
+                still_working.append(sim)
+                continue
+            if sim.session_day is None:
+                sim.session_day = day
+            if sim.duration == "DAY" and day != sim.session_day:
+                sim.status = "EXPIRED"
+                continue
+            price, slips = self._fill_price(sim, bar)
+            if price is None:
+                if sim.duration in ("FILL_OR_KILL", "IMMEDIATE_OR_CANCEL"):
+                    sim.status = "EXPIRED"
+                else:
+                    still_working.append(sim)
+                continue
+            if slips:
+                price = self.slippage(price, sim.side, sim.quantity, bar)
+            self._execute(sim, float(price), stamp)
+            for child in sim.children: # TRIGGER children can fill from the next bar on.
+                self.submit(child)
+        self.working[symbol] = still_working + self.working.get(symbol, [])
+
+    def _execute(self, sim, price, stamp):
+        quantity = sim.side * sim.quantity
+        fee = self.commission(sim.quantity, price)
+        self.cash -= quantity * price + fee
+        self.positions[sim.symbol] = self.positions.get(sim.symbol, 0.0) + quantity
+        self._held[self._index[sim.symbol]] += quantity
+        self.total_commission += fee
+        sim.status = "FILLED"
+        self.fills.append(Fill(sim.order_id, stamp, sim.symbol, quantity, price, fee))
+        if sim.group is not None:
+            for sibling in sim.group:
+                if sibling is not sim and sibling.status == "WORKING":
+                    sibling.status = "CANCELED"
+
+    # --- main loop --- #
+    def run(self) -> BacktestResult:
+        self.cash = float(self.starting_cash)
+        self.positions = {}
+        self.fills = []
+        self.orders = {}
+        self.working = {}
+        self.total_commission = 0.0
+        self._next_id = 0
+        self._now = -1
+        self.cursor = {}
+        ctx = BacktestContext(self)
+
+        symbols = list(self.data)
+        self._index = {symbol: i for i, symbol in enumerate(symbols)}
+        self._held = np.zeros(len(symbols))
+        last_close = np.full(len(symbols), np.nan)
+        stamps = [self.data[symbol]['datetime'] for symbol in symbols]
+        # One merged timeline, stable sort keeps symbols in a fixed order within a timestamp.
+        all_stamps = np.concatenate(stamps) if stamps else np.empty(0, dtype=np.int64)
+        owners = np.concatenate([np.full(len(s), i) for i, s in enumerate(stamps)]) if stamps else np.empty(0, dtype=np.int64)
+        rows = np.concatenate([np.arange(len(s)) for s in stamps]) if stamps else np.empty(0, dtype=np.int64)
+        order = np.argsort(all_stamps, kind='stable')
+
+        timestamps, equity = [], []
+        self.strategy.on_start(ctx)
+        for position, k in enumerate(order):
+            symbol = symbols[owners[k]]
+            row = int(rows[k])
+            columns = self.data[symbol]
+            bar = Bar(*(columns[name][row] for name in Bar._fields))
+            stamp = int(bar.datetime)
+            self._now = stamp # Anything submitted from here on waits for a later bar.
+            self.cursor[symbol] = row
+            self._process(symbol, bar, stamp, stamp // DAY_MS)
+            last_close[self._index[symbol]] = bar.close
+            ctx.now = stamp
+            self.strategy.on_bar(ctx, symbol, bar)
+            if position + 1 == len(order) or all_stamps[order[position + 1]] != stamp:
+                timestamps.append(stamp)
+                equity.append(self.cash + float(np.nansum(self._held * last_close)))
+        self.strategy.on_stop(ctx)
+        return BacktestResult(np.array(timestamps, dtype=np.int64), np.array(equity), self.fills,
+                              self.total_commission, self.bars_per_year)
+
+# ----------------------------------------- Vectorized Mode ------------------------------------- #
+
+def _sharpe(returns, bars_per_year):
+    std = float(np.std(returns))
+    return 0.0 if std == 0 or math.isnan(std) else float(np.mean(returns) / std * math.sqrt(bars_per_year))
+
+def _max_drawdown(equity, axis=-1):
+    peak = np.maximum.accumulate(equity, axis=axis)
+    return np.max((peak - equity) / peak, axis=axis)
+
+def run_vectorized(close, signal, commission_bps=0.0, slippage_bps=0.0, bars_per_year=252) -> dict:
+    """Evaluate target positions over (symbols, time) arrays in one shot.
+
+    signal[:, t] is the position (1 long, 0 flat, -1 short, fractions allowed) decided on bar t's close and
+    held from t to t+1, so there's no lookahead. Costs are charged on every change in position.
+    Returns per symbol arrays: equity curve, total_return, sharpe, max_drawdown and turnover.
+    """
+    close = np.atleast_2d(np.asarray(close, dtype=np.float64))
+    signal = np.nan_to_num(np.atleast_2d(np.asarray(signal, dtype=np.float64)), nan=0.0)
+    returns = np.zeros_like(close)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns[:, 1:] = close[:, 1:] / close[:, :-1] - 1
+    returns = np.nan_to_num(returns, nan=0.0, posinf=0.0, neginf=0.0)
+
+    held = np.zeros_like(signal)
+    held[:, 1:] = signal[:, :-1]
+    trades = np.abs(np.diff(held, axis=1, prepend=0.0))
+    strategy_returns = held * returns - trades * (commission_bps + slippage_bps) / 10000
+    equity = np.cumprod(1 + strategy_returns, axis=1)
+
+    mean = strategy_returns.mean(axis=1)
+    std = strategy_returns.std(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = np.where(std > 0, mean / std * math.sqrt(bars_per_year), 0.0)
+    return {'equity': equity, 'total_return': equity[:, -1] - 1, 'sharpe': sharpe,
+            'max_drawdown': _max_drawdown(equity), 'turnover': trades.sum(axis=1)}
+
+def hold_until(entries, exits):
+    """1 from each entry until the next exit, forward filled without a python loop."""
+    entries = np.asarray(entries, dtype=bool)
+    exits = np.asarray(exits, dtype=bool)
+    events = np.where(entries, 1.0, np.where(exits, 0.0, np.nan))
+    positions = np.arange(events.shape[-1])
+    last = np.where(~np.isnan(events), positions, 0)
+    np.maximum.accumulate(last, axis=-1, out=last)
+    filled = np.take_along_axis(events, last, axis=-1)
+    return np.nan_to_num(filled, nan=0.0)
+
+def sma_cross(columns, fast=10, slow=50):
+    """Long while the fast SMA is above the slow one."""
+    close = columns['close']
+    return (indicators.sma(close, fast) > indicators.sma(close, slow)).astype(np.float64)
+
+def rsi_reversion(columns, window=14, low=30, high=70):
+    """Buy when RSI drops under low, sell once it gets over high."""
+    value = indicators.rsi(columns['close'], window)
+    return hold_until(value < low, value > high)
+
+_worker = {}
+
+def _usable_cpus():
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0)) # Respects taskset/cgroup pinning, cpu_count doesn't.
+    return os.cpu_count() or 1
+
+def _init_worker(columns, signal, costs):
+    _worker.update(columns=columns, signal=signal, costs=costs)
+
+def _evaluate(batch):
+    out = []
+    for params in batch:
+        result = run_vectorized(_worker['columns']['close'], _worker['signal'](_worker['columns'], **params),
+                                **_worker['costs'])
+        out.append({'params': params, 'sharpe': float(np.mean(result['sharpe'])),
+                    'total_return': float(np.mean(result['total_return'])),
+                    'max_drawdown': float(np.max(result['max_drawdown'])),
+                    'per_symbol_return': result['total_return'].tolist()})
+    return out
+
+def sweep(columns, signal, grid, processes=None, commission_bps=0.0, slippage_bps=0.0, bars_per_year=252) -> list:
+    """Run signal(columns, **params) for every combination in grid across cores, best sharpe first.
+
+    columns is {field: (symbols, time) array}, build it with indicators.stack. signal has to be a module level
+    function so worker processes can import it. Workers get the arrays once at startup, not per task.
+    """
+    names = list(grid)
+    combos = [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+    costs = {'commission_bps': commission_bps, 'slippage_bps': slippage_bps, 'bars_per_year': bars_per_year}
+    processes = processes or _usable_cpus()
+    if processes == 1 or len(combos) == 1:
+        _init_worker(columns, signal, costs)
+        results = _evaluate(combos)
+    else:
+        size = max(1, math.ceil(len(combos) / (processes * 4)))
+        batches = [combos[i:i + size] for i in range(0, len(combos), size)]
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                 initargs=(columns, signal, costs)) as pool:
+            results = [row for batch in pool.map(_evaluate, batches) for row in batch]
+    return sorted(results, key=lambda row: row['sharpe'], reverse=True)
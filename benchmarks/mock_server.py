@@ -0,0 +1,297 @@
+# mock_server.py
+# Local stand in for the schwab api, enough of oauth, accounts, quotes, pricehistory, orders and the streamer to run the trader offline.
+# Run from the repo root: python3 benchmarks/mock_server.py --port 8182 --latency 0.02 --inject-429 0.05
+# Author: Calvin Seamons
+# Last Updated: 18 October, 2026
+
+# Imports
+# ------------------ #
+import argparse
+import base64
+import itertools
+import json
+import random
+import secrets
+import sys
+import threading
+import time
+import urllib.parse
+
+# From Imports
+# ------------------ #
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DAY_MS = 86400000
+
+class MockSchwab:
+    """Fake schwab with knobs for latency, payload size and injected 429/401s.
+
+    Access tokens it hands out expire after token_ttl seconds and anything else gets a 401, so the
+    client's refresh path runs for real. Payloads are built once per shape and served from memory so
+    the server stays out of the way of what's being measured.
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, candles=1000, accounts=1, positions=20,
+                 inject_429=0.0, inject_401=0.0, retry_after=1, token_ttl=1800, seed=None, stream_interval=0.05):
+        self.latency = latency
+        self.jitter = jitter
+        self.candles = candles
+        self.positions = positions
+        self.inject_429 = inject_429
+        self.inject_401 = inject_401
+        self.retry_after = retry_after
+        self.token_ttl = token_ttl
+        self.random = random.Random(seed)
+        self.accounts = [(f"{10000000 + i}", f"MOCKHASH{i:04d}") for i in range(accounts)]
+        self.tokens = {} # access token -> expiry
+        self.refresh_tokens = set()
+        self.orders = {hash_value: [] for _, hash_value in self.accounts}
+        self.order_ids = itertools.count(1000)
+        self.requests = 0
+        self.lock = threading.Lock()
+        self._payloads = {}
+        self.server = None
+        self.stream_interval = stream_interval
+        self.streamer = None # mock_streamer.MockStreamer, started with the http server
+
+    # --- tokens --- #
+    def issue(self, access_token=None, refresh_token=None):
+        """Register a token pair, the benchmark seeds its install path with one of these."""
+        access_token = access_token or secrets.token_urlsafe(24)
+        refresh_token = refresh_token or secrets.token_urlsafe(24)
+        with self.lock:
+            self.tokens[access_token] = time.time() + self.token_ttl
+            self.refresh_tokens.add(refresh_token)
+        return {'access_token': access_token, 'refresh_token': refresh_token, 'token_type': 'Bearer',
+                'expires_in': self.token_ttl, 'scope': 'api', 'id_token': 'mock'}
+
+    def authorized(self, header):
+        if not header or not header.startswith('Bearer '):
+            return False
+        with self.lock:
+            expires = self.tokens.get(header[7:])
+        return expires is not None and expires > time.time()
+
+    # --- payloads --- #
+    def _cached(self, key, build):
+        payload = self._payloads.get(key)
+        if payload is None:
+            payload = self._payloads.setdefault(key, json.dumps(build(), separators=(',', ':')).encode())
+        return payload
+
+    def quote(self, symbol):
+        seed = sum(map(ord, symbol))
+        last = 20 + seed % 400 + (seed % 97) / 100
+        return {'assetMainType': 'EQUITY', 'symbol': symbol, 'realtime': True, 'ssid': seed,
+                'quote': {'bidPrice': round(last - 0.01, 2), 'askPrice': round(last + 0.01, 2), 'lastPrice': last,
+                          'bidSize': 100, 'askSize': 200, 'lastSize': 50, 'openPrice': last, 'highPrice': last + 1,
+                          'lowPrice': last - 1, 'closePrice': last, 'totalVolume': 1000000 + seed,
+                          'netChange': 0.0, 'mark': last, 'quoteTime': int(time.time() * 1000),
+                          'tradeTime': int(time.time() * 1000)},
+                'reference': {'description': f"{symbol} Mock Inc", 'exchange': 'Q', 'exchangeName': 'NASDAQ'}}
+
+    def price_history(self, symbol, start, end, count):
+        if start is None and end is None:
+            end = 1760000000000
+        if end is None:
+            end = start + (count - 1) * DAY_MS
+        if start is None:
+            start = end - (count - 1) * DAY_MS
+        start -= start % DAY_MS
+        days = range(start, end + 1, DAY_MS)
+        candles = []
+        price = 100.0
+        for i, day in enumerate(itertools.islice(days, count)):
+            price += ((i * 7919) % 13 - 6) / 10
+            candles.append({'open': price, 'high': price + 1.25, 'low': price - 1.25, 'close': price + 0.5,
+                            'volume': 100000 + (i * 104729) % 50000, 'datetime': day})
+        return {'symbol': symbol, 'empty': not candles, 'candles': candles}
+
+    def account(self, number):
+        positions = [{'shortQuantity': 0, 'averagePrice': 10 + i, 'longQuantity': 1 + i % 9,
+                      'marketValue': (10 + i) * (1 + i % 9), 'currentDayProfitLoss': 0,
+                      'instrument': {'assetType': 'EQUITY', 'cusip': f"{i:09d}", 'symbol': f"SYM{i}"}}
+                     for i in range(self.positions)]
+        return {'securitiesAccount': {'type': 'MARGIN', 'accountNumber': number, 'roundTrip': 0,
+                                      'positions': positions,
+                                      'currentBalances': {'cashBalance': 10000.0, 'buyingPower': 20000.0,
+                                                          'equity': 30000.0, 'liquidationValue': 30000.0,
+                                                          'longMarketValue': 20000.0, 'shortMarketValue': 0.0}}}
+
+    # --- serving --- #
+    def start(self, host="127.0.0.1", port=0):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1" # Keep-alive, same as the real api.
+            disable_nagle_algorithm = True # Headers and body go out as separate writes, don't let them wait on an ack.
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                mock.handle(self, 'GET')
+
+            def do_POST(self):
+                mock.handle(self, 'POST')
+
+            def do_DELETE(self):
+                mock.handle(self, 'DELETE')
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name="mock-schwab", daemon=True).start()
+        from mock_streamer import MockStreamer # Same login rule as the http side, the access token has to be live.
+        self.streamer = MockStreamer(lambda token: self.authorized(f"Bearer {token}"), interval=self.stream_interval)
+        self.streamer.start(host)
+        return self.server.server_port
+
+    def stop(self):
+        if self.streamer is not None:
+            self.streamer.stop()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+
+    def url(self):
+        return f"http://127.0.0.1:{self.server.server_port}"
+
+    def reply(self, handler, status, body=b'', headers=None):
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body, separators=(',', ':')).encode()
+        handler.send_response(status)
+        handler.send_header('Content-Type', 'application/json')
+        handler.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            handler.send_header(key, value)
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def handle(self, handler, method):
+        with self.lock:
+            self.requests += 1
+        parsed = urllib.parse.urlsplit(handler.path)
+        path = parsed.path.strip('/')
+        query = dict(urllib.parse.parse_qsl(parsed.query))
+        length = int(handler.headers.get('Content-Length') or 0)
+        body = handler.rfile.read(length) if length else b''
+
+        if self.latency or self.jitter:
+            time.sleep(self.latency + self.random.random() * self.jitter)
+        if self.inject_429 and self.random.random() < self.inject_429:
+            return self.reply(handler, 429, {'errors': [{'title': 'Too Many Requests'}]},
+                              {'Retry-After': str(self.retry_after)})
+
+        if path == 'v1/oauth/token' and method == 'POST':
+            return self.oauth(handler, body)
+        if not self.authorized(handler.headers.get('Authorization')) or \
+                (self.inject_401 and self.random.random() < self.inject_401):
+            return self.reply(handler, 401, {'errors': [{'title': 'Unauthorized'}]})
+
+        parts = path.split('/')
+        if path == 'trader/v1/accounts/accountNumbers':
+            return self.reply(handler, 200, self._cached('accountNumbers', lambda: [
+                {'accountNumber': number, 'hashValue': hash_value} for number, hash_value in self.accounts]))
+        if path == 'trader/v1/accounts':
+            return self.reply(handler, 200, self._cached(('accounts', self.positions),
+                                                         lambda: [self.account(number) for number, _ in self.accounts]))
+        if path == 'trader/v1/userPreference':
+            return self.reply(handler, 200, {'streamerInfo': [{'streamerSocketUrl': self.streamer.url(),
+                                                               'schwabClientCustomerId': 'mock',
+                                                               'schwabClientCorrelId': 'mock',
+                                                               'schwabClientChannel': 'N9',
+                                                               'schwabClientFunctionId': 'APIAPP'}]})
+        if path == 'trader/v1/orders':
+            return self.reply(handler, 200, [order for orders in self.orders.values() for order in orders])
+        if len(parts) >= 4 and parts[:3] == ['trader', 'v1', 'accounts']:
+            return self.account_scoped(handler, method, parts[3], parts[4:], body, query)
+        if path == 'marketdata/v1/quotes':
+            symbols = [s for s in query.get('symbols', '').split(',') if s]
+            result = {symbol: self.quote(symbol) for symbol in symbols if not symbol.startswith('BAD')}
+            invalid = [symbol for symbol in symbols if symbol.startswith('BAD')]
+            if invalid:
+                result['errors'] = {'invalidSymbols': invalid}
+            return self.reply(handler, 200, result)
+        if len(parts) == 4 and parts[:2] == ['marketdata', 'v1'] and parts[3] == 'quotes':
+            symbol = urllib.parse.unquote(parts[2])
+            return self.reply(handler, 200, {symbol: self.quote(symbol)})
+        if path == 'marketdata/v1/pricehistory':
+            start = int(query['startDate']) if 'startDate' in query else None
+            end = int(query['endDate']) if 'endDate' in query else None
+            count = self.candles
+            symbol = query.get('symbol', 'AAPL')
+            return self.reply(handler, 200, self._cached(('pricehistory', symbol, start, end, count),
+                                                         lambda: self.price_history(symbol, start, end, count)))
+        return self.reply(handler, 404, {'errors': [{'title': f"No mock for {method} /{path}"}]})
+
+    def oauth(self, handler, body):
+        form = dict(urllib.parse.parse_qsl(body.decode()))
+        auth = handler.headers.get('Authorization', '')
+        if not auth.startswith('Basic ') or ':' not in base64.b64decode(auth[6:]).decode(errors='replace'):
+            return self.reply(handler, 401, {'error': 'invalid_client'})
+        if form.get('grant_type') == 'refresh_token':
+            if form.get('refresh_token') not in self.refresh_tokens:
+                return self.reply(handler, 400, {'error': 'invalid_grant'})
+            return self.reply(handler, 200, self.issue(refresh_token=form['refresh_token']))
+        if form.get('grant_type') == 'authorization_code':
+            return self.reply(handler, 200, self.issue())
+        return self.reply(handler, 400, {'error': 'unsupported_grant_type'})
+
+    def account_scoped(self, handler, method, hash_value, rest, body, query=None):
+        if hash_value not in self.orders:
+            return self.reply(handler, 404, {'errors': [{'title': 'Unknown account'}]})
+        number = next(number for number, value in self.accounts if value == hash_value)
+        if not rest:
+            return self.reply(handler, 200, self.account(number))
+        if rest == ['orders'] and method == 'POST':
+            order = json.loads(body or b'{}')
+            order_id = next(self.order_ids)
+            with self.lock:
+                self.orders[hash_value].append({**order, 'orderId': order_id, 'accountNumber': int(number),
+                                                'status': 'WORKING', 'enteredTime': time.strftime('%Y-%m-%dT%H:%M:%S+0000')})
+            return self.reply(handler, 201, b'', {'Location': f"{self.url()}/trader/v1/accounts/{hash_value}/orders/{order_id}"})
+        if rest == ['orders']:
+            return self.reply(handler, 200, self.orders[hash_value])
+        if rest == ['transactions']:
+            if not (query or {}).get('startDate') or not (query or {}).get('endDate'): # Schwab 400s without both.
+                return self.reply(handler, 400, {'message': 'startDate and endDate are required'})
+            return self.reply(handler, 200, [])
+        if len(rest) == 2 and rest[0] == 'orders':
+            with self.lock:
+                matches = [order for order in self.orders[hash_value] if str(order['orderId']) == rest[1]]
+                if matches and method == 'DELETE':
+                    matches[0]['status'] = 'CANCELED'
+            if not matches:
+                return self.reply(handler, 404, {'errors': [{'title': 'Unknown order'}]})
+            return self.reply(handler, 200, b'' if method == 'DELETE' else matches[0])
+        return self.reply(handler, 404, {'errors': [{'title': 'No mock for this account endpoint'}]})
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mock schwab api for offline runs and benchmarks")
+    parser.add_argument("--port", type=int, default=8182, help="0 picks a free port, the chosen one is printed.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response.")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Up to this many extra random seconds per response.")
+    parser.add_argument("--candles", type=int, default=1000, help="Candles per pricehistory response.")
+    parser.add_argument("--accounts", type=int, default=1, help="Linked accounts.")
+    parser.add_argument("--positions", type=int, default=20, help="Positions per account.")
+    parser.add_argument("--inject-429", type=float, default=0.0, help="Fraction of requests answered with 429.")
+    parser.add_argument("--inject-401", type=float, default=0.0, help="Fraction of authorized requests answered with 401.")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds sent with injected 429s.")
+    parser.add_argument("--token-ttl", type=float, default=1800, help="Seconds an access token stays valid.")
+    parser.add_argument("--access-token", type=str, default=None, help="Pre-register this access token.")
+    parser.add_argument("--refresh-token", type=str, default=None, help="Pre-register this refresh token.")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    mock = MockSchwab(latency=args.latency, jitter=args.jitter, candles=args.candles, accounts=args.accounts,
+                      positions=args.positions, inject_429=args.inject_429, inject_401=args.inject_401,
+                      retry_after=args.retry_after, token_ttl=args.token_ttl, seed=args.seed)
+    if args.access_token or args.refresh_token:
+        mock.issue(args.access_token, args.refresh_token)
+    port = mock.start(port=args.port)
+    print(json.dumps({'url': mock.url(), 'port': port, 'stream_url': mock.streamer.url()}), flush=True) # First line of stdout, the suite reads it.
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        mock.stop()
+        sys.exit(0)
@@ -0,0 +1,137 @@
+# mock_streamer.py
+# Local stand in for the schwab streamer websocket, login, SUBS/ADD/UNSUBS/LOGOUT and LEVELONE_EQUITIES ticks.
+# MockSchwab starts one and points userPreference's streamerSocketUrl at it.
+# Author: Calvin Seamons
+# Last Updated: 18 October, 2026
+
+# Imports
+# ------------------ #
+import itertools
+import json
+import threading
+import time
+
+# From Imports
+# ------------------ #
+from websockets.exceptions import ConnectionClosed
+from websockets.sync.server import serve
+
+class MockStreamer:
+    """Fake streamer. authorize(access_token) decides logins, ticks go out every interval for subscribed keys.
+
+    drop() closes every open connection from the server side and reject_next(n) answers the next n handshakes
+    with a 503, so a client's reconnect path can be driven on purpose.
+    """
+
+    def __init__(self, authorize=None, interval=0.05):
+        self.authorize = authorize or (lambda token: True)
+        self.interval = interval
+        self.connections = set()
+        self.logins = 0
+        self.handshakes = 0
+        self.rejected = 0
+        self._reject = 0
+        self._ticks = itertools.count(1)
+        self.lock = threading.Lock()
+        self.server = None
+
+    def start(self, host="127.0.0.1", port=0):
+        self.server = serve(self.handle, host, port, process_request=self._process_request, compression=None)
+        threading.Thread(target=self.server.serve_forever, name="mock-streamer", daemon=True).start()
+        return self.server.socket.getsockname()[1]
+
+    def url(self):
+        return f"ws://127.0.0.1:{self.server.socket.getsockname()[1]}/ws"
+
+    def stop(self):
+        if self.server is not None:
+            self.drop()
+            self.server.shutdown()
+
+    def drop(self):
+        with self.lock:
+            connections = list(self.connections)
+        for connection in connections:
+            connection.close(1011, "mock drop")
+
+    def reject_next(self, count=1):
+        with self.lock:
+            self._reject += count
+
+    def _process_request(self, connection, request):
+        with self.lock:
+            self.handshakes += 1
+            if self._reject:
+                self._reject -= 1
+                self.rejected += 1
+                return connection.respond(503, "Mock streamer unavailable\n")
+        return None
+
+    def _response(self, request, code, message):
+        return json.dumps({"response": [{"service": request.get("service"), "command": request.get("command"),
+                                         "requestid": request.get("requestid"), "timestamp": int(time.time() * 1000),
+                                         "content": {"code": code, "msg": message}}]})
+
+    def _tick(self, symbol):
+        n = next(self._ticks)
+        last = 20 + sum(map(ord, symbol)) % 400 + (n % 50) / 100
+        now = int(time.time() * 1000)
+        return {"key": symbol, "1": round(last - 0.01, 2), "2": round(last + 0.01, 2), "3": last, "4": 100,
+                "5": 200, "8": 1000000 + n, "9": 10, "34": now, "35": now}
+
+    def handle(self, connection):
+        keys = [] # LEVELONE_EQUITIES keys for this connection
+        logged_in = threading.Event()
+        closed = threading.Event()
+
+        def ticker():
+            while not closed.wait(self.interval):
+                if not keys:
+                    continue
+                frame = {"data": [{"service": "LEVELONE_EQUITIES", "command": "SUBS",
+                                   "timestamp": int(time.time() * 1000), "content": [self._tick(key) for key in list(keys)]}]}
+                try:
+                    connection.send(json.dumps(frame))
+                except ConnectionClosed:
+                    return
+
+        with self.lock:
+            self.connections.add(connection)
+        threading.Thread(target=ticker, name="mock-streamer-ticks", daemon=True).start()
+        try:
+            for raw in connection:
+                for request in json.loads(raw).get("requests", []):
+                    command = request.get("command")
+                    parameters = request.get("parameters") or {}
+                    if command == "LOGIN":
+                        if not self.authorize(parameters.get("Authorization")):
+                            connection.send(self._response(request, 3, "Login denied"))
+                            connection.close(1008, "login denied")
+                            return
+                        with self.lock:
+                            self.logins += 1
+                        logged_in.set()
+                        connection.send(self._response(request, 0, "server=mock;status=PN"))
+                    elif not logged_in.is_set():
+                        connection.send(self._response(request, 3, "Not logged in"))
+                    elif command == "LOGOUT":
+                        connection.send(self._response(request, 0, "Logged out"))
+                        connection.close()
+                        return
+                    elif request.get("service") == "LEVELONE_EQUITIES" and command in ("SUBS", "ADD", "UNSUBS"):
+                        requested = [key for key in parameters.get("keys", "").split(",") if key]
+                        if command == "SUBS":
+                            keys[:] = requested
+                        elif command == "ADD":
+                            keys.extend(key for key in requested if key not in keys)
+                        else:
+                            keys[:] = [key for key in keys if key not in requested]
+                        connection.send(self._response(request, 0, f"{command} command succeeded"))
+                    else:
+                        connection.send(self._response(request, 0, f"{command} ignored by mock"))
+        except ConnectionClosed:
+            pass
+        finally:
+            closed.set()
+            with self.lock:
+                self.connections.discard(connection)
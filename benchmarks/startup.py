@@ -0,0 +1,112 @@
+# startup.py
+# Startup benchmark, import time plus time to first request for a fresh short lived process.
+# Run from the repo root: python3 benchmarks/startup.py [--runs 10] [--output startup.json]
+# Author: Calvin Seamons
+# Last Updated: 18 October, 2026
+
+# Imports
+# ------------------ #
+import argparse
+import contextlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+# From Imports
+# ------------------ #
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PASSWORD = "benchmark-password"
+ACCESS_TOKEN = "bench-access"
+REFRESH_TOKEN = "bench-refresh"
+
+# What a cron job does: import, build a Trader and send one request. Timings are printed as json.
+CHILD = r"""
+import time
+start = time.perf_counter()
+import argparse, json, sys
+from trader import Trader
+imported = time.perf_counter()
+args = argparse.Namespace(install_path=sys.argv[1], base_url=sys.argv[2], startup=False,
+                          refresh_token=False, auto_refresh_token=False)
+trader = Trader(args)
+constructed = time.perf_counter()
+trader.client.get('/marketdata/v1/AAPL/quotes').json()
+first = time.perf_counter()
+print(json.dumps({'import_s': imported - start, 'construct_s': constructed - imported,
+                  'first_request_s': first - constructed, 'to_first_request_s': first - start}))
+"""
+
+class _Stub(BaseHTTPRequestHandler):
+    """Answers every GET with a tiny json body, enough for Tokens and one quote."""
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.startswith('/trader/v1/accounts/accountNumbers'):
+            body = b'[{"accountNumber":"12345678","hashValue":"BENCHHASH"}]'
+        else:
+            body = b'{"AAPL":{"quote":{"lastPrice":100.0}}}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+def build_install(path):
+    """Encrypted credentials and a fresh token store, so startup doesn't need a real login."""
+    sys.path.insert(0, REPO)
+    os.environ['super_secret_sauce'] = PASSWORD
+    import yaml
+    from encryption import encrypt_file_with_password
+    from token_store import TokenStore
+
+    credentials_file = os.path.join(path, 'schwab-credentials.yaml')
+    with open(credentials_file, 'w') as yaml_file:
+        yaml.dump({'app_key': 'bench-key', 'app_secret': 'bench-secret'}, yaml_file)
+    with contextlib.redirect_stdout(sys.stderr): # Keep stdout clean json.
+        encrypt_file_with_password(credentials_file)
+    now = time.time()
+    TokenStore(path).update(tokens={'access_token': ACCESS_TOKEN, 'refresh_token': REFRESH_TOKEN},
+                            access_token_time=now, refresh_token_time=now)
+
+def run(runs, base_url=None):
+    """Median timings over runs fresh processes, against base_url or a built in stub when None."""
+    server = None
+    if base_url is None:
+        server = ThreadingHTTPServer(('127.0.0.1', 0), _Stub)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_port}"
+    samples = []
+    with tempfile.TemporaryDirectory() as install_path:
+        build_install(install_path)
+        env = {**os.environ, 'super_secret_sauce': PASSWORD, 'PYTHONPATH': REPO}
+        for _ in range(runs):
+            wall = time.perf_counter()
+            out = subprocess.run([sys.executable, '-c', CHILD, install_path, base_url],
+                                 cwd=REPO, env=env, capture_output=True, text=True, check=True)
+            sample = json.loads(out.stdout.strip().splitlines()[-1])
+            sample['process_wall_s'] = time.perf_counter() - wall
+            samples.append(sample)
+    if server is not None:
+        server.shutdown()
+    return {key: statistics.median(sample[key] for sample in samples) for key in samples[0]}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Startup benchmark for schwab-auto-trader")
+    parser.add_argument("--runs", type=int, default=10, help="Fresh processes to launch, medians are reported.")
+    parser.add_argument("--output", type=str, default=None, help="Also write the json result to this file.")
+    args = parser.parse_args()
+
+    result = {'benchmark': 'startup', 'runs': args.runs, 'python': sys.version.split()[0], **run(args.runs)}
+    print(json.dumps(result, indent=2))
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(result, output_file, indent=2)
@@ -0,0 +1,226 @@
+# suite.py
+# Offline benchmark suite, runs the trader against benchmarks/mock_server.py and prints json results.
+# Run from the repo root: python3 benchmarks/suite.py [--latency 0.005] [--fault-429 0.05] [--output results.json] [--baseline old.json]
+# Author: Calvin Seamons
+# Last Updated: 18 October, 2026
+
+# Imports
+# ------------------ #
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Local File Imports
+# ------------------ #
+import startup
+
+REPO = startup.REPO
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+def start_mock(latency, candles, positions, accounts, inject_429=0.0, inject_401=0.0):
+    """Mock server in its own process so it doesn't share a GIL with what's being measured."""
+    process = subprocess.Popen([sys.executable, os.path.join(HERE, 'mock_server.py'), '--port', '0',
+                                '--latency', str(latency), '--candles', str(candles),
+                                '--positions', str(positions), '--accounts', str(accounts),
+                                '--inject-429', str(inject_429), '--inject-401', str(inject_401), '--retry-after', '0',
+                                '--access-token', startup.ACCESS_TOKEN, '--refresh-token', startup.REFRESH_TOKEN,
+                                '--seed', '7'],
+                               stdout=subprocess.PIPE, text=True)
+    return process, json.loads(process.stdout.readline())['url']
+
+def percentiles(samples) -> dict:
+    samples = sorted(samples)
+    cuts = statistics.quantiles(samples, n=100, method='inclusive') if len(samples) > 1 else samples * 99
+    return {'p50_s': cuts[49], 'p95_s': cuts[94], 'p99_s': cuts[98], 'mean_s': statistics.fmean(samples)}
+
+def build_trader(install_path, base_url):
+    """Trader on a limiter-less client, the suite measures our overhead and not schwab's 120/min budget."""
+    from client import Client
+    from trader import Trader
+    args = argparse.Namespace(install_path=install_path, base_url=base_url, startup=False,
+                              refresh_token=False, auto_refresh_token=False)
+    return Trader(args, client=Client(base_url=base_url))
+
+def bench_quotes(trader, symbols, rounds):
+    universe = [f"S{i:04d}" for i in range(symbols)]
+    trader.quotes(universe[:10]) # Warm the pool and the lazy token load.
+    single = []
+    for _ in range(rounds * 20):
+        start = time.perf_counter()
+        trader.client.get('/marketdata/v1/AAPL/quotes').content
+        single.append(time.perf_counter() - start)
+    batch = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = trader.quotes(universe)
+        batch.append(time.perf_counter() - start)
+        assert not result['errors'], result['errors']
+    typed = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        trader.quotes(universe, typed=True)
+        typed.append(time.perf_counter() - start)
+    return {'single': percentiles(single),
+            'batch_symbols': symbols,
+            'batch_symbols_per_s': symbols / statistics.median(batch),
+            'batch_typed_symbols_per_s': symbols / statistics.median(typed)}
+
+def bench_history(trader, candles, rounds):
+    response = trader.client.get('/marketdata/v1/pricehistory', params={'symbol': 'AAPL'})
+    payload_bytes = len(response.content)
+    runs = {}
+    for name, fetch in (('json', lambda: trader.price_history('AAPL')),
+                        ('arrays', lambda: trader.price_history_arrays('AAPL'))):
+        samples = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            fetch()
+            samples.append(time.perf_counter() - start)
+        seconds = statistics.median(samples)
+        runs[name] = {'median_s': seconds, 'candles_per_s': candles / seconds,
+                      'mb_per_s': payload_bytes / seconds / 1e6}
+    return {'candles': candles, 'payload_bytes': payload_bytes, **runs}
+
+def bench_token_refresh(trader, rounds):
+    tokens = trader.tokens
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        tokens.refresh_if_stale()
+        samples.append(time.perf_counter() - start)
+    trader.client.get('/marketdata/v1/AAPL/quotes').raise_for_status() # The refreshed bearer is accepted.
+    return percentiles(samples)
+
+def bench_orders(trader, count):
+    from orders import Order
+    order = Order(symbol='AAPL', quantity=1, instruction='BUY', order_type='LIMIT', price=100.0)
+    account_hash = trader._default_account_hash()
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        trader.place_order(order, account_hash)
+        samples.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    results = trader.place_orders([order] * count, account_hash)
+    basket = time.perf_counter() - start
+    assert not any(isinstance(result, Exception) for result in results)
+    return {'single': percentiles(samples), 'basket_orders': count, 'basket_orders_per_s': count / basket}
+
+def bench_faults(args):
+    """Single quotes against a mock that answers some requests with 429 or 401, retries and token replays included."""
+    mock, base_url = start_mock(args.latency, args.candles, args.positions, args.accounts,
+                                inject_429=args.fault_429, inject_401=args.fault_401)
+    try:
+        with tempfile.TemporaryDirectory() as install_path: # Fresh tokens, the main run refreshed its own.
+            startup.build_install(install_path)
+            trader = build_trader(install_path, base_url)
+            trader.quotes(['AAPL']) # Warm the pool and the lazy token load.
+            samples, ok = [], 0
+            started = time.perf_counter()
+            for _ in range(args.rounds * 20):
+                start = time.perf_counter()
+                response = trader.client.get('/marketdata/v1/AAPL/quotes')
+                samples.append(time.perf_counter() - start)
+                ok += response.status_code == 200
+            elapsed = time.perf_counter() - started
+            trader.client.close()
+    finally:
+        mock.terminate()
+        mock.wait()
+    return {'inject_429': args.fault_429, 'inject_401': args.fault_401, 'requests': len(samples),
+            'ok_ratio': ok / len(samples), 'requests_per_s': len(samples) / elapsed, 'single': percentiles(samples)}
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run(args) -> dict:
+    results = {}
+    mock, base_url = start_mock(args.latency, args.candles, args.positions, args.accounts)
+    try:
+        with tempfile.TemporaryDirectory() as install_path:
+            startup.build_install(install_path)
+            os.environ['super_secret_sauce'] = startup.PASSWORD
+            results['startup'] = startup.run(args.startup_runs, base_url=base_url)
+            trader = build_trader(install_path, base_url)
+            results['quotes'] = bench_quotes(trader, args.symbols, args.rounds)
+            results['history'] = bench_history(trader, args.candles, args.rounds)
+            results['token_refresh'] = bench_token_refresh(trader, args.rounds)
+            results['orders'] = bench_orders(trader, args.orders)
+            trader.client.close()
+    finally:
+        mock.terminate()
+        mock.wait()
+    if args.fault_429 or args.fault_401:
+        results['faults'] = bench_faults(args)
+    return {'suite': 'offline', 'commit': git_commit(), 'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'python': sys.version.split()[0], 'platform': platform.platform(),
+            'config': {'latency_s': args.latency, 'candles': args.candles, 'symbols': args.symbols,
+                       'positions': args.positions, 'accounts': args.accounts, 'rounds': args.rounds,
+                       'orders': args.orders, 'startup_runs': args.startup_runs,
+                       'fault_429': args.fault_429, 'fault_401': args.fault_401},
+            'results': results}
+
+def flatten(tree, prefix="") -> dict:
+    flat = {}
+    for key, value in tree.items():
+        name = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten(value, name))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+def regressions(current, baseline, tolerance) -> list:
+    """Metrics more than tolerance worse than baseline. *_per_s is better higher, *_s is better lower."""
+    found = []
+    old = flatten(baseline['results'])
+    for name, value in flatten(current['results']).items():
+        if name not in old or not old[name]:
+            continue
+        if name.endswith('_per_s'):
+            change = (old[name] - value) / old[name]
+        elif name.endswith('_s'):
+            change = (value - old[name]) / old[name]
+        else:
+            continue
+        if change > tolerance:
+            found.append({'metric': name, 'baseline': old[name], 'current': value, 'worse_by': round(change, 4)})
+    return found
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline benchmark suite for schwab-auto-trader")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds the mock adds to every response.")
+    parser.add_argument("--candles", type=int, default=5000, help="Candles per pricehistory response.")
+    parser.add_argument("--symbols", type=int, default=500, help="Symbols per batch quote run.")
+    parser.add_argument("--positions", type=int, default=50, help="Positions per mock account.")
+    parser.add_argument("--accounts", type=int, default=1, help="Linked mock accounts.")
+    parser.add_argument("--rounds", type=int, default=10, help="Repeats per measurement, medians are reported.")
+    parser.add_argument("--orders", type=int, default=50, help="Orders for the latency and basket runs.")
+    parser.add_argument("--startup-runs", type=int, default=5, help="Fresh processes for the startup run.")
+    parser.add_argument("--fault-429", type=float, default=0.05, help="429 fraction for the fault injected run, 0 with --fault-401 0 skips it.")
+    parser.add_argument("--fault-401", type=float, default=0.02, help="401 fraction for the fault injected run.")
+    parser.add_argument("--output", type=str, default=None, help="Also write the json result to this file.")
+    parser.add_argument("--baseline", type=str, default=None, help="Earlier result to compare against, exits 1 on regressions.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown against the baseline, 0.25 is 25%%.")
+    args = parser.parse_args()
+
+    result = run(args)
+    if args.baseline:
+        with open(args.baseline, 'r') as baseline_file:
+            result['regressions'] = regressions(result, json.load(baseline_file), args.tolerance)
+    print(json.dumps(result, indent=2))
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(result, output_file, indent=2)
+    if result.get('regressions'):
+        sys.exit(1)
@@ -0,0 +1,202 @@
+# client.py
+# Shared HTTP transport for the Schwab api, one pooled keep-alive session for Trader and Tokens.
+# Author: Calvin Seamons
+# Last Updated: 18 October, 2026
+
+# Imports
+# ------------------ #
+import os
+import requests
+import threading
+import time
+
+# From Imports
+# ------------------ #
+from requests.adapters import HTTPAdapter
+
+# Local File Imports
+# ------------------ #
+from rate_limiter import classify
+from resilience import CircuitBreakers, Deadline, RetryPolicy, endpoint_key
+
+BASE_URL_ENV = "SCHWAB_BASE_URL" # Point everything at a mock server or proxy without touching code.
+
+class Client:
+    BASE_URL = "https://api.schwabapi.com"
+
+    def __init__(self, base_url=None, timeout=5, pool_connections=4, pool_maxsize=32, limiter=None,
+                 retry=None, deadline=30, breakers=None, cache=None, metrics=None):
+        self.base_url = (base_url or os.environ.get(BASE_URL_ENV) or self.BASE_URL).rstrip('/')
+        self.timeout = timeout # Per attempt, deadline is the budget for the whole call including retries.
+        self.deadline = deadline
+        self.limiter = limiter # Optional RateLimiter, every outbound call takes a token from it first.
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.breakers = breakers if breakers is not None else CircuitBreakers()
+        self.cache = cache # Optional ResponseCache, only get_json() consults it.
+        self.metrics = metrics # Optional metrics.Metrics, None skips every measurement.
+        self.access_token = None
+        self.on_unauthorized = None # Set by Tokens, called with the rejected bearer and returns the new one.
+        self.authenticate = None    # Called once before the first request, lets Trader defer its token work.
+        self._lock = threading.Lock()
+        self._auth_lock = threading.RLock()
+        self._authenticating = False
+
+        # One session means one connection pool, so the TCP+TLS handshake to schwab is paid once
+        # and every later call rides the same keep-alive socket.
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"Accept": "application/json"})
+
+    def set_bearer(self, access_token):
+        """Swap the bearer token on the shared session, every following request picks it up."""
+        with self._lock:
+            self.access_token = access_token
+            if access_token:
+                self.session.headers["Authorization"] = f"Bearer {access_token}"
+            else:
+                self.session.headers.pop("Authorization", None)
+
+    def url(self, path):
+        if path.startswith("http://") or path.startswith("https://"):
+            return path
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def _authenticate(self):
+        # Reentrant, the token refresh that authenticate() may kick off goes through this client too.
+        # Other threads block on the lock until it's done, so nobody goes out without a bearer.
+        with self._auth_lock:
+            if self._authenticating or self.authenticate is None:
+                return
+            self._authenticating = True
+            try:
+                self.authenticate()
+                self.authenticate = None
+            finally:
+                self._authenticating = False
+
+    def _send(self, method, path, priority, deadline, timeout, kwargs):
+        if self.limiter is not None:
+            self.limiter.acquire(classify(method, path) if priority is None else priority,
+                                 timeout=deadline.remaining())
+        return self.session.request(method, self.url(path), timeout=deadline.clamp(timeout), **kwargs)
+
+    def _send_measured(self, endpoint, method, path, priority, deadline, timeout, kwargs):
+        # Same as _send, timing the limiter queue and the http round trip separately.
+        metrics = self.metrics
+        if self.limiter is not None:
+            metrics.observe_limiter_wait(endpoint, self.limiter.acquire(
+                classify(method, path) if priority is None else priority, timeout=deadline.remaining()))
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, self.url(path), timeout=deadline.clamp(timeout), **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            metrics.observe_request(endpoint, None, time.perf_counter() - start)
+            raise
+        body = response.request.body
+        metrics.observe_request(endpoint, response.status_code, time.perf_counter() - start,
+                                len(response.content), len(body) if body else 0)
+        return response
+
+    def _sleep(self, delay, deadline):
+        remaining = deadline.remaining()
+        if remaining is not None and delay >= remaining:
+            return False # Waiting would blow the deadline, hand back what we have.
+        time.sleep(delay)
+        return True
+
+    def request(self, method, path, priority=None, deadline=None, **kwargs) -> requests.Response:
+        """Send through the limiter, retrying with backoff inside one deadline, behind the endpoint's breaker.
+
+        Raises CircuitOpenError without sending while the endpoint is failing, DeadlineExceeded when the
+        budget runs out, and the last connection error once retries are spent.
+        """
+        if self.authenticate is not None:
+            self._authenticate()
+        timeout = kwargs.pop("timeout", self.timeout)
+        deadline = Deadline(self.deadline if deadline is None else deadline)
+        endpoint = endpoint_key(method, path)
+        breaker = self.breakers.get(endpoint)
+        trial = breaker.before(endpoint)
+        try:
+            return self._attempts(method, path, priority, deadline, timeout, endpoint, breaker, kwargs)
+        except BaseException:
+            if trial:
+                breaker.release() # success()/failure() already settled it if we got that far, this is a no-op then.
+            raise
+
+    def _attempts(self, method, path, priority, deadline, timeout, endpoint, breaker, kwargs):
+        # Calls carrying their own Authorization (oauth Basic auth) are never replayed.
+        explicit_auth = "Authorization" in (kwargs.get("headers") or {})
+        metrics = self.metrics
+        replayed_401 = False
+        attempt = 0
+        while True:
+            sent_token = self.access_token
+            try:
+                if metrics is None:
+                    response = self._send(method, path, priority, deadline, timeout, kwargs)
+                else:
+                    response = self._send_measured(endpoint, method, path, priority, deadline, timeout, kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                breaker.failure()
+                if attempt < self.retry.max_retries and self.retry.should_retry_error(method) \
+                        and self._sleep(self.retry.backoff(attempt), deadline):
+                    attempt += 1
+                    if metrics is not None:
+                        metrics.observe_retry(endpoint)
+                    continue
+                raise
+
+            if response.status_code == 401 and not replayed_401 and self.on_unauthorized is not None and not explicit_auth:
+                replayed_401 = True # One refresh and replay, a second 401 goes back to the caller.
+                new_token = self.on_unauthorized(sent_token)
+                if new_token and new_token != sent_token:
+                    if metrics is not None:
+                        metrics.observe_retry(endpoint)
+                    continue
+
+            if response.status_code >= 500:
+                breaker.failure()
+            else:
+                breaker.success()
+
+            if attempt < self.retry.max_retries and self.retry.should_retry_status(method, response.status_code):
+                delay = self.retry.retry_after(response)
+                if delay is None:
+                    delay = self.retry.backoff(attempt)
+                if self._sleep(delay, deadline):
+                    attempt += 1
+                    if metrics is not None:
+                        metrics.observe_retry(endpoint)
+                    continue
+            return response
+
+    def get(self, path, params=None, **kwargs) -> requests.Response:
+        return self.request("GET", path, params=params, **kwargs)
+
+    def get_json(self, path, params=None, **kwargs):
+        """GET and decode, served from the response cache when the endpoint has a TTL."""
+        if self.cache is not None:
+            cached = self.cache.get(path, params)
+            if cached is not None:
+                return cached
+        response = self.get(path, params=params, **kwargs)
+        response.raise_for_status()
+        data = response.json()
+        if self.cache is not None:
+            self.cache.put(path, params, data)
+        return data
+
+    def post(self, path, data=None, json=None, **kwargs) -> requests.Response:
+        return self.request("POST", path, data=data, json=json, **kwargs)
+
+    def put(self, path, json=None, **kwargs) -> requests.Response:
+        return self.request("PUT", path, json=json, **kwargs)
+
+    def delete(self, path, **kwargs) -> requests.Response:
+        return self.request("DELETE", path, **kwargs)
+
+    def close(self):
+        self.session.close()
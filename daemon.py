@@ -0,0 +1,230 @@
+# daemon.py
+# Resident trader daemon, authenticates once and serves local scripts over a unix domain socket.
+# Author: Calvin Seamons
+# Last Updated: 18 October, 2026
+
+# Imports
+# ------------------ #
+import json
+import os
+import socket
+import socketserver
+import struct
+import threading
+
+# Local File Imports
+# ------------------ #
+from log_obj import Log
+from orders import Order
+
+# Every frame is a 4 byte big endian length followed by that many bytes of compact json.
+# request  {"id": 1, "op": "quotes", "args": {...}}
+# response {"id": 1, "ok": true, "result": ...} or {"id": 1, "ok": false, "error": "..."}
+HEADER = struct.Struct(">I")
+MAX_FRAME = 64 * 1024 * 1024
+
+def send_frame(sock, message):
+    body = json.dumps(message, separators=(',', ':')).encode()
+    sock.sendall(HEADER.pack(len(body)) + body)
+
+def _recv_exact(sock, size):
+    chunks = []
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+def recv_frame(sock):
+    header = _recv_exact(sock, HEADER.size)
+    if header is None:
+        return None
+    (size,) = HEADER.unpack(header)
+    if size > MAX_FRAME:
+        raise ValueError(f"Frame of {size} bytes is over the {MAX_FRAME} byte limit.")
+    body = _recv_exact(sock, size)
+    return None if body is None else json.loads(body)
+
+ORDER_FIELDS = tuple(name for name in Order.__slots__ if name not in ("payload", "body")) # Order's constructor arguments.
+
+def order_fields(order):
+    """Order, or a dict of its fields, -> json safe field dict with children nested the same way."""
+    fields = {name: getattr(order, name) for name in ORDER_FIELDS} if isinstance(order, Order) else dict(order)
+    fields['children'] = [order_fields(child) for child in fields.get('children') or ()]
+    return fields
+
+def order_from_fields(fields):
+    """Rebuild an Order from order_fields output, children first so OCO/TRIGGER validation sees Orders."""
+    fields = dict(fields)
+    fields['children'] = tuple(order_from_fields(child) for child in fields.get('children') or ())
+    return Order(**fields)
+
+def default_socket_path(install_path):
+    return os.path.join(install_path, 'trader.sock')
+
+class TraderDaemon:
+    """Serves one warm Trader (pooled session, tokens, limiter, caches) to any local process.
+
+    Each connection gets its own thread and can send any number of requests, so a strategy script keeps
+    one socket open and pays microseconds per call instead of a full login per run.
+    """
+
+    def __init__(self, trader, socket_path):
+        self.trader = trader
+        self.socket_path = socket_path
+        self.log = Log()
+        self.server = None
+        self.ops = {
+            'ping': lambda: 'pong',
+            'quote': self._quote,
+            'quotes': trader.quotes,
+            'price_history': trader.price_history,
+            'accounts': trader.accounts,
+            'positions': lambda: trader.accounts(fields='positions'),
+            'place_order': self._place_order,
+            'place_orders': self._place_orders,
+            'all_balances': trader.all_balances,
+            'all_positions': trader.all_positions,
+            'all_orders': trader.all_orders,
+            'all_transactions': trader.all_transactions,
+            'metrics': self._metrics,
+        }
+
+    def _quote(self, symbol_id, fields=None):
+        return self.trader.quotes([symbol_id], fields=fields)
+
+    def _metrics(self):
+        metrics = self.trader.client.metrics
+        return None if metrics is None else metrics.snapshot()
+
+    def _place_order(self, order, account_hash=None):
+        return self.trader.place_order(order_from_fields(order), account_hash)
+
+    def _place_orders(self, orders, account_hash=None):
+        results = self.trader.place_orders([order_from_fields(order) for order in orders], account_hash)
+        return [result if not isinstance(result, Exception) else {'error': str(result)} for result in results]
+
+    def handle(self, request):
+        op = self.ops.get(request.get('op'))
+        if op is None:
+            return {'id': request.get('id'), 'ok': False, 'error': f"Unknown op '{request.get('op')}'."}
+        try:
+            return {'id': request.get('id'), 'ok': True, 'result': op(**(request.get('args') or {}))}
+        except Exception as e:
+            return {'id': request.get('id'), 'ok': False, 'error': f"{type(e).__name__}: {e}"}
+
+    def serve_forever(self):
+        daemon = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self):
+                while True:
+                    try:
+                        request = recv_frame(self.request)
+                    except (OSError, ValueError):
+                        return
+                    if request is None:
+                        return
+                    send_frame(self.request, daemon.handle(request))
+
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path) # Left behind by a daemon that didn't shut down cleanly.
+        os.makedirs(os.path.dirname(os.path.abspath(self.socket_path)), exist_ok=True)
+        old_umask = os.umask(0o177) # Socket is created 0600, only this user can drive the account.
+        try:
+            self.server = socketserver.ThreadingUnixStreamServer(self.socket_path, Handler)
+        finally:
+            os.umask(old_umask)
+        self.server.daemon_threads = True
+        self.log.success(f"Trader daemon listening on {self.socket_path}")
+        try:
+            self.server.serve_forever()
+        finally:
+            self.server.server_close()
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+
+    def start(self):
+        """serve_forever on a background thread, handy for tests and embedding."""
+        thread = threading.Thread(target=self.serve_forever, name="trader-daemon", daemon=True)
+        thread.start()
+        return thread
+
+    def shutdown(self):
+        if self.server is not None:
+            self.server.shutdown()
+
+class DaemonClient:
+    """What strategy scripts use instead of building their own Trader."""
+
+    def __init__(self, socket_path):
+        self.socket_path = socket_path
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(socket_path)
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def call(self, op, **args):
+        with self._lock:
+            self._next_id += 1
+            send_frame(self.sock, {'id': self._next_id, 'op': op, 'args': args})
+            response = recv_frame(self.sock)
+        if response is None:
+            raise ConnectionError("Trader daemon closed the connection.")
+        if not response['ok']:
+            raise RuntimeError(response['error'])
+        return response['result']
+
+    def ping(self):
+        return self.call('ping')
+
+    def quote(self, symbol_id, fields=None):
+        return self.call('quote', symbol_id=symbol_id, fields=fields)
+
+    def quotes(self, symbols, fields=None):
+        return self.call('quotes', symbols=list(symbols), fields=fields)
+
+    def price_history(self, symbol, **params):
+        return self.call('price_history', symbol=symbol, **params)
+
+    def accounts(self, fields=None):
+        return self.call('accounts', fields=fields)
+
+    def positions(self):
+        return self.call('positions')
+
+    def all_balances(self):
+        return self.call('all_balances')
+
+    def all_positions(self):
+        return self.call('all_positions')
+
+    def all_orders(self, **params):
+        return self.call('all_orders', **params)
+
+    def all_transactions(self, **params):
+        return self.call('all_transactions', **params)
+
+    def metrics(self):
+        """Daemon's per endpoint latency/status snapshot, None unless it runs with --metrics-port or --metrics-file."""
+        return self.call('metrics')
+
+    def place_order(self, order=None, account_hash=None, **fields):
+        """Same call as Trader.place_order(order, account_hash), or the order's fields as keyword arguments.
+        Children can be Orders or field dicts."""
+        return self.call('place_order', order=order_fields(order if order is not None else fields),
+                         account_hash=account_hash)
+
+    def place_orders(self, orders, account_hash=None):
+        return self.call('place_orders', orders=[order_fields(order) for order in orders], account_hash=account_hash)
+
+    def close(self):
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
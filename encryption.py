@@ -15,6 +15,9 @@ import yaml
 from getpass import getpass
 from pathlib import Path
 
+# Local File Imports
+from vault import vault
+
 def derive_key_from_password(password, salt):
     kdf = PBKDF2HMAC(
         algorithm=hashes.SHA256(),
@@ -27,37 +30,19 @@ def derive_key_from_password(password, salt):
     return key 
 
 def encrypt_file_with_password(file_path):
-    password = os.getenv("super_secret_sauce")
-    if not password:
-        raise ValueError("Environment variable 'super_secret_sauce' is not set.")
-    salt = os.urandom(16)  # Generate a new salt
-    key = derive_key_from_password(password, salt)
-    fernet = Fernet(key)
-    
     with open(file_path, 'rb') as file:
         original_data = file.read()
-    
-    encrypted_data = fernet.encrypt(original_data)
+
+    # The vault reuses this file's last salt, so a rewrite doesn't pay for PBKDF2 again.
+    # New files get a fresh salt, the salt and encrypted data are written back to the same file.
+    encrypted_data = vault.encrypt(file_path, original_data)
 
     print(encrypted_data)
-    
-    # Write the salt and encrypted data to a new file
-    with open(file_path, 'wb') as encrypted_file:
-        encrypted_file.write(salt + encrypted_data)
 
 def decrypt_file_with_password(file_path):
-    password = os.getenv("super_secret_sauce")
     try:
-        with open(file_path, 'rb') as encrypted_file:
-            # First 16 bytes are the salt
-            salt = encrypted_file.read(16)
-            encrypted_data = encrypted_file.read()
-        
-        key = derive_key_from_password(password, salt)
-        fernet = Fernet(key)
-        
-        decrypted_data = fernet.decrypt(encrypted_data)
-        return yaml.safe_load(decrypted_data.decode())
+        # First 16 bytes are the salt, the vault only derives the key and decrypts when the file changed.
+        return vault.read(file_path)
     except InvalidToken:
         print("Uh oh, looks like your encryption password was wrong. \n" 
               "If you forget this it's okay to just blowaway the credentials, use --startup. and redo the schwab login.")
@@ -0,0 +1,266 @@
+# indicators.py
+# Vectorized technical indicators over candle arrays, SMA, EMA, RSI, ATR and VWAP.
+# Author: Calvin Seamons
+# Last Updated: 18 October, 2026
+
+# Imports
+# ------------------ #
+import math
+import numpy as np
+
+# Local File Imports
+# ------------------ #
+from price_history import decode_candles
+
+# Every batch function takes 1-D arrays (one symbol) or 2-D arrays shaped (symbols, time), time is the
+# last axis. Warm-up values that aren't defined yet come back as NaN so outputs line up with the input.
+# Leading NaNs (the padding from stack) are skipped, each row starts at its own first candle.
+
+def from_pricehistory(payload) -> dict:
+    """Columns from a Trader.price_history response, PriceHistoryStore.read output can be used as is."""
+    return decode_candles(payload)
+
+def stack(columns_list, field='close') -> np.ndarray:
+    """Stack one field from many symbols into a (symbols, time) array, shorter histories are NaN padded on the left.
+
+    The batch indicators skip the padding, a short symbol's values start at its own first candle.
+    """
+    length = max((len(columns[field]) for columns in columns_list), default=0)
+    out = np.full((len(columns_list), length), np.nan)
+    for row, columns in enumerate(columns_list):
+        values = np.asarray(columns[field], dtype=np.float64)
+        if len(values):
+            out[row, length - len(values):] = values
+    return out
+
+def sma(close, window: int) -> np.ndarray:
+    close = np.asarray(close, dtype=np.float64)
+    out = np.full(close.shape, np.nan)
+    if close.shape[-1] < window:
+        return out
+    valid = ~np.isnan(close)
+    csum = np.cumsum(np.where(valid, close, 0.0), axis=-1) # A NaN in cumsum would poison the whole row.
+    count = np.cumsum(valid, axis=-1)
+    out[..., window - 1] = csum[..., window - 1]
+    out[..., window:] = csum[..., window:] - csum[..., :-window]
+    full = np.empty(close.shape, dtype=bool)
+    full[..., :window - 1] = False
+    full[..., window - 1] = count[..., window - 1] == window
+    full[..., window:] = count[..., window:] - count[..., :-window] == window
+    out[..., window - 1:] /= window
+    out[~full] = np.nan # Windows that reach into padding or a gap.
+    return out
+
+def _fill_leading(values):
+    """Back fill each row's leading NaNs with its first real value, returns (filled, mask of what was filled)."""
+    lead = np.logical_and.accumulate(np.isnan(values), axis=-1)
+    if not lead.any():
+        return values, None
+    first = np.argmin(lead, axis=-1)[..., None] # All NaN rows stay NaN, index 0 is NaN too.
+    return np.where(lead, np.take_along_axis(values, first, axis=-1), values), lead
+
+def _ewm(values, alpha: float, seed=None) -> np.ndarray:
+    """y[t] = alpha * x[t] + (1 - alpha) * y[t-1], y[0] = seed or x[0].
+
+    Solved in closed form chunk by chunk, chunks are as long as possible while the decay powers
+    stay well inside float64 range, so long spans are a single numpy pass.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    out = np.empty(values.shape)
+    length = values.shape[-1]
+    if length == 0:
+        return out
+    decay = 1.0 - alpha
+    if decay == 0: # alpha 1 (span 1) is the input itself, the closed form below would divide by 0 ** j.
+        out[...] = values
+        return out
+    lead = None
+    if seed is None:
+        # A row seeded from padding would be NaN forever, seed it at its first real value instead.
+        values, lead = _fill_leading(values)
+    chunk = length if decay <= 0 else max(1, min(length, int(150 * math.log(10) / -math.log(decay))))
+    prev = values[..., 0] if seed is None else np.asarray(seed, dtype=np.float64)
+    start = 0 if seed is not None else 1
+    if seed is None:
+        out[..., 0] = prev
+    while start < length:
+        stop = min(length, start + chunk)
+        n = stop - start
+        powers = decay ** np.arange(n)                 # (1-a)^j
+        scaled = np.cumsum(values[..., start:stop] / powers, axis=-1)
+        out[..., start:stop] = decay * powers * prev[..., None] + alpha * powers * scaled
+        prev = out[..., stop - 1]
+        start = stop
+    if lead is not None:
+        out[lead] = np.nan
+    return out
+
+def ema(close, span: int) -> np.ndarray:
+    return _ewm(close, 2.0 / (span + 1))
+
+def rsi(close, window: int = 14) -> np.ndarray:
+    """Wilder RSI, gains and losses smoothed with alpha = 1/window."""
+    close = np.asarray(close, dtype=np.float64)
+    out = np.full(close.shape, np.nan)
+    if close.shape[-1] < 2:
+        return out
+    delta = np.diff(close, axis=-1)
+    avg_gain = _ewm(np.clip(delta, 0, None), 1.0 / window)
+    avg_loss = _ewm(np.clip(-delta, 0, None), 1.0 / window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out[..., 1:] = np.where(avg_loss == 0, 100.0, 100.0 - 100.0 / (1.0 + avg_gain / avg_loss))
+    return out
+
+def true_range(high, low, close) -> np.ndarray:
+    high, low, close = (np.asarray(x, dtype=np.float64) for x in (high, low, close))
+    prev_close = np.concatenate([close[..., :1], close[..., :-1]], axis=-1)
+    prev_close = np.where(np.isnan(prev_close), close, prev_close) # First real bar after padding has no previous close.
+    return np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+def atr(high, low, close, window: int = 14) -> np.ndarray:
+    """Wilder ATR over the true range."""
+    return _ewm(true_range(high, low, close), 1.0 / window)
+
+def vwap(high, low, close, volume, anchor=None) -> np.ndarray:
+    """Running VWAP of the typical price, anchor is a bool array that's True on the first bar of each session."""
+    high, low, close, volume = (np.asarray(x, dtype=np.float64) for x in (high, low, close, volume))
+    typical = (high + low + close) / 3.0
+    valid = ~(np.isnan(typical) | np.isnan(volume))
+    pv = np.cumsum(np.where(valid, typical * volume, 0.0), axis=-1)
+    vol = np.cumsum(np.where(valid, volume, 0.0), axis=-1)
+    if anchor is not None:
+        anchor = np.asarray(anchor, dtype=bool)
+        index = np.broadcast_to(np.arange(close.shape[-1]), close.shape)
+        start = np.maximum.accumulate(np.where(anchor, index, 0), axis=-1) # First bar of each bar's session.
+        zero = np.zeros(close.shape[:-1] + (1,))
+        pv_before = np.concatenate([zero, pv[..., :-1]], axis=-1)
+        vol_before = np.concatenate([zero, vol[..., :-1]], axis=-1)
+        pv = pv - np.take_along_axis(pv_before, start, axis=-1)
+        vol = vol - np.take_along_axis(vol_before, start, axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(vol > 0, pv / vol, np.nan)
+
+# Incremental versions, seeded from history and then updated one candle at a time in O(1).
+# State is kept as arrays so a single update() call can advance many symbols at once.
+
+class RollingSMA:
+    __slots__ = ('window', 'buffer', 'total', 'count', 'position')
+
+    def __init__(self, window: int, history=None):
+        self.window = window
+        history = np.atleast_1d(np.asarray(history if history is not None else [], dtype=np.float64))
+        shape = history.shape[:-1] if history.ndim > 1 else ()
+        self.buffer = np.zeros(shape + (window,))
+        self.total = np.zeros(shape)
+        self.count = np.zeros(shape, dtype=np.int64) # Real values in the window, per row.
+        self.position = 0
+        for t in range(max(0, history.shape[-1] - window), history.shape[-1]):
+            self.update(history[..., t])
+
+    def update(self, close):
+        close = np.asarray(close, dtype=np.float64)
+        # A row that hasn't had a real value yet is still in stack()'s padding, it holds a 0 and doesn't count.
+        padding = (self.count == 0) & np.isnan(close)
+        close = np.where(padding, 0.0, close)
+        self.total = self.total + close - self.buffer[..., self.position]
+        self.buffer[..., self.position] = close
+        self.position = (self.position + 1) % self.window
+        self.count = np.where(padding, 0, np.minimum(self.count + 1, self.window))
+        return self.value
+
+    @property
+    def value(self):
+        return np.where(self.count == self.window, self.total / self.window, np.nan)[()]
+
+class RollingEMA:
+    __slots__ = ('alpha', 'value')
+
+    def __init__(self, span: int = None, history=None, alpha: float = None):
+        self.alpha = alpha if alpha is not None else 2.0 / (span + 1)
+        self.value = None
+        if history is not None and np.shape(history)[-1]:
+            self.value = _ewm(history, self.alpha)[..., -1] # _ewm seeds each row at its first real value.
+
+    def update(self, x):
+        x = np.asarray(x, dtype=np.float64)
+        if self.value is None:
+            self.value = x
+        else:
+            # Rows with nothing real yet (all padding so far) start at x, like the batch version.
+            blended = self.alpha * x + (1.0 - self.alpha) * self.value
+            self.value = np.where(np.isnan(self.value), x, blended)[()]
+        return self.value
+
+class RollingRSI:
+    __slots__ = ('gain', 'loss', 'last_close')
+
+    def __init__(self, window: int = 14, history=None):
+        self.gain = RollingEMA(alpha=1.0 / window)
+        self.loss = RollingEMA(alpha=1.0 / window)
+        self.last_close = None
+        if history is not None and np.shape(history)[-1] > 1:
+            delta = np.diff(np.asarray(history, dtype=np.float64), axis=-1)
+            self.gain = RollingEMA(alpha=1.0 / window, history=np.clip(delta, 0, None))
+            self.loss = RollingEMA(alpha=1.0 / window, history=np.clip(-delta, 0, None))
+        if history is not None and np.shape(history)[-1]:
+            self.last_close = np.asarray(history, dtype=np.float64)[..., -1]
+
+    def update(self, close):
+        close = np.asarray(close, dtype=np.float64)
+        if self.last_close is not None:
+            delta = close - self.last_close
+            self.gain.update(np.clip(delta, 0, None))
+            self.loss.update(np.clip(-delta, 0, None))
+        self.last_close = close
+        return self.value
+
+    @property
+    def value(self):
+        if self.gain.value is None:
+            return np.nan
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(self.loss.value == 0, 100.0, 100.0 - 100.0 / (1.0 + self.gain.value / self.loss.value))
+
+class RollingATR:
+    __slots__ = ('average', 'last_close')
+
+    def __init__(self, window: int = 14, high=None, low=None, close=None):
+        self.average = RollingEMA(alpha=1.0 / window)
+        self.last_close = None
+        if close is not None and np.shape(close)[-1]:
+            self.average = RollingEMA(alpha=1.0 / window, history=true_range(high, low, close))
+            self.last_close = np.asarray(close, dtype=np.float64)[..., -1]
+
+    def update(self, high, low, close):
+        high, low, close = (np.asarray(x, dtype=np.float64) for x in (high, low, close))
+        prev_close = close if self.last_close is None else np.where(np.isnan(self.last_close), close, self.last_close)
+        tr = np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+        self.last_close = close
+        return self.average.update(tr)
+
+    @property
+    def value(self):
+        return self.average.value
+
+class RollingVWAP:
+    __slots__ = ('pv', 'volume')
+
+    def __init__(self):
+        self.pv = 0.0
+        self.volume = 0.0
+
+    def reset(self):
+        """Call on the first bar of a new session."""
+        self.pv = 0.0
+        self.volume = 0.0
+
+    def update(self, high, low, close, volume):
+        high, low, close, volume = (np.asarray(x, dtype=np.float64) for x in (high, low, close, volume))
+        self.pv = self.pv + (high + low + close) / 3.0 * volume
+        self.volume = self.volume + volume
+        return self.value
+
+    @property
+    def value(self):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(np.asarray(self.volume) > 0, self.pv / self.volume, np.nan)
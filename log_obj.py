@@ -1,45 +1,158 @@
 # Logger class for Logs!
+# Callers only put records on a queue, a background listener does the coloring and the terminal/file writes.
 
+import atexit
+import datetime
+import json
 import logging
+import logging.handlers
+import queue
 import sys
-class Log:
+import threading
+
+SUCCESS = 25
+LOGGER_NAME = "CustomLogger"
+
+logging.addLevelName(SUCCESS, "SUCCESS")
+
+class ColorFormatter(logging.Formatter):
+    """Console output, same colored [LEVEL] prefix the logger always had. Runs on the listener thread."""
     GREEN = "\033[92m"
     YELLOW = "\033[93m"
     RED = "\033[91m"
     RESET = "\033[0m"
     ORANGE = "\033[38;5;214m"
 
+    COLORS = {SUCCESS: GREEN, logging.INFO: YELLOW, logging.WARNING: ORANGE,
+              logging.ERROR: RED, logging.CRITICAL: RED}
+
+    def format(self, record):
+        message = record.getMessage()
+        fields = getattr(record, 'fields', None)
+        if fields:
+            message += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        if record.exc_info:
+            message += "\n" + self.formatException(record.exc_info)
+        color = self.COLORS.get(record.levelno, "")
+        return f"{color}[{record.levelname}] {message}{self.RESET if color else ''}"
+
+class JsonFormatter(logging.Formatter):
+    """One json object per line for the file sink, keyword fields passed to Log land as top level keys."""
+
+    def format(self, record):
+        entry = {'ts': datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(),
+                 'level': record.levelname, 'thread': record.threadName, 'msg': record.getMessage()}
+        entry.update(getattr(record, 'fields', None) or {})
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, separators=(',', ':'), default=str)
+
+class _LazyQueueHandler(logging.handlers.QueueHandler):
+    # The stock QueueHandler formats on the caller's thread so records can be pickled. Our queue never leaves
+    # the process, so the record goes in as is and message % args happens on the listener.
+    def prepare(self, record):
+        return record
+
+_setup_lock = threading.Lock()
+_queue = None
+_listener = None
+_console = None
+_file_sink = None
+
+def _handlers():
+    return [handler for handler in (_console, _file_sink) if handler is not None]
+
+def _restart(handlers):
+    """Swap the listener's handlers, records already queued are written first."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+    _listener = logging.handlers.QueueListener(_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+def _setup():
+    """Wire the shared logger once per process, every Log() after the first just reuses it."""
+    global _queue, _console
+    if _queue is not None:
+        return
+    with _setup_lock:
+        if _queue is not None:
+            return
+        logger = logging.getLogger(LOGGER_NAME)
+        logger.setLevel(logging.DEBUG)
+        logger.propagate = False
+        _console = logging.StreamHandler()
+        _console.setLevel(logging.DEBUG)
+        _console.setFormatter(ColorFormatter())
+        _queue = queue.Queue(-1) # Unbounded, put never blocks the caller.
+        logger.addHandler(_LazyQueueHandler(_queue))
+        _restart(_handlers())
+        atexit.register(shutdown)
+
+def configure(level=None, json_path=None, max_bytes=10 * 1024 * 1024, backup_count=5, console=True):
+    """Adjust logging for the process. json_path adds a rotating JSON-lines file sink."""
+    global _file_sink
+    _setup()
+    with _setup_lock:
+        if level is not None:
+            logging.getLogger(LOGGER_NAME).setLevel(level)
+        _console.setLevel(logging.DEBUG if console else logging.CRITICAL + 1)
+        if json_path is not None:
+            if _file_sink is not None:
+                _file_sink.close()
+            _file_sink = logging.handlers.RotatingFileHandler(json_path, maxBytes=max_bytes,
+                                                              backupCount=backup_count, encoding='utf-8')
+            _file_sink.setFormatter(JsonFormatter())
+        _restart(_handlers())
+
+def flush():
+    """Block until everything queued so far has been written."""
+    if _queue is not None and _listener is not None:
+        _queue.join()
+
+def shutdown():
+    global _listener
+    if _listener is not None:
+        _listener.stop() # Drains the queue before returning.
+        _listener = None
+    for handler in _handlers():
+        try:
+            handler.flush()
+        except (OSError, ValueError):
+            pass # The stream was closed before atexit got here (pytest's capture, a closed pipe).
+
+class Log:
+    GREEN = ColorFormatter.GREEN
+    YELLOW = ColorFormatter.YELLOW
+    RED = ColorFormatter.RED
+    RESET = ColorFormatter.RESET
+    ORANGE = ColorFormatter.ORANGE
+
     def __init__(self):
-        self.logger = logging.getLogger("CustomLogger")
-        self.logger.setLevel(logging.DEBUG)
-        handler = logging.StreamHandler()
-        handler.setLevel(logging.DEBUG)
-        formatter = logging.Formatter("%(message)s")
-        handler.setFormatter(formatter)
-        self.logger.addHandler(handler)
-
-        logging.addLevelName(25, "SUCCESS")
-    
-    def success(self, message):
+        _setup()
+        self.logger = logging.getLogger(LOGGER_NAME)
+
+    # Messages take %-style args and keyword fields, neither is formatted on the calling thread.
+    # self.log.info("Quoted %s", symbol, latency_ms=3.2)
+
+    def success(self, message, *args, **fields):
         """Log a success message in green."""
-        self.logger.log(25, f"{self.GREEN}[SUCCESS] {message}{self.RESET}")
+        self.logger.log(SUCCESS, message, *args, extra={'fields': fields})
 
-    def info(self, message):
+    def info(self, message, *args, **fields):
         """Log an info message in yellow."""
-        self.logger.info(f"{self.YELLOW}[INFO] {message}{self.RESET}")
+        self.logger.info(message, *args, extra={'fields': fields})
 
-    def error(self, message, kill=False):
+    def error(self, message, *args, kill=False, **fields):
         """Log an error message in red."""
-        self.logger.error(f"{self.RED}[ERROR] {message}{self.RESET}")
-        if kill == True: # If the error requires killing the program check param. 
+        self.logger.error(message, *args, extra={'fields': fields})
+        if kill == True: # If the error requires killing the program check param.
+            flush() # Make sure the reason is on screen before exiting.
             sys.exit(1)
-        else:
-            pass
-    
-    def warning(self, message):
-        """Log an warning message in orange."""
-        self.logger.warning(f"{self.ORANGE}[WARNING] {message}{self.RESET}")
-
 
+    def warning(self, message, *args, **fields):
+        """Log an warning message in orange."""
+        self.logger.warning(message, *args, extra={'fields': fields})
 
-        
\ No newline at end of file
+    def debug(self, message, *args, **fields):
+        self.logger.debug(message, *args, extra={'fields': fields})
@@ -19,26 +19,30 @@ if __name__ == "__main__":
     parser.add_argument("--auto-refresh-token", type=bool, default=True, help="Set to false will result in one 30min authentication session.")
     parser.add_argument("--install_path", type=str, default=os.path.expanduser('~/.schwab_auto_trader'), help="Default directory where files will be installed.")
     parser.add_argument("--get-cred", action='store_true', default=False, help="Display token credentials if present.")
+    parser.add_argument("--daemon", "-d", action='store_true', default=False, help="Stay resident and serve local scripts over a unix socket.")
+    parser.add_argument("--socket", type=str, default=None, help="Unix socket path for --daemon, defaults to trader.sock in the install path.")
+    parser.add_argument("--strategy", action='append', default=[], help="Run a strategy plugin in its own process, module:Class or file.py:Class. Repeatable.")
+    parser.add_argument("--strategy-interval", type=int, default=60, help="Seconds between bar polls for --strategy workers.")
+    parser.add_argument("--quote-bus", type=str, default=None, help="Comma separated symbols to poll into the shared memory quote bus, with --daemon or --strategy.")
+    parser.add_argument("--quote-interval", type=float, default=1.0, help="Seconds between --quote-bus polls.")
+    parser.add_argument("--base-url", type=str, default=None, help="Api root, defaults to $SCHWAB_BASE_URL or https://api.schwabapi.com.")
+    parser.add_argument("--metrics-port", type=int, default=None, help="Serve Prometheus metrics on 127.0.0.1:PORT/metrics.")
+    parser.add_argument("--metrics-file", type=str, default=None, help="Rewrite Prometheus metrics to this file every 15s.")
+    parser.add_argument("--log-file", type=str, default=None, help="Also write JSON-lines logs here, rotated at 10MB.")
     args = parser.parse_args()
 
+    if args.log_file:
+        import log_obj
+        log_obj.configure(json_path=args.log_file)
+
 password = getpass("Enter encryption password to secure schwab-credentials and schwab-tokens.\n"
                    "If you have already entered this, please submit the password you set. ")
 os.environ['super_secret_sauce'] = password
 password = None
 
-tokens_file = os.path.join(args.install_path, 'tokens.yaml')
-timer_file = os.path.join(args.install_path, 'timer.yaml')
+# Tokens and their timers live in token-store.bin, Tokens creates it (or migrates tokens.yaml/timer.yaml) itself.
 credentials_file = os.path.join(args.install_path, 'schwab-credentials.yaml')
 
-if os.path.isfile(tokens_file) == False: 
-      with open(tokens_file, "w") as file:
-          pass
-
-if os.path.isfile(timer_file) == False or os.path.getsize(timer_file) == 0:
-      with open(timer_file, "w") as file:
-          filler = {'refresh_token_time': 0, 'access_token_time': 0}
-          yaml.dump(filler, file, default_flow_style=False)
-
 if os.path.isfile(credentials_file) == False: 
     if os.path.getsize(credentials_file) == 0: # schwab-credentials appears empty 
                 print("We've detected an Empty Schwab Credential file! This will be saved in an encryped file at "+str(credentials_file))
@@ -52,6 +56,26 @@ if os.path.isfile(credentials_file) == False:
                            
 
 trader = Trader(args) # Create the Trader Object.
+
+if args.metrics_port:
+    trader.client.metrics.serve(args.metrics_port)
+if args.metrics_file:
+    trader.client.metrics.export_every(args.metrics_file)
+
+if args.quote_bus: # One batch quote call per interval, every local quote_bus.QuoteReader shares it.
+    from quote_bus import QuoteBus
+    quote_bus = QuoteBus()
+    quote_bus.pump(trader, args.quote_bus.split(','), interval=args.quote_interval)
+
+if args.strategy: # One process per strategy, this process keeps the tokens fresh for all of them.
+    from strategy_host import StrategyHost
+    StrategyHost(trader, args.strategy, interval=args.strategy_interval).run_forever()
+    raise SystemExit(0)
+
+if args.daemon: # Log in once, then every local script shares this Trader through the socket.
+    from daemon import TraderDaemon, default_socket_path
+    trader.tokens.account_hash # Warm up tokens and account hashes before the first client connects.
+    TraderDaemon(trader, args.socket or default_socket_path(args.install_path)).serve_forever()
 # ----------------------------------------- Trade Functions -------------------------------------- #
 # In the following code you can either manually creates trade calls here, or import from examples.py
 # ------------------------------------------------------------------------------------------------ #
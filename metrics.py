@@ -0,0 +1,234 @@
+# metrics.py
+# Per endpoint latency, bytes, status and retry counters for every schwab call, queryable in process or as Prometheus text.
+# Author: Calvin Seamons
+# Last Updated: 18 October, 2026
+
+# Imports
+# ------------------ #
+import bisect
+import os
+import tempfile
+import threading
+import time
+
+# From Imports
+# ------------------ #
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Bucket upper bounds in seconds, sqrt(2) apart from 0.5ms to ~90s. Quantiles are interpolated inside a bucket
+# so p50/p95/p99 come out within a few percent without keeping any samples around.
+LATENCY_BUCKETS = tuple(0.0005 * 2 ** (i / 2) for i in range(36))
+
+class Histogram:
+    """Fixed bucket histogram, observe() is a bisect and two adds."""
+
+    __slots__ = ("bounds", "counts", "count", "sum")
+
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1) # Last bucket is +Inf.
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                if i == len(self.bounds):
+                    return self.bounds[-1]
+                low = self.bounds[i - 1] if i else 0.0
+                return low + (self.bounds[i] - low) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.bounds[-1]
+
+    def summary(self):
+        return {'count': self.count, 'sum': self.sum,
+                'p50': self.quantile(0.50), 'p95': self.quantile(0.95), 'p99': self.quantile(0.99)}
+
+class EndpointStats:
+    __slots__ = ("latency", "limiter_wait", "statuses", "errors", "retries", "bytes_in", "bytes_out")
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.limiter_wait = Histogram()
+        self.statuses = {}
+        self.errors = 0
+        self.retries = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def snapshot(self):
+        return {'latency': self.latency.summary(), 'limiter_wait': self.limiter_wait.summary(),
+                'statuses': dict(self.statuses), 'errors': self.errors, 'retries': self.retries,
+                'bytes_in': self.bytes_in, 'bytes_out': self.bytes_out}
+
+class Metrics:
+    """Registry the Client and Tokens report into. Leave client.metrics as None and nothing is measured at all."""
+
+    def __init__(self):
+        self.endpoints = {}
+        self.token_refresh = Histogram()
+        self.token_refresh_failures = 0
+        self.token_age = None # Set by Tokens, returns (access age, refresh age) in seconds.
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._server = None
+        self._exporter_stop = threading.Event()
+
+    def _stats(self, endpoint):
+        stats = self.endpoints.get(endpoint)
+        if stats is None:
+            stats = self.endpoints.setdefault(endpoint, EndpointStats())
+        return stats
+
+    def observe_request(self, endpoint, status, seconds, bytes_in=0, bytes_out=0):
+        """status is the http status code, or None when the attempt died on a connection error or timeout."""
+        with self._lock:
+            stats = self._stats(endpoint)
+            stats.latency.observe(seconds)
+            if status is None:
+                stats.errors += 1
+            else:
+                stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            stats.bytes_in += bytes_in
+            stats.bytes_out += bytes_out
+
+    def observe_limiter_wait(self, endpoint, seconds):
+        with self._lock:
+            self._stats(endpoint).limiter_wait.observe(seconds)
+
+    def observe_retry(self, endpoint):
+        with self._lock:
+            self._stats(endpoint).retries += 1
+
+    def observe_token_refresh(self, seconds, ok=True):
+        with self._lock:
+            self.token_refresh.observe(seconds)
+            if not ok:
+                self.token_refresh_failures += 1
+
+    def snapshot(self) -> dict:
+        """Everything collected so far as plain dicts, what the daemon's 'metrics' op returns."""
+        with self._lock:
+            result = {'uptime_s': time.time() - self.started,
+                      'endpoints': {endpoint: stats.snapshot() for endpoint, stats in self.endpoints.items()},
+                      'token_refresh': self.token_refresh.summary(),
+                      'token_refresh_failures': self.token_refresh_failures}
+        if self.token_age is not None:
+            access_age, refresh_age = self.token_age()
+            result['token_age'] = {'access_s': access_age, 'refresh_s': refresh_age}
+        return result
+
+    def prometheus(self) -> str:
+        """Prometheus text exposition format, version 0.0.4."""
+        lines = []
+
+        def histogram(name, help_text, series):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, hist in series:
+                cumulative = 0
+                for bound, bucket_count in zip(hist.bounds, hist.counts):
+                    cumulative += bucket_count
+                    lines.append(f'{name}_bucket{{{labels}le="{bound:.6g}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{{labels}le="+Inf"}} {hist.count}')
+                lines.append(f'{name}_sum{_braces(labels)} {hist.sum:.9g}')
+                lines.append(f'{name}_count{_braces(labels)} {hist.count}')
+
+        def sample(name, help_text, series, kind="counter"):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in series:
+                lines.append(f'{name}{_braces(labels)} {value}')
+
+        with self._lock:
+            endpoints = sorted(self.endpoints.items())
+            labelled = [(f'endpoint="{_escape(endpoint)}",', stats) for endpoint, stats in endpoints]
+            histogram("schwab_request_duration_seconds", "Time per http attempt against schwab.",
+                      [(labels, stats.latency) for labels, stats in labelled])
+            histogram("schwab_rate_limiter_wait_seconds", "Time spent queued in the rate limiter before sending.",
+                      [(labels, stats.limiter_wait) for labels, stats in labelled])
+            sample("schwab_responses_total", "Responses by status code.",
+                   [(f'{labels}status="{status}"', count) for labels, stats in labelled
+                    for status, count in sorted(stats.statuses.items())])
+            sample("schwab_request_errors_total", "Attempts that failed without a response.",
+                   [(labels.rstrip(','), stats.errors) for labels, stats in labelled])
+            sample("schwab_retries_total", "Attempts repeated by the retry policy or a 401 replay.",
+                   [(labels.rstrip(','), stats.retries) for labels, stats in labelled])
+            sample("schwab_received_bytes_total", "Response body bytes.",
+                   [(labels.rstrip(','), stats.bytes_in) for labels, stats in labelled])
+            sample("schwab_sent_bytes_total", "Request body bytes.",
+                   [(labels.rstrip(','), stats.bytes_out) for labels, stats in labelled])
+            histogram("schwab_token_refresh_duration_seconds", "Time per access token refresh.",
+                      [("", self.token_refresh)])
+            sample("schwab_token_refresh_failures_total", "Refreshes schwab rejected.",
+                   [("", self.token_refresh_failures)])
+        if self.token_age is not None:
+            access_age, refresh_age = self.token_age()
+            sample("schwab_token_age_seconds", "Seconds since the token was issued.",
+                   [('token="access"', f"{access_age:.3f}"), ('token="refresh"', f"{refresh_age:.3f}")], kind="gauge")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        """Atomically write the exposition to path, for node_exporter's textfile collector."""
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(prefix=".metrics.", dir=directory)
+        with os.fdopen(fd, 'w') as tmp:
+            tmp.write(self.prometheus())
+        os.replace(tmp_path, path)
+
+    def export_every(self, path, interval=15):
+        """Rewrite path every interval seconds on a daemon thread until close()."""
+        def loop():
+            while not self._exporter_stop.wait(interval):
+                try:
+                    self.write_prometheus(path)
+                except OSError:
+                    pass # Disk hiccup, the next tick tries again.
+        self.write_prometheus(path)
+        threading.Thread(target=loop, name="metrics-export", daemon=True).start()
+
+    def serve(self, port=9464, host="127.0.0.1"):
+        """Serve /metrics on a daemon thread, localhost only by default."""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.split('?', 1)[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = metrics.prometheus().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True).start()
+        return self._server
+
+    def close(self):
+        self._exporter_stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+def _braces(labels):
+    labels = labels.rstrip(',')
+    return f"{{{labels}}}" if labels else ""
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"')
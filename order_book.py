@@ -0,0 +1,185 @@
+# order_book.py
+# Incremental L2 order book for the NASDAQ_BOOK / NYSE_BOOK streams.
+# Author: Calvin Seamons
+# Last Updated: 18 October, 2026
+
+# Imports
+# ------------------ #
+from array import array
+from bisect import bisect_left
+from collections import namedtuple
+
+BID = 0
+ASK = 1
+
+# size 0 means the level was removed. Plain tuples underneath, cheap to build and to pass around.
+BookEvent = namedtuple("BookEvent", ("symbol", "side", "price", "size"))
+
+class BookSide:
+    """Price levels for one side in sorted arrays, the best price always sits at the end.
+
+    Bids are stored by price and asks by negated price, both ascending, so finding a level is a bisect,
+    the best level is index -1 and removing or adding near the top of book barely moves memory.
+    cumulative[i] is the size of levels 0..i, counted from the worst price, so a change only rewrites
+    the entries above it (few, near the top) and depth(n) is one subtraction.
+    """
+
+    __slots__ = ("sign", "keys", "sizes", "cumulative")
+
+    def __init__(self, side):
+        self.sign = 1.0 if side == BID else -1.0
+        self.keys = array('d')
+        self.sizes = array('d')
+        self.cumulative = array('d')
+
+    def __len__(self):
+        return len(self.keys)
+
+    def get(self, price):
+        key = price * self.sign
+        i = bisect_left(self.keys, key)
+        if i < len(self.keys) and self.keys[i] == key:
+            return self.sizes[i]
+        return 0.0
+
+    def update(self, price, size) -> bool:
+        """Set the size at price (0 removes it), returns True when something actually changed."""
+        key = price * self.sign
+        i = bisect_left(self.keys, key)
+        found = i < len(self.keys) and self.keys[i] == key
+        if size <= 0:
+            if not found:
+                return False
+            del self.keys[i]
+            del self.sizes[i]
+            del self.cumulative[i]
+            self._accumulate(i)
+            return True
+        if found:
+            if self.sizes[i] == size:
+                return False
+            self.sizes[i] = size
+            self._accumulate(i)
+            return True
+        self.keys.insert(i, key)
+        self.sizes.insert(i, size)
+        self.cumulative.insert(i, 0.0)
+        self._accumulate(i)
+        return True
+
+    def _accumulate(self, i):
+        # Re-add from i instead of applying a delta, so rounding can't drift over millions of updates.
+        running = self.cumulative[i - 1] if i else 0.0
+        sizes, cumulative = self.sizes, self.cumulative
+        for j in range(i, len(sizes)):
+            running += sizes[j]
+            cumulative[j] = running
+
+    def best(self):
+        if not self.keys:
+            return None, 0.0
+        return self.keys[-1] * self.sign, self.sizes[-1]
+
+    def level(self, n):
+        """nth level from the top of book (0 is best) as (price, size)."""
+        if n >= len(self.keys):
+            return None, 0.0
+        return self.keys[-1 - n] * self.sign, self.sizes[-1 - n]
+
+    def depth(self, n):
+        """Total size resting in the best n levels, O(1)."""
+        if n <= 0 or not self.cumulative:
+            return 0.0
+        if n >= len(self.cumulative):
+            return self.cumulative[-1]
+        return self.cumulative[-1] - self.cumulative[-1 - n]
+
+    def levels(self):
+        return [(key * self.sign, size) for key, size in zip(reversed(self.keys), reversed(self.sizes))]
+
+    def clear(self):
+        del self.keys[:]
+        del self.sizes[:]
+        del self.cumulative[:]
+
+class OrderBook:
+
+    __slots__ = ("symbol", "bids", "asks", "time")
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+        self.bids = BookSide(BID)
+        self.asks = BookSide(ASK)
+        self.time = None
+
+    def update(self, side, price, size):
+        """Apply one level change, returns a BookEvent or None if the book didn't change."""
+        book_side = self.bids if side == BID else self.asks
+        if book_side.update(price, size):
+            return BookEvent(self.symbol, side, price, size if size > 0 else 0.0)
+        return None
+
+    def apply_snapshot(self, message) -> list:
+        """Diff a streamer book message ('2' bids, '3' asks, each level {'0': price, '1': size}) into the book.
+
+        Only levels that were added, resized or removed produce events.
+        """
+        self.time = message.get("1", self.time)
+        events = []
+        for side, field in ((BID, "2"), (ASK, "3")):
+            book_side = self.bids if side == BID else self.asks
+            incoming = {}
+            for level in message.get(field) or []:
+                incoming[float(level["0"])] = float(level.get("1", 0))
+            for price, _ in book_side.levels():
+                if price not in incoming:
+                    book_side.update(price, 0)
+                    events.append(BookEvent(self.symbol, side, price, 0.0))
+            for price, size in incoming.items():
+                if book_side.update(price, size):
+                    events.append(BookEvent(self.symbol, side, price, size))
+        return events
+
+    def best_bid(self):
+        return self.bids.best()
+
+    def best_ask(self):
+        return self.asks.best()
+
+    def spread(self):
+        bid, _ = self.bids.best()
+        ask, _ = self.asks.best()
+        if bid is None or ask is None:
+            return None
+        return ask - bid
+
+    def mid(self):
+        bid, _ = self.bids.best()
+        ask, _ = self.asks.best()
+        if bid is None or ask is None:
+            return None
+        return (ask + bid) / 2.0
+
+    def depth(self, n):
+        """(bid size, ask size) resting in the best n levels."""
+        return self.bids.depth(n), self.asks.depth(n)
+
+class OrderBooks:
+    """One OrderBook per symbol, use as a Streamer handler for NASDAQ_BOOK / NYSE_BOOK."""
+
+    def __init__(self, on_events=None):
+        self.books = {}
+        self.on_events = on_events
+
+    def __getitem__(self, symbol):
+        return self.books[symbol]
+
+    def __call__(self, message):
+        symbol = message.get("key") or message.get("0")
+        book = self.books.get(symbol)
+        if book is None:
+            book = self.books[symbol] = OrderBook(symbol)
+        events = book.apply_snapshot(message)
+        if events and self.on_events is not None:
+            self.on_events(events)
+        return events
@@ -0,0 +1,144 @@
+# orders.py
+# Compact Order model, validated once and serialized once into the /trader/v1/accounts/{hash}/orders payload.
+# Author: Calvin Seamons
+# Last Updated: 18 October, 2026
+
+# Imports
+# ------------------ #
+import json
+
+ORDER_TYPES = {"MARKET", "LIMIT", "STOP", "STOP_LIMIT", "TRAILING_STOP", "MARKET_ON_CLOSE", "LIMIT_ON_CLOSE"}
+INSTRUCTIONS = {"BUY", "SELL", "BUY_TO_COVER", "SELL_SHORT", "BUY_TO_OPEN", "BUY_TO_CLOSE", "SELL_TO_OPEN", "SELL_TO_CLOSE"}
+SESSIONS = {"NORMAL", "AM", "PM", "SEAMLESS"}
+DURATIONS = {"DAY", "GOOD_TILL_CANCEL", "FILL_OR_KILL", "IMMEDIATE_OR_CANCEL"}
+ASSET_TYPES = {"EQUITY", "OPTION", "INDEX", "MUTUAL_FUND", "CASH_EQUIVALENT", "FIXED_INCOME", "CURRENCY", "COLLECTIVE_INVESTMENT"}
+NEEDS_PRICE = {"LIMIT", "STOP_LIMIT", "LIMIT_ON_CLOSE"}
+NEEDS_STOP = {"STOP", "STOP_LIMIT"}
+
+def _format_price(price):
+    # Schwab wants prices as strings, sub-dollar equities and options get four decimals.
+    if price is None or isinstance(price, str):
+        return price
+    return f"{price:.2f}" if abs(price) >= 1 else f"{price:.4f}"
+
+class Order:
+    """One order, SINGLE by default or an OCO / TRIGGER strategy holding child orders.
+
+    Arguments are checked once in __init__ and the payload and its JSON body are built right there,
+    so submitting a basket is just handing pre-encoded bytes to the session.
+    """
+
+    __slots__ = ("symbol", "instruction", "quantity", "order_type", "asset_type", "price", "stop_price",
+                 "session", "duration", "tax_lot_method", "position_effect", "order_strategy_type",
+                 "complex_order_strategy_type", "leg_id", "order_leg_type", "children", "payload", "body")
+
+    def __init__(self, symbol=None, instruction=None, quantity=None, order_type="MARKET", asset_type="EQUITY",
+                 price=None, stop_price=None, session="NORMAL", duration="DAY", tax_lot_method="FIFO",
+                 position_effect="OPENING", order_strategy_type="SINGLE", complex_order_strategy_type="NONE",
+                 leg_id=1, order_leg_type=None, children=()):
+        self.symbol = symbol.upper() if symbol else symbol
+        self.instruction = instruction
+        self.quantity = quantity
+        self.order_type = order_type
+        self.asset_type = asset_type
+        self.price = _format_price(price)
+        self.stop_price = _format_price(stop_price)
+        self.session = session
+        self.duration = duration
+        self.tax_lot_method = tax_lot_method
+        self.position_effect = position_effect
+        self.order_strategy_type = order_strategy_type
+        self.complex_order_strategy_type = complex_order_strategy_type
+        self.leg_id = leg_id
+        self.order_leg_type = order_leg_type or asset_type
+        self.children = tuple(children)
+        self._validate()
+        self.payload = self._build()
+        self.body = json.dumps(self.payload, separators=(',', ':')).encode()
+
+    @classmethod
+    def oco(cls, first, second):
+        """One cancels other, whichever child fills first cancels the other."""
+        return cls(order_strategy_type="OCO", children=(first, second))
+
+    @classmethod
+    def trigger(cls, parent, *children):
+        """Children are only sent to the market once parent fills."""
+        return cls(parent.symbol, parent.instruction, parent.quantity, parent.order_type, parent.asset_type,
+                   parent.price, parent.stop_price, parent.session, parent.duration, parent.tax_lot_method,
+                   parent.position_effect, "TRIGGER", parent.complex_order_strategy_type, parent.leg_id,
+                   parent.order_leg_type, children)
+
+    def _validate(self):
+        if self.order_strategy_type == "OCO":
+            if len(self.children) != 2 or not all(isinstance(child, Order) for child in self.children):
+                raise ValueError("An OCO order needs exactly two child Orders.")
+            return
+        if self.order_strategy_type not in ("SINGLE", "TRIGGER"):
+            raise ValueError(f"Unknown order strategy '{self.order_strategy_type}'.")
+        if self.order_strategy_type == "TRIGGER" and not self.children:
+            raise ValueError("A TRIGGER order needs at least one child Order.")
+        if not self.symbol:
+            raise ValueError("Order is missing a symbol.")
+        if self.instruction not in INSTRUCTIONS:
+            raise ValueError(f"Unknown instruction '{self.instruction}' for {self.symbol}.")
+        if self.order_type not in ORDER_TYPES:
+            raise ValueError(f"Unknown order type '{self.order_type}' for {self.symbol}.")
+        if self.asset_type not in ASSET_TYPES:
+            raise ValueError(f"Unknown asset type '{self.asset_type}' for {self.symbol}.")
+        if self.session not in SESSIONS:
+            raise ValueError(f"Unknown session '{self.session}' for {self.symbol}.")
+        if self.duration not in DURATIONS:
+            raise ValueError(f"Unknown duration '{self.duration}' for {self.symbol}.")
+        if not isinstance(self.quantity, (int, float)) or self.quantity <= 0:
+            raise ValueError(f"Quantity for {self.symbol} must be a positive number, got {self.quantity!r}.")
+        if self.order_type in NEEDS_PRICE and self.price is None:
+            raise ValueError(f"{self.order_type} order for {self.symbol} needs a price.")
+        if self.order_type in NEEDS_STOP and self.stop_price is None:
+            raise ValueError(f"{self.order_type} order for {self.symbol} needs a stop_price.")
+
+    def _build(self):
+        if self.order_strategy_type == "OCO":
+            return {"orderStrategyType": "OCO", "childOrderStrategies": [child.payload for child in self.children]}
+
+        # Same shape design_order in schwab.py always produced, optional keys only when they're set.
+        payload = {
+            "session": self.session,
+            "duration": self.duration,
+            "orderType": self.order_type,
+            "complexOrderStrategyType": self.complex_order_strategy_type,
+            "quantity": self.quantity,
+            "taxLotMethod": self.tax_lot_method,
+            "orderLegCollection": [
+                {
+                    "orderLegType": self.order_leg_type,
+                    "legId": self.leg_id,
+                    "instrument": {
+                        "symbol": self.symbol,
+                        "assetType": self.asset_type,
+                    },
+                    "instruction": self.instruction,
+                    "positionEffect": self.position_effect,
+                    "quantity": self.quantity,
+                }
+            ],
+            "orderStrategyType": self.order_strategy_type,
+        }
+        if self.price is not None:
+            payload["price"] = self.price
+        if self.stop_price is not None:
+            payload["stopPrice"] = self.stop_price
+        if self.children:
+            payload["childOrderStrategies"] = [child.payload for child in self.children]
+        return payload
+
+    def __repr__(self):
+        if self.order_strategy_type == "OCO":
+            return f"Order.oco({self.children[0]!r}, {self.children[1]!r})"
+        return f"Order({self.instruction} {self.quantity} {self.symbol} {self.order_type} {self.price or ''})".replace(" )", ")")
+
+def order_id_from_location(location):
+    """Schwab answers a placed order with 201 and a Location header ending in the new order id."""
+    if not location:
+        return None
+    return location.rstrip('/').rsplit('/', 1)[-1]
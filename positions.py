@@ -0,0 +1,123 @@
+# positions.py
+# Positions table with delta tracking, subscribers only hear about what actually changed between polls.
+# Author: Calvin Seamons
+# Last Updated: 18 October, 2026
+
+# Imports
+# ------------------ #
+import numpy as np
+
+# From Imports
+# ------------------ #
+from collections import namedtuple
+
+OPENED = "opened"
+CLOSED = "closed"
+QUANTITY = "quantity"
+COST_BASIS = "cost_basis"
+
+PositionDelta = namedtuple("PositionDelta", ("kind", "account", "symbol", "old_quantity", "new_quantity",
+                                             "old_average_price", "new_average_price"))
+
+class PositionsTable:
+    """One row per (account, symbol), columns are numpy arrays and keys map to rows."""
+
+    __slots__ = ("keys", "rows", "quantity", "average_price", "market_value", "asset_type")
+
+    def __init__(self, keys=(), quantity=(), average_price=(), market_value=(), asset_type=()):
+        self.keys = list(keys)
+        self.rows = {key: row for row, key in enumerate(self.keys)}
+        self.quantity = np.asarray(quantity, dtype=np.float64)
+        self.average_price = np.asarray(average_price, dtype=np.float64)
+        self.market_value = np.asarray(market_value, dtype=np.float64)
+        self.asset_type = list(asset_type)
+
+    def __len__(self):
+        return len(self.keys)
+
+    @classmethod
+    def from_accounts(cls, accounts):
+        """Decode a /trader/v1/accounts?fields=positions response in one pass."""
+        keys, quantity, average_price, market_value, asset_type = [], [], [], [], []
+        for account in accounts or []:
+            securities = account.get('securitiesAccount', account)
+            number = securities.get('accountNumber')
+            for position in securities.get('positions') or []:
+                instrument = position.get('instrument', {})
+                keys.append((number, instrument.get('symbol')))
+                quantity.append(position.get('longQuantity', 0) - position.get('shortQuantity', 0))
+                average_price.append(position.get('averagePrice', 0))
+                market_value.append(position.get('marketValue', 0))
+                asset_type.append(instrument.get('assetType'))
+        return cls(keys, quantity, average_price, market_value, asset_type)
+
+    def cost_basis(self):
+        return self.average_price * np.abs(self.quantity)
+
+    def get(self, account, symbol):
+        row = self.rows.get((account, symbol))
+        if row is None:
+            return None
+        return {'account': account, 'symbol': symbol, 'asset_type': self.asset_type[row],
+                'quantity': float(self.quantity[row]), 'average_price': float(self.average_price[row]),
+                'market_value': float(self.market_value[row])}
+
+class PositionsTracker:
+    """Keeps the last PositionsTable and turns each poll into opened/closed/quantity/cost_basis deltas.
+
+    Rows are compared as whole arrays, so a poll where nothing moved is one vectorized compare and no
+    subscriber gets called.
+    """
+
+    def __init__(self, trader=None):
+        self.trader = trader
+        self.table = PositionsTable()
+        self.subscribers = []
+
+    def subscribe(self, callback):
+        """callback(list of PositionDelta), only called when something changed."""
+        self.subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        self.subscribers.remove(callback)
+
+    def poll(self):
+        return self.update(self.trader.accounts(fields='positions'))
+
+    def update(self, accounts) -> list:
+        new = PositionsTable.from_accounts(accounts)
+        old = self.table
+        deltas = []
+
+        old_rows = np.fromiter((old.rows.get(key, -1) for key in new.keys), dtype=np.int64, count=len(new))
+        existing = old_rows >= 0
+        matched = old_rows[existing]
+        old_quantity = np.full(len(new), np.nan)
+        old_average = np.full(len(new), np.nan)
+        old_quantity[existing] = old.quantity[matched]
+        old_average[existing] = old.average_price[matched]
+
+        opened = np.flatnonzero(~existing)
+        quantity_changed = np.flatnonzero(existing & (old_quantity != new.quantity))
+        cost_changed = np.flatnonzero(existing & (old_quantity == new.quantity) & (old_average != new.average_price))
+        for kind, rows in ((OPENED, opened), (QUANTITY, quantity_changed), (COST_BASIS, cost_changed)):
+            for row in rows:
+                account, symbol = new.keys[row]
+                deltas.append(PositionDelta(kind, account, symbol,
+                                            None if kind == OPENED else float(old_quantity[row]), float(new.quantity[row]),
+                                            None if kind == OPENED else float(old_average[row]), float(new.average_price[row])))
+
+        if len(old):
+            still_held = np.zeros(len(old), dtype=bool)
+            still_held[matched] = True
+            for row in np.flatnonzero(~still_held):
+                account, symbol = old.keys[row]
+                deltas.append(PositionDelta(CLOSED, account, symbol, float(old.quantity[row]), 0.0,
+                                            float(old.average_price[row]), None))
+
+        self.table = new
+        if deltas:
+            for callback in list(self.subscribers):
+                callback(deltas)
+        return deltas
@@ -0,0 +1,178 @@
+# price_history.py
+# Local columnar candle cache, only the missing date ranges get downloaded from /marketdata/v1/pricehistory.
+# Author: Calvin Seamons
+# Last Updated: 18 October, 2026
+
+# Imports
+# ------------------ #
+import datetime
+import json
+import numpy as np
+import os
+import threading
+import time
+
+COLUMNS = (('datetime', '<i8'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'), ('close', '<f8'), ('volume', '<f8'))
+
+# Schwab only accepts some periodType/frequencyType pairs, when we pass explicit dates this is all it needs.
+PERIOD_TYPES = {'minute': 'day', 'daily': 'year', 'weekly': 'year', 'monthly': 'year'}
+
+def to_epoch_ms(dt):
+    """Accept epoch ms, a datetime or a date and return epoch milliseconds."""
+    if dt is None:
+        return None
+    if isinstance(dt, datetime.datetime):
+        return int(dt.timestamp() * 1000)
+    if isinstance(dt, datetime.date):
+        return int(datetime.datetime(dt.year, dt.month, dt.day, tzinfo=datetime.timezone.utc).timestamp() * 1000)
+    return int(dt)
+
+def decode_candles(payload) -> dict:
+    """Turn a pricehistory response into {column: contiguous numpy array}, sorted by datetime."""
+    candles = (payload or {}).get('candles') or []
+    columns = {name: np.fromiter((c.get(name, 0) for c in candles), dtype=dtype, count=len(candles))
+               for name, dtype in COLUMNS}
+    order = np.argsort(columns['datetime'], kind='stable')
+    return {name: column[order] for name, column in columns.items()}
+
+class PriceHistoryStore:
+    """Candles per symbol and frequency, one raw little-endian file per column plus a small meta.json.
+
+    Column files only ever grow at the end and are read back through np.memmap, so a warm read is a disk read with no
+    JSON parsing. meta.json remembers the date range already requested, get() only fetches what's outside it.
+    """
+
+    def __init__(self, root, trader=None, fetch=None):
+        self.root = root
+        # fetch(symbol, frequency_type, frequency, start_ms, end_ms) -> pricehistory json or decoded columns,
+        # defaults to the Trader.
+        self.fetch = fetch if fetch is not None else self._trader_fetch
+        self.trader = trader
+        self._lock = threading.Lock()
+
+    def _trader_fetch(self, symbol, frequency_type, frequency, start_ms, end_ms):
+        # Already columns, candles go from response bytes to arrays without a dict per candle.
+        return self.trader.price_history_arrays(symbol, period_type=PERIOD_TYPES.get(frequency_type),
+                                         frequency_type=frequency_type, frequency=frequency,
+                                         start_date=start_ms, end_date=end_ms)
+
+    def _dir(self, symbol, frequency_type, frequency):
+        return os.path.join(self.root, symbol.upper().replace('/', '_'), f"{frequency_type}-{frequency}")
+
+    def _meta(self, path):
+        try:
+            with open(os.path.join(path, 'meta.json'), 'r') as meta_file:
+                return json.load(meta_file)
+        except FileNotFoundError:
+            return {'rows': 0, 'covered_start': None, 'covered_end': None}
+
+    def _write_meta(self, path, meta):
+        tmp_path = os.path.join(path, 'meta.json.tmp')
+        with open(tmp_path, 'w') as meta_file:
+            json.dump(meta, meta_file)
+        os.replace(tmp_path, os.path.join(path, 'meta.json'))
+
+    def _columns(self, path, rows):
+        columns = {}
+        for name, dtype in COLUMNS:
+            if rows == 0:
+                columns[name] = np.empty(0, dtype=dtype)
+            else:
+                columns[name] = np.memmap(os.path.join(path, f"{name}.col"), dtype=dtype, mode='r', shape=(rows,))
+        return columns
+
+    def _decode(self, payload):
+        if payload and 'candles' not in payload and 'datetime' in payload:
+            return payload # fetch handed back decoded columns.
+        return decode_candles(payload)
+
+    def _append(self, path, meta, new):
+        """Append candles newer than what's stored, overwriting stored rows the new data overlaps."""
+        if len(new['datetime']) == 0:
+            return
+        rows = meta['rows']
+        keep = rows
+        if rows:
+            stored = self._columns(path, rows)['datetime']
+            keep = int(np.searchsorted(stored, new['datetime'][0], side='left'))
+            del stored
+            if keep + len(new['datetime']) < rows: # Fewer bars than we already hold, only add the newer ones.
+                new = {name: column[rows - keep:] for name, column in new.items()}
+                keep = rows
+        # Overlapping rows (a bar that was still forming) are overwritten in place, files only ever grow
+        # so readers still holding a memmap of the old length are never cut short.
+        for name, dtype in COLUMNS:
+            column_path = os.path.join(path, f"{name}.col")
+            with open(column_path, 'r+b' if os.path.exists(column_path) else 'wb') as column_file:
+                column_file.seek(keep * np.dtype(dtype).itemsize)
+                column_file.write(new[name].tobytes())
+        meta['rows'] = keep + len(new['datetime'])
+
+    def _prepend(self, path, meta, new):
+        """Older candles go in front, the only case where the column files get rewritten."""
+        rows = meta['rows']
+        if len(new['datetime']) == 0:
+            return
+        old = {name: np.array(column) for name, column in self._columns(path, rows).items()}
+        if rows:
+            cut = int(np.searchsorted(new['datetime'], old['datetime'][0], side='left'))
+            new = {name: column[:cut] for name, column in new.items()}
+        for name, _ in COLUMNS:
+            tmp_path = os.path.join(path, f"{name}.col.tmp")
+            with open(tmp_path, 'wb') as column_file:
+                column_file.write(new[name].tobytes())
+                column_file.write(old[name].tobytes())
+            os.replace(tmp_path, os.path.join(path, f"{name}.col"))
+        meta['rows'] = rows + len(new['datetime'])
+
+    def missing_ranges(self, meta, start_ms, end_ms):
+        if meta['covered_start'] is None:
+            return [(start_ms, end_ms)]
+        ranges = []
+        if start_ms < meta['covered_start']:
+            ranges.append((start_ms, meta['covered_start'] - 1))
+        if end_ms > meta['covered_end']:
+            ranges.append((meta['covered_end'] + 1, end_ms))
+        return ranges
+
+    def update(self, symbol, frequency_type='daily', frequency=1, start=None, end=None):
+        """Fetch and store only the parts of [start, end] we have never requested before."""
+        end_ms = min(to_epoch_ms(end) or int(time.time() * 1000), int(time.time() * 1000))
+        start_ms = to_epoch_ms(start) if start is not None else end_ms - 365 * 86400 * 1000
+        path = self._dir(symbol, frequency_type, frequency)
+        with self._lock:
+            os.makedirs(path, exist_ok=True)
+            meta = self._meta(path)
+            for range_start, range_end in self.missing_ranges(meta, start_ms, end_ms):
+                if meta['covered_end'] is not None and range_start > meta['covered_end']:
+                    # Re-request from the last stored bar so a bar that was still forming gets completed.
+                    if meta['rows']:
+                        range_start = min(range_start, int(self._columns(path, meta['rows'])['datetime'][-1]))
+                    self._append(path, meta, self._decode(self.fetch(symbol, frequency_type, frequency, range_start, range_end)))
+                elif meta['covered_start'] is None:
+                    self._append(path, meta, self._decode(self.fetch(symbol, frequency_type, frequency, range_start, range_end)))
+                else:
+                    self._prepend(path, meta, self._decode(self.fetch(symbol, frequency_type, frequency, range_start, range_end)))
+                meta['covered_start'] = min(x for x in (meta['covered_start'], start_ms) if x is not None)
+                meta['covered_end'] = max(x for x in (meta['covered_end'], range_end) if x is not None)
+                self._write_meta(path, meta) # Meta after data, a crash just means a range gets fetched again.
+        return meta
+
+    def read(self, symbol, frequency_type='daily', frequency=1, start=None, end=None) -> dict:
+        """Return {column: numpy array} for stored candles in [start, end], memory mapped, no network."""
+        path = self._dir(symbol, frequency_type, frequency)
+        columns = self._columns(path, self._meta(path)['rows'])
+        stamps = columns['datetime']
+        lo = 0 if start is None else int(np.searchsorted(stamps, to_epoch_ms(start), side='left'))
+        hi = len(stamps) if end is None else int(np.searchsorted(stamps, to_epoch_ms(end), side='right'))
+        return {name: column[lo:hi] for name, column in columns.items()}
+
+    def get(self, symbol, frequency_type='daily', frequency=1, start=None, end=None) -> dict:
+        self.update(symbol, frequency_type, frequency, start, end)
+        return self.read(symbol, frequency_type, frequency, start, end)
+
+    def to_frame(self, columns: dict):
+        import pandas # Only needed for notebooks, keep it off the import path of everything else.
+        frame = pandas.DataFrame({name: np.asarray(column) for name, column in columns.items()})
+        frame.index = pandas.to_datetime(frame.pop('datetime'), unit='ms', utc=True)
+        return frame
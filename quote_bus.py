@@ -0,0 +1,292 @@
+# quote_bus.py
+# Level one quotes in a shared memory ring buffer, one process fetches or streams them and any number of local processes read.
+# Author: Calvin Seamons
+# Last Updated: 18 October, 2026
+
+# Imports
+# ------------------ #
+import atexit
+import numpy as np
+import threading
+import time
+
+# From Imports
+# ------------------ #
+from multiprocessing import shared_memory
+
+# Local File Imports
+# ------------------ #
+from log_obj import Log
+
+DEFAULT_NAME = "schwab_quotes"
+MAGIC = 0x5153425553310001 # "QSBUS1" plus a layout version, readers refuse anything else.
+
+HEADER = np.dtype([('magic', '<u8'), ('capacity', '<u8'), ('max_symbols', '<u8'),
+                   ('head', '<u8'), ('symbols', '<u8'), ('_pad', '<u8', 3)]) # 64 bytes
+SYMBOL = np.dtype('S16')
+TICK = np.dtype([('seq', '<u8'), ('symbol', '<u8'), ('bid', '<f8'), ('ask', '<f8'), ('last', '<f8'),
+                 ('bid_size', '<f8'), ('ask_size', '<f8'), ('last_size', '<f8'), ('volume', '<f8'),
+                 ('quote_time', '<i8'), ('trade_time', '<i8')])
+FIELDS = TICK.names[2:] # What a tick carries besides seq and symbol id.
+
+# Streamer LEVELONE_EQUITIES field numbers, see streamer.LEVEL_ONE_FIELDS.
+STREAM_FIELDS = {'1': 'bid', '2': 'ask', '3': 'last', '4': 'bid_size', '5': 'ask_size', '8': 'volume',
+                 '9': 'last_size', '34': 'quote_time', '35': 'trade_time'}
+# /marketdata/v1/quotes 'quote' keys.
+REST_FIELDS = {'bidPrice': 'bid', 'askPrice': 'ask', 'lastPrice': 'last', 'bidSize': 'bid_size', 'askSize': 'ask_size',
+               'lastSize': 'last_size', 'totalVolume': 'volume', 'quoteTime': 'quote_time', 'tradeTime': 'trade_time'}
+
+def _layout(buffer, capacity, max_symbols):
+    # header | symbol names | latest tick per symbol | ring, every process maps the same offsets.
+    offset = HEADER.itemsize
+    names = np.ndarray((max_symbols,), SYMBOL, buffer, offset)
+    offset += names.nbytes
+    latest = np.ndarray((max_symbols,), TICK, buffer, offset)
+    offset += latest.nbytes
+    ring = np.ndarray((capacity,), TICK, buffer, offset)
+    return names, latest, ring
+
+def _size(capacity, max_symbols):
+    return HEADER.itemsize + max_symbols * (SYMBOL.itemsize + TICK.itemsize) + capacity * TICK.itemsize
+
+def _open(name, create=False, size=0):
+    # Nothing should be unlinked behind our back, the producer removes the bus itself in close(). Before 3.13
+    # every attach registers with a resource tracker that unlinks the segment when that process exits.
+    try:
+        return shared_memory.SharedMemory(name, create=create, size=size, track=False)
+    except TypeError:
+        from multiprocessing import resource_tracker
+        shm = shared_memory.SharedMemory(name, create=create, size=size)
+        resource_tracker.unregister(shm._name, 'shared_memory')
+        return shm
+
+def _unlink(shm):
+    if not hasattr(shm, '_track'): # Before 3.13 unlink() also unregisters, give it something to unregister.
+        from multiprocessing import resource_tracker
+        resource_tracker.register(shm._name, 'shared_memory')
+    shm.unlink()
+
+def _read_consistent(table, index, seq=None):
+    """Copy rows out, keeping only those the producer didn't touch mid copy.
+
+    Every row is a seqlock, the producer zeroes seq, writes the fields and then stamps the new seq. A row whose
+    seq is zero, changed while we copied it or (for the ring) isn't the sequence we expected was overwritten.
+    """
+    rows = table[index] # Fancy indexing copies.
+    ok = (rows['seq'] != 0) & (table['seq'][index] == rows['seq'])
+    if seq is not None:
+        ok &= rows['seq'] == seq
+    return rows[ok]
+
+class QuoteBus:
+    """Producer side, exactly one per bus. Creates the shared memory and publishes ticks into it.
+
+    Feed it from a Streamer with attach(streamer) or from REST polling with pump(trader, symbols). Schwab
+    streams only the fields that changed, so every tick is merged onto the symbol's latest values first.
+    """
+
+    def __init__(self, name=DEFAULT_NAME, capacity=65536, max_symbols=4096):
+        if capacity & (capacity - 1):
+            raise ValueError(f"capacity must be a power of two, got {capacity}.")
+        self.log = Log()
+        size = _size(capacity, max_symbols)
+        try:
+            self.shm = _open(name, create=True, size=size)
+        except FileExistsError:
+            # Left behind by a producer that died, one producer per name so it's ours to replace.
+            self.log.warning(f"Quote bus '{name}' already exists, replacing it. Readers of the old one must reattach.")
+            stale = _open(name)
+            stale.close()
+            _unlink(stale)
+            self.shm = _open(name, create=True, size=size)
+        self.name = name
+        self.capacity = capacity
+        self.max_symbols = max_symbols
+        self.header = np.ndarray((1,), HEADER, self.shm.buf)
+        self.names, self.latest, self.ring = _layout(self.shm.buf, capacity, max_symbols)
+        self.ids = {} # symbol -> id
+        self._values = [] # id -> latest field values, so merging a partial tick never reads shared memory
+        self._ring_seq = self.ring['seq']
+        self._latest_seq = self.latest['seq']
+        self._head = self.header['head']
+        self._mask = capacity - 1
+        self._lock = threading.Lock() # Producers in several threads (streamer + poller) still write one at a time.
+        self._pump = None
+        self._pump_stop = threading.Event()
+        self.header['capacity'] = capacity
+        self.header['max_symbols'] = max_symbols
+        self.header['magic'] = MAGIC # Last, a reader that sees the magic sees the rest of the header.
+        atexit.register(self.close)
+
+    def symbol_id(self, symbol):
+        sid = self.ids.get(symbol)
+        if sid is None:
+            sid = len(self.ids)
+            if sid >= self.max_symbols:
+                raise ValueError(f"Quote bus '{self.name}' is full, it holds {self.max_symbols} symbols.")
+            self.names[sid] = symbol.encode()[:SYMBOL.itemsize]
+            self.ids[symbol] = sid
+            self._values.append([0.0] * 7 + [0, 0])
+            self.header['symbols'] = sid + 1
+        return sid
+
+    def publish(self, symbol, **values):
+        """Write one tick, fields left out keep the symbol's latest value. Returns the tick's sequence number."""
+        with self._lock:
+            sid = self.symbol_id(symbol)
+            current = self._values[sid]
+            for index, field in enumerate(FIELDS):
+                value = values.get(field)
+                if value is not None:
+                    current[index] = value
+            tick = (0, sid, *current)
+            seq = int(self._head[0]) + 1
+            slot = seq & self._mask
+            self._ring_seq[slot] = 0
+            self.ring[slot] = tick
+            self._ring_seq[slot] = seq
+            self._latest_seq[sid] = 0
+            self.latest[sid] = tick
+            self._latest_seq[sid] = seq
+            self._head[0] = seq # Readers only look at slots up to head, publish it last.
+        return seq
+
+    def publish_level_one(self, message):
+        """Streamer LEVELONE_EQUITIES handler, takes one content dict ({'key': 'AAPL', '1': bid, ...})."""
+        symbol = message.get('key')
+        if symbol:
+            self.publish(symbol, **{STREAM_FIELDS[key]: value for key, value in message.items() if key in STREAM_FIELDS})
+
+    def publish_quotes(self, result):
+        """Publish a Trader.quotes() result, returns how many symbols were written."""
+        count = 0
+        for symbol, data in result.items():
+            if symbol == 'errors' or not isinstance(data, dict):
+                continue
+            quote = data.get('quote') or {}
+            self.publish(symbol, **{field: quote.get(key) for key, field in REST_FIELDS.items()})
+            count += 1
+        return count
+
+    def attach(self, streamer):
+        """Publish every LEVELONE_EQUITIES message from streamer. Subscribe with streamer.level_one_equities(keys)."""
+        return streamer.add_handler("LEVELONE_EQUITIES", self.publish_level_one, overflow="coalesce")
+
+    def pump(self, trader, symbols, interval=1.0):
+        """Poll trader.quotes(symbols) every interval seconds on a daemon thread. One batch call feeds every reader."""
+        if self._pump is not None and self._pump.is_alive():
+            return self._pump
+        symbols = list(symbols)
+        self._pump_stop.clear()
+
+        def loop():
+            missing = {}
+            while not self._pump_stop.is_set():
+                started = time.monotonic()
+                try:
+                    result = trader.quotes(symbols)
+                    self.publish_quotes(result)
+                    if result['errors'] != missing: # Only when it changes, not every poll.
+                        missing = result['errors']
+                        if missing:
+                            self.log.warning(f"Quote bus isn't getting {len(missing)} symbols: {missing}")
+                except Exception as e:
+                    self.log.error(f"Quote bus poll failed: {e}")
+                self._pump_stop.wait(max(0.0, interval - (time.monotonic() - started)))
+
+        self._pump = threading.Thread(target=loop, name="quote-bus-pump", daemon=True)
+        self._pump.start()
+        return self._pump
+
+    def close(self):
+        """Stop the pump, unmap and remove the shared memory. Readers keep their mapping until they close."""
+        self._pump_stop.set()
+        if self._pump is not None:
+            self._pump.join(5)
+            self._pump = None
+        if self.shm is None:
+            return
+        # numpy views pin the buffer, drop them before closing.
+        del self.header, self.names, self.latest, self.ring, self._ring_seq, self._latest_seq, self._head
+        self.shm.close()
+        try:
+            _unlink(self.shm)
+        except FileNotFoundError:
+            pass
+        self.shm = None
+        atexit.unregister(self.close)
+
+class QuoteReader:
+    """Reader side, any number per bus. Maps the producer's shared memory as numpy arrays, never takes a lock.
+
+    poll() returns the ticks published since the last poll as a TICK structured array. A reader that falls
+    more than capacity ticks behind skips ahead and counts what it missed in dropped.
+    """
+
+    def __init__(self, name=DEFAULT_NAME, from_start=False):
+        self.shm = _open(name)
+        self.name = name
+        self.header = np.ndarray((1,), HEADER, self.shm.buf)
+        if self.header['magic'][0] != MAGIC:
+            self.close()
+            raise ValueError(f"'{name}' isn't a quote bus, or was made by an incompatible version.")
+        self.capacity = int(self.header['capacity'][0])
+        self.max_symbols = int(self.header['max_symbols'][0])
+        self.names, self.latest, self.ring = _layout(self.shm.buf, self.capacity, self.max_symbols)
+        self.cursor = 0 if from_start else int(self.header['head'][0])
+        self.dropped = 0
+        self._ids = {}
+
+    @property
+    def head(self):
+        return int(self.header['head'][0])
+
+    def symbol(self, sid):
+        return self.names[sid].decode()
+
+    def symbol_id(self, symbol):
+        sid = self._ids.get(symbol)
+        if sid is None:
+            known = int(self.header['symbols'][0])
+            self._ids = {name.decode(): i for i, name in enumerate(self.names[:known])}
+            sid = self._ids.get(symbol)
+        return sid
+
+    def poll(self, limit=None):
+        """Ticks after the cursor, oldest first, at most limit of them."""
+        head = self.head
+        start = self.cursor + 1
+        if head - self.cursor > self.capacity: # Lapped, the oldest slots are already gone.
+            self.dropped += head - self.cursor - self.capacity
+            start = head - self.capacity + 1
+        end = head if limit is None else min(head, start + limit - 1)
+        if end < start:
+            return self.ring[:0].copy()
+        seq = np.arange(start, end + 1, dtype=np.uint64)
+        ticks = _read_consistent(self.ring, seq & np.uint64(self.capacity - 1), seq)
+        self.dropped += len(seq) - len(ticks) # Overwritten while we copied.
+        self.cursor = end
+        return ticks
+
+    def latest_tick(self, symbol):
+        """Newest tick for symbol as a numpy record, None if it hasn't been published."""
+        sid = self.symbol_id(symbol)
+        if sid is None:
+            return None
+        for _ in range(100): # The producer only holds a row for a few hundred ns, retry until it's stable.
+            rows = _read_consistent(self.latest, [sid])
+            if len(rows):
+                return rows[0]
+        return None
+
+    def snapshot(self):
+        """Latest tick of every symbol published so far, rows mid update are left out."""
+        known = int(self.header['symbols'][0])
+        return _read_consistent(self.latest, np.arange(known))
+
+    def close(self):
+        if self.shm is None:
+            return
+        del self.header, self.names, self.latest, self.ring
+        self.shm.close()
+        self.shm = None
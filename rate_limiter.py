@@ -0,0 +1,145 @@
+# rate_limiter.py
+# Client side token bucket so bursts queue up here instead of coming back from schwab as 429s.
+# Author: Calvin Seamons
+# Last Updated: 18 October, 2026
+
+# Imports
+# ------------------ #
+import heapq
+import itertools
+import os
+import struct
+import threading
+import time
+
+# Priority lanes, lower goes first. Orders and cancels never wait behind quote or history polling.
+PRIORITY_ORDER = 0
+PRIORITY_ACCOUNT = 1
+PRIORITY_MARKET_DATA = 2
+
+def classify(method, path):
+    """Pick a lane from the request itself so callers don't have to."""
+    if '/oauth/' in path or ('/orders' in path and method != 'GET'):
+        return PRIORITY_ORDER
+    if path.lstrip('/').startswith('trader/'):
+        return PRIORITY_ACCOUNT
+    return PRIORITY_MARKET_DATA
+
+class _MemoryBucket:
+    """Bucket state for one process, guarded by the limiter's condition."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.stamp = time.monotonic()
+
+    def take(self):
+        """Take a token if one is there, otherwise return how long until one will be."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def peek(self):
+        return min(self.capacity, self.tokens + (time.monotonic() - self.stamp) * self.rate)
+
+class _FileBucket:
+    """Bucket state in a 16 byte file under flock, every process on the host draws from the same budget."""
+
+    FORMAT = "<dd" # tokens, wall clock of last refill
+
+    def __init__(self, rate, capacity, path):
+        import fcntl # Unix only, only needed when a shared bucket is asked for.
+        self._fcntl = fcntl
+        self.rate = rate
+        self.capacity = capacity
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+
+    def _update(self, consume):
+        self._fcntl.flock(self._fd, self._fcntl.LOCK_EX)
+        try:
+            raw = os.pread(self._fd, struct.calcsize(self.FORMAT), 0)
+            now = time.time()
+            tokens, stamp = struct.unpack(self.FORMAT, raw) if len(raw) == struct.calcsize(self.FORMAT) else (self.capacity, now)
+            tokens = min(self.capacity, tokens + max(0.0, now - stamp) * self.rate)
+            wait = 0.0
+            if consume:
+                if tokens >= 1:
+                    tokens -= 1
+                else:
+                    wait = (1 - tokens) / self.rate
+                os.pwrite(self._fd, struct.pack(self.FORMAT, tokens, now), 0)
+            return wait, tokens
+        finally:
+            self._fcntl.flock(self._fd, self._fcntl.LOCK_UN)
+
+    def take(self):
+        return self._update(True)[0]
+
+    def peek(self):
+        return self._update(False)[1]
+
+class RateLimiter:
+    """Token bucket with priority lanes, safe to share between threads (and processes when path is set).
+
+    rate is requests per second, capacity the burst allowed after an idle stretch. Waiters are served
+    strictly by lane then arrival, so an order placed behind fifty queued quote polls goes out next.
+    """
+
+    def __init__(self, rate=2.0, capacity=10, path=None):
+        self.rate = rate
+        self.capacity = capacity
+        self.bucket = _FileBucket(rate, capacity, path) if path else _MemoryBucket(rate, capacity)
+        self._cond = threading.Condition()
+        self._waiters = [] # heap of (priority, arrival)
+        self._arrival = itertools.count()
+        self.total_wait = 0.0
+
+    def acquire(self, priority=PRIORITY_MARKET_DATA, timeout=None) -> float:
+        """Block until this caller may send, returns the seconds spent waiting."""
+        start = time.monotonic()
+        entry = (priority, next(self._arrival))
+        with self._cond:
+            heapq.heappush(self._waiters, entry)
+            try:
+                while True:
+                    wait = None
+                    if self._waiters[0] == entry:
+                        wait = self.bucket.take()
+                        if wait == 0.0:
+                            waited = time.monotonic() - start
+                            self.total_wait += waited
+                            return waited
+                    if timeout is not None:
+                        remaining = timeout - (time.monotonic() - start)
+                        if remaining <= 0:
+                            raise TimeoutError(f"Rate limiter gave up after {timeout}s, {len(self._waiters)} requests queued.")
+                        wait = remaining if wait is None else min(wait, remaining)
+                    self._cond.wait(wait)
+            finally:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                self._cond.notify_all()
+
+    @property
+    def budget(self) -> float:
+        """Tokens available right now, below 1 means the next call will wait."""
+        return self.bucket.peek()
+
+    @property
+    def queue_depth(self) -> int:
+        with self._cond:
+            return len(self._waiters)
+
+    def lane_depths(self) -> dict:
+        with self._cond:
+            depths = {}
+            for priority, _ in self._waiters:
+                depths[priority] = depths.get(priority, 0) + 1
+            return depths
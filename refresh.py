@@ -20,7 +20,7 @@ def refresh_tokens():
     }
 
     refresh_token_response = requests.post(
-        url="https://api.schwabapi.com/v1/oauth/token",
+        url=os.getenv("SCHWAB_BASE_URL", "https://api.schwabapi.com").rstrip('/') + "/v1/oauth/token",
         headers=headers,
         data=payload,
     )
@@ -0,0 +1,161 @@
+# resilience.py
+# Retry with backoff, per-call deadlines and per-endpoint circuit breakers for schwab api calls.
+# Author: Calvin Seamons
+# Last Updated: 18 October, 2026
+
+# Imports
+# ------------------ #
+import email.utils
+import random
+import re
+import threading
+import time
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+class CircuitOpenError(ConnectionError):
+    pass
+
+class Deadline:
+    """Overall time budget for one call, shared by every attempt and backoff sleep."""
+
+    __slots__ = ("expires",)
+
+    def __init__(self, seconds):
+        self.expires = None if seconds is None else time.monotonic() + seconds
+
+    def remaining(self):
+        return None if self.expires is None else self.expires - time.monotonic()
+
+    def clamp(self, timeout):
+        """Per attempt timeout that never runs past the deadline."""
+        remaining = self.remaining()
+        if remaining is None:
+            return timeout
+        if remaining <= 0:
+            raise DeadlineExceeded("Call deadline exceeded.")
+        return remaining if timeout is None else min(timeout, remaining)
+
+class RetryPolicy:
+    """Exponential backoff with full jitter, Retry-After wins when schwab sends one.
+
+    Only idempotent methods are retried on 5xx and connection errors. A POST (placing an order) is only
+    retried on 429, where schwab rejected it before doing anything, so an order is never sent twice.
+    """
+
+    def __init__(self, max_retries=3, base_delay=0.25, max_delay=8.0,
+                 retry_statuses=(429, 500, 502, 503, 504), idempotent_methods=("GET", "PUT", "DELETE", "HEAD")):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = frozenset(retry_statuses)
+        self.idempotent_methods = frozenset(idempotent_methods)
+
+    def should_retry_status(self, method, status):
+        if status not in self.retry_statuses:
+            return False
+        return status == 429 or method in self.idempotent_methods
+
+    def should_retry_error(self, method):
+        return method in self.idempotent_methods
+
+    def backoff(self, attempt):
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def retry_after(self, response):
+        """Seconds from a Retry-After header (delta seconds or http date), None if missing."""
+        value = response.headers.get("Retry-After") if response is not None else None
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+            except (TypeError, ValueError):
+                return None
+
+class CircuitBreaker:
+    """closed -> open after failure_threshold straight failures -> half open after reset_timeout,
+    where a single trial call decides between closing again and another open period."""
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def before(self, endpoint):
+        """Raise CircuitOpenError if the call may not go out, True when this call is the half open trial."""
+        with self._lock:
+            state = self.state
+            if state == "open" or (state == "half_open" and self.trial_running):
+                raise CircuitOpenError(f"{endpoint} is failing, circuit open for up to {self.reset_timeout}s.")
+            if state == "half_open":
+                self.trial_running = True
+                return True
+            return False
+
+    def release(self):
+        # The trial ended without an answer from the endpoint (limiter timeout, deadline, a bug in our own code),
+        # stay half open so the next call gets to be the trial instead of the breaker wedging shut.
+        with self._lock:
+            self.trial_running = False
+
+    def success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_running = False
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.trial_running or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self.trial_running = False
+
+_DYNAMIC_SEGMENT = re.compile(r"[0-9$%.]")
+
+def _is_dynamic(segment):
+    # Order ids have digits, symbols and account hashes are upper case, endpoint names are lower/camel case.
+    if segment == "v1":
+        return False
+    return bool(_DYNAMIC_SEGMENT.search(segment)) or segment == segment.upper()
+
+def endpoint_key(method, path):
+    """'GET /marketdata/v1/AAPL/quotes' -> 'GET marketdata/v1/*/quotes', one breaker per endpoint not per symbol."""
+    path = path.split('?', 1)[0]
+    if '://' in path:
+        path = path.split('://', 1)[1].split('/', 1)[-1]
+    segments = ["*" if _is_dynamic(seg) else seg for seg in path.strip('/').split('/')]
+    return f"{method} {'/'.join(segments)}"
+
+class CircuitBreakers:
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def get(self, endpoint) -> CircuitBreaker:
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(endpoint, CircuitBreaker(self.failure_threshold, self.reset_timeout))
+        return breaker
+
+    def states(self) -> dict:
+        return {endpoint: breaker.state for endpoint, breaker in list(self._breakers.items())}
@@ -0,0 +1,142 @@
+# response_cache.py
+# TTL + LRU cache for slow changing endpoints, account numbers, user preferences and market hours.
+# Author: Calvin Seamons
+# Last Updated: 18 October, 2026
+
+# Imports
+# ------------------ #
+import fnmatch
+import json
+import os
+import tempfile
+import threading
+import time
+import urllib.parse
+
+# From Imports
+# ------------------ #
+from collections import OrderedDict
+
+# Local File Imports
+# ------------------ #
+from vault import vault, SALT_SIZE
+
+# Seconds each endpoint may be served from cache, anything not listed here is never cached.
+DEFAULT_TTLS = {
+    'trader/v1/accounts/accountNumbers': 24 * 3600,
+    'trader/v1/userPreference': 3600,
+    'marketdata/v1/markets': 600,
+    'marketdata/v1/markets/*': 600,
+}
+
+ACCOUNT_NUMBERS = 'trader/v1/accounts/accountNumbers'
+
+class ResponseCache:
+    """Decoded JSON responses keyed by endpoint and params, expired per endpoint TTL, evicted least recently used.
+
+    With a path the cache survives restarts, encrypted with the same password as the rest of the install
+    path since the accountNumbers response holds real account numbers.
+    """
+
+    def __init__(self, ttls=None, max_entries=256, path=None):
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.max_entries = max_entries
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict() # key -> (expires, path, data)
+        self._lock = threading.Lock()
+        self._salt = None
+        self._loaded = not path # Decrypting the file waits for the first lookup, not construction.
+
+    def ttl(self, path):
+        """TTL for path or None when the endpoint isn't cacheable, TTL keys may be fnmatch patterns."""
+        path = path.split('?', 1)[0].strip('/')
+        ttl = self.ttls.get(path)
+        if ttl is None:
+            for pattern, pattern_ttl in self.ttls.items():
+                if fnmatch.fnmatchcase(path, pattern):
+                    return pattern_ttl
+        return ttl
+
+    def key(self, path, params=None):
+        path = path.strip('/')
+        if not params:
+            return path
+        return f"{path}?{urllib.parse.urlencode(sorted((k, str(v)) for k, v in params.items() if v is not None))}"
+
+    def get(self, path, params=None):
+        """Cached data or None, a miss and an expired entry look the same to the caller."""
+        key = self.key(path, params)
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.time():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, path, params, data):
+        ttl = self.ttl(path)
+        if ttl is None:
+            return
+        with self._lock:
+            self._ensure_loaded()
+            key = self.key(path, params)
+            self._entries[key] = (time.time() + ttl, path.strip('/'), data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            if self.path:
+                self._save()
+
+    def invalidate(self, prefix=None, keep=()):
+        """Drop every entry whose path starts with prefix (everything when None), paths in keep survive."""
+        with self._lock:
+            self._ensure_loaded()
+            removed = 0
+            for key, (_, path, _) in list(self._entries.items()):
+                if (prefix is None or path.startswith(prefix.strip('/'))) and path not in keep:
+                    del self._entries[key]
+                    removed += 1
+            if removed and self.path:
+                self._save()
+
+    def invalidate_account_state(self):
+        """After an order: balances, positions and orders may have moved, the account list hasn't."""
+        self.invalidate('trader/v1/accounts', keep=(ACCOUNT_NUMBERS,))
+        self.invalidate('trader/v1/orders')
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self._loaded = True
+            self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'rb') as cache_file:
+                blob = cache_file.read()
+            self._salt = blob[:SALT_SIZE]
+            entries = json.loads(vault.fernet(self._salt).decrypt(blob[SALT_SIZE:]))
+        except Exception:
+            return # Missing, corrupt or from another password, it's only a cache.
+        now = time.time()
+        for key, expires, path, data in entries:
+            if expires > now:
+                self._entries[key] = (expires, path, data)
+
+    def _save(self):
+        if self._salt is None:
+            self._salt = os.urandom(SALT_SIZE)
+        entries = [[key, expires, path, data] for key, (expires, path, data) in self._entries.items()]
+        blob = self._salt + vault.fernet(self._salt).encrypt(json.dumps(entries, separators=(',', ':')).encode())
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".response-cache.", dir=directory)
+        with os.fdopen(fd, 'wb') as tmp:
+            tmp.write(blob)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,220 @@
+# schemas.py
+# Typed response schemas, decoded straight from the response bytes with msgspec in one validating pass.
+# Author: Calvin Seamons
+# Last Updated: 18 October, 2026
+
+# Imports
+# ------------------ #
+import msgspec
+import numpy as np
+
+# From Imports
+# ------------------ #
+from typing import Optional
+
+# Structs only declare the fields we use, msgspec skips everything else in the payload without
+# building it. rename="camel" maps snake_case attributes onto schwab's camelCase keys.
+
+class Instrument(msgspec.Struct, rename="camel", gc=False):
+    symbol: str = ""
+    asset_type: str = ""
+    cusip: Optional[str] = None
+    description: Optional[str] = None
+
+class QuoteData(msgspec.Struct, rename="camel", gc=False):
+    bid_price: float = 0.0
+    ask_price: float = 0.0
+    last_price: float = 0.0
+    bid_size: float = 0.0
+    ask_size: float = 0.0
+    last_size: float = 0.0
+    open_price: float = 0.0
+    high_price: float = 0.0
+    low_price: float = 0.0
+    close_price: float = 0.0
+    total_volume: float = 0.0
+    net_change: float = 0.0
+    mark: float = 0.0
+    quote_time: int = 0
+    trade_time: int = 0
+
+class Quote(msgspec.Struct, rename="camel", gc=False):
+    symbol: str = ""
+    asset_main_type: str = ""
+    realtime: bool = False
+    quote: QuoteData = msgspec.field(default_factory=QuoteData)
+
+class QuoteErrors(msgspec.Struct, rename="camel", gc=False):
+    # The 'errors' entry of a quotes response, symbols schwab couldn't quote.
+    invalid_symbols: list[str] = []
+    invalid_cusips: list[str] = []
+    invalid_ssids: list[str] = msgspec.field(default_factory=list, name="invalidSSIDs")
+
+class _ErrorsOnly(msgspec.Struct, gc=False):
+    # Picks just the 'errors' entry out of a quotes payload, the quotes themselves are skipped unparsed.
+    errors: QuoteErrors = msgspec.field(default_factory=QuoteErrors)
+
+class Candle(msgspec.Struct, gc=False):
+    datetime: int
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float = 0.0
+
+class PriceHistory(msgspec.Struct, rename="camel", gc=False):
+    symbol: str = ""
+    empty: bool = False
+    previous_close: Optional[float] = None
+    candles: list[Candle] = []
+
+class AccountNumber(msgspec.Struct, rename="camel", gc=False):
+    account_number: str
+    hash_value: str
+
+class Position(msgspec.Struct, rename="camel", gc=False):
+    instrument: Instrument
+    long_quantity: float = 0.0
+    short_quantity: float = 0.0
+    average_price: float = 0.0
+    market_value: float = 0.0
+    current_day_profit_loss: float = 0.0
+
+class Balances(msgspec.Struct, rename="camel", gc=False):
+    cash_balance: float = 0.0
+    buying_power: float = 0.0
+    equity: float = 0.0
+    liquidation_value: float = 0.0
+    long_market_value: float = 0.0
+    short_market_value: float = 0.0
+
+class SecuritiesAccount(msgspec.Struct, rename="camel", gc=False):
+    account_number: str = ""
+    type: str = ""
+    positions: list[Position] = []
+    current_balances: Optional[Balances] = None
+
+class Account(msgspec.Struct, rename="camel", gc=False):
+    securities_account: SecuritiesAccount
+
+class OrderLeg(msgspec.Struct, rename="camel", gc=False):
+    instrument: Instrument
+    instruction: str = ""
+    quantity: float = 0.0
+    position_effect: Optional[str] = None
+
+class OrderStatus(msgspec.Struct, rename="camel", gc=False):
+    order_id: int = 0
+    account_number: Optional[int] = None
+    status: str = ""
+    order_type: str = ""
+    session: str = ""
+    duration: str = ""
+    quantity: float = 0.0
+    filled_quantity: float = 0.0
+    remaining_quantity: float = 0.0
+    price: Optional[float] = None
+    stop_price: Optional[float] = None
+    entered_time: Optional[str] = None
+    close_time: Optional[str] = None
+    order_strategy_type: str = ""
+    order_leg_collection: list[OrderLeg] = []
+
+class TransferItem(msgspec.Struct, rename="camel", gc=False):
+    instrument: Optional[Instrument] = None
+    amount: float = 0.0
+    cost: float = 0.0
+    price: Optional[float] = None
+
+class Transaction(msgspec.Struct, rename="camel", gc=False):
+    activity_id: int = 0
+    time: str = ""
+    type: str = ""
+    status: str = ""
+    net_amount: float = 0.0
+    account_number: Optional[str] = None
+    transfer_items: list[TransferItem] = []
+
+class OptionContract(msgspec.Struct, rename="camel", gc=False):
+    symbol: str = ""
+    put_call: str = ""
+    strike_price: float = 0.0
+    expiration_date: str = ""
+    days_to_expiration: int = 0
+    bid: float = 0.0
+    ask: float = 0.0
+    last: float = 0.0
+    mark: float = 0.0
+    bid_size: float = 0.0
+    ask_size: float = 0.0
+    total_volume: float = 0.0
+    open_interest: float = 0.0
+    volatility: float = 0.0
+    delta: float = 0.0
+    gamma: float = 0.0
+    theta: float = 0.0
+    vega: float = 0.0
+    in_the_money: bool = False
+
+class OptionChain(msgspec.Struct, rename="camel", gc=False):
+    symbol: str = ""
+    status: str = ""
+    underlying_price: float = 0.0
+    # expiration "2026-11-20:33" -> strike "150.0" -> contracts
+    call_exp_date_map: dict[str, dict[str, list[OptionContract]]] = {}
+    put_exp_date_map: dict[str, dict[str, list[OptionContract]]] = {}
+
+# Decoders are built once, reusing them is what keeps decoding cheap.
+_quotes = msgspec.json.Decoder(dict[str, Quote])
+_quote_errors = msgspec.json.Decoder(_ErrorsOnly)
+_price_history = msgspec.json.Decoder(PriceHistory)
+_account_numbers = msgspec.json.Decoder(list[AccountNumber])
+_accounts = msgspec.json.Decoder(list[Account])
+_orders = msgspec.json.Decoder(list[OrderStatus])
+_transactions = msgspec.json.Decoder(list[Transaction])
+_option_chain = msgspec.json.Decoder(OptionChain)
+
+def decode_quotes(raw: bytes) -> dict:
+    """/marketdata/v1/quotes or /{symbol}/quotes bytes -> {symbol: Quote}, schwab's 'errors' entry is kept as a dict."""
+    quotes = _quotes.decode(raw)
+    if quotes.pop('errors', None) is not None: # Decoded as an empty Quote, only when schwab rejected something.
+        errors = _quote_errors.decode(raw).errors
+        quotes['errors'] = {key: value for key, value in (('invalidSymbols', errors.invalid_symbols),
+                                                          ('invalidCusips', errors.invalid_cusips),
+                                                          ('invalidSSIDs', errors.invalid_ssids)) if value}
+    return quotes
+
+def decode_price_history(raw: bytes) -> PriceHistory:
+    return _price_history.decode(raw)
+
+def decode_candles(raw: bytes) -> dict:
+    """pricehistory bytes -> {column: numpy array}, same columns as price_history.decode_candles."""
+    candles = _price_history.decode(raw).candles
+    count = len(candles)
+    columns = {
+        'datetime': np.fromiter((c.datetime for c in candles), dtype='<i8', count=count),
+        'open': np.fromiter((c.open for c in candles), dtype='<f8', count=count),
+        'high': np.fromiter((c.high for c in candles), dtype='<f8', count=count),
+        'low': np.fromiter((c.low for c in candles), dtype='<f8', count=count),
+        'close': np.fromiter((c.close for c in candles), dtype='<f8', count=count),
+        'volume': np.fromiter((c.volume for c in candles), dtype='<f8', count=count),
+    }
+    if count and np.any(np.diff(columns['datetime']) < 0):
+        order = np.argsort(columns['datetime'], kind='stable')
+        columns = {name: column[order] for name, column in columns.items()}
+    return columns
+
+def decode_account_numbers(raw: bytes) -> list:
+    return _account_numbers.decode(raw)
+
+def decode_accounts(raw: bytes) -> list:
+    return _accounts.decode(raw)
+
+def decode_orders(raw: bytes) -> list:
+    return _orders.decode(raw)
+
+def decode_transactions(raw: bytes) -> list:
+    return _transactions.decode(raw)
+
+def decode_option_chain(raw: bytes) -> OptionChain:
+    return _option_chain.decode(raw)
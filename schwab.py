@@ -4,16 +4,13 @@
 # Last Updated: 15 October, 2024
 
 # Library Imports
+# asyncio and webbrowser are imported where they're used, cron jobs that never stream or log in skip them.
 import argparse
-import asyncio
 import base64
 import json
 import os
-import pandas
 import requests
-import threading
 import time
-import webbrowser
 import yaml 
 
 # Library From Imports 
@@ -24,12 +21,10 @@ from pathlib import Path
 
 # Local File Imports
 from encryption import set_encryption, retrieve_encrypted_data, encrypt_file_with_password, decrypt_file_with_password
+from orders import Order
 from refresh import refresh_tokens
-from trader import run_trade
 #from refresh.py as refresh
 
-from dotenv import load_dotenv
-
 
 # Global Variables :(
 VERSION = '0.0.1' # Script is very much unreleased and in development. 
@@ -40,17 +35,22 @@ class AccountsTrading:
         # Initialize access token during class instantiation
         self.access_token = None
         self.account_hash_value = None
+        self.account_hash_values = {} # account number -> hash, every linked account
         self.refresh_access_token()
-        self.base_url = "https://api.schwabapi.com/trader/v1"
+        self.base_url = os.getenv("SCHWAB_BASE_URL", "https://api.schwabapi.com").rstrip('/') + "/trader/v1"
         self.headers = {"Authorization": f"Bearer {self.access_token}"}
         self.get_account_number_hash_value()
 
     def get_account_number_hash_value(self):
+        from schemas import decode_account_numbers # msgspec and numpy only load when this runs.
         response = requests.get(
             self.base_url + f"/accounts/accountNumbers", headers=self.headers
         )
-        response_frame = pandas.json_normalize(response.json())
-        self.account_hash_value = response_frame["hashValue"].iloc[0]
+        response.raise_for_status()
+        accounts = decode_account_numbers(response.content)
+        self.account_hash_values = {account.account_number: account.hash_value for account in accounts}
+        # Still the default for single account callers, everything linked is in account_hash_values.
+        self.account_hash_value = accounts[0].hash_value if accounts else None
 
 
 def construct_init_auth_url(install_path) -> tuple[str, str, str]:
@@ -139,52 +139,32 @@ def design_order(
     order_strategy_type="SINGLE",
 ):
 
-    post_order_payload = {
-        "price": price,
-        "session": session,
-        "duration": duration,
-        "orderType": order_type,
-        "complexOrderStrategyType": complex_order_strategy_type,
-        "quantity": quantity,
-        "taxLotMethod": tax_lot_method,
-        "orderLegCollection": [
-            {
-                "orderLegType": order_leg_type,
-                "legId": leg_id,
-                "instrument": {
-                    "symbol": symbol,
-                    "assetType": asset_type,
-                },
-                "instruction": instruction,
-                "positionEffect": position_effect,
-                "quantity": quantity,
-            }
-        ],
-        "orderStrategyType": order_strategy_type,
-    }
-
-    return post_order_payload
+    # Validated and serialized once by the Order model, same payload shape as before.
+    return Order(symbol, instruction, quantity, order_type, asset_type, price=price, session=session,
+                 duration=duration, tax_lot_method=tax_lot_method, position_effect=position_effect,
+                 order_strategy_type=order_strategy_type, complex_order_strategy_type=complex_order_strategy_type,
+                 leg_id=leg_id, order_leg_type=order_leg_type).payload
 
-def stream_data():
-    client = client_from_token_file(
-        token_path='/path/to/token.json',
-        api_key='YOUR_API_KEY',
-        app_secret='YOUR_APP_SECRET')
-    stream_client = StreamClient(client, account_id=1234567890)
+def stream_data(tokens):
+    import asyncio
+    from order_book import OrderBooks
+    from streamer import Streamer
 
     async def read_stream():
-        await stream_client.login()
+        stream_client = Streamer(tokens, overflow="coalesce") # A late book snapshot is replaced, not queued.
+
+        def print_events(events):
+            book = books[events[0].symbol]
+            print(events[0].symbol, "bid", book.best_bid(), "ask", book.best_ask(), "changes", len(events))
 
-        def print_message(message):
-            print(json.dumps(message, indent=4))
+        books = OrderBooks(on_events=print_events)
 
         # Always add handlers before subscribing because many streams start sending
-        # data immediately after success, and messages with no handlers are dropped.
-        stream_client.add_nasdaq_book_handler(print_message)
-        await stream_client.nasdaq_book_subs(['GOOG'])
+        # data immediately after success, the handler drains its own bounded queue.
+        stream_client.add_handler("NASDAQ_BOOK", books)
+        await stream_client.nasdaq_book(['GOOG'])
 
-        while True:
-            await stream_client.handle_message()
+        await stream_client.run() # Logs in, then reconnects and resubscribes on its own until closed.
 
     asyncio.run(read_stream())
 
@@ -366,6 +346,7 @@ def main(args):
 
     if args.startup == True: # If startup we kicked schwab authentication. 
         app_key, app_secret, cs_auth_url = construct_init_auth_url(install_path)
+        import webbrowser
         webbrowser.open(cs_auth_url)
 
         logger.info("Paste Returned URL:")
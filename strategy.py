@@ -0,0 +1,154 @@
+# strategy.py
+# Strategy interface shared by live trading and the backtester, plus the live runner that feeds it bars.
+# Author: Calvin Seamons
+# Last Updated: 18 October, 2026
+
+# Imports
+# ------------------ #
+import json
+import threading
+import time
+
+# From Imports
+# ------------------ #
+from collections import namedtuple
+
+# Local File Imports
+# ------------------ #
+from log_obj import Log
+
+Bar = namedtuple("Bar", ("datetime", "open", "high", "low", "close", "volume"))
+
+class Strategy:
+    """Subclass and override the hooks. The same class runs live through LiveRunner and offline through
+    backtest.Backtest, the context it's handed is the only thing that changes.
+
+    ctx.submit(order) -> order id   orders.Order or a design_order payload dict
+    ctx.cancel(order_id)
+    ctx.position(symbol) -> signed share count
+    ctx.cash                        cash available
+    ctx.history(symbol, bars) -> {column: numpy array} up to and including the current bar
+    ctx.now                         epoch ms of the bar being handled
+    """
+
+    symbols = ()
+    frequency_type = 'daily'
+    frequency = 1
+
+    def on_start(self, ctx):
+        pass
+
+    def on_bar(self, ctx, symbol, bar):
+        pass
+
+    def on_stop(self, ctx):
+        pass
+
+class LiveContext:
+    """ctx for live trading, orders go to schwab through the Trader."""
+
+    def __init__(self, trader, account_hash=None, history_bars=500):
+        self.trader = trader
+        self.account_hash = account_hash
+        self.history_bars = history_bars
+        self.now = None
+        self._columns = {} # symbol -> last columns read from the store
+        self._positions = None
+
+    def submit(self, order):
+        from orders import Order
+        if not isinstance(order, Order):
+            order = _PayloadOrder(order)
+        self._positions = None # Fills move positions, read them fresh next time.
+        return self.trader.place_order(order, self.account_hash)
+
+    def cancel(self, order_id):
+        return self.trader.cancel_order(order_id, self.account_hash)
+
+    def position(self, symbol):
+        if self._positions is None:
+            from positions import PositionsTable
+            self._positions = PositionsTable.from_accounts(self.trader.accounts(fields='positions'))
+        total = 0.0
+        for (_, held), quantity in zip(self._positions.keys, self._positions.quantity):
+            if held == symbol:
+                total += float(quantity)
+        return total
+
+    @property
+    def cash(self):
+        accounts = self.trader.accounts()
+        return sum(account['securitiesAccount'].get('currentBalances', {}).get('cashBalance', 0.0)
+                   for account in accounts)
+
+    def history(self, symbol, bars=None):
+        columns = self._columns.get(symbol)
+        if columns is None:
+            return {}
+        bars = bars or self.history_bars
+        return {name: column[-bars:] for name, column in columns.items()}
+
+class _PayloadOrder:
+    # A design_order style dict posted as is, Trader.place_order only needs .body.
+    __slots__ = ("payload", "body")
+
+    def __init__(self, payload):
+        self.payload = payload
+        self.body = json.dumps(payload, separators=(',', ':')).encode()
+
+class LiveRunner:
+    """Polls the Trader's PriceHistoryStore and hands each new completed bar to the strategy.
+
+    The store only fetches what it hasn't seen, so every poll is one small pricehistory call per symbol.
+    """
+
+    def __init__(self, trader, strategy, interval=60, account_hash=None, lookback_days=365):
+        self.trader = trader
+        self.strategy = strategy
+        self.interval = interval
+        self.lookback_days = lookback_days
+        self.store = trader.history_store()
+        self.ctx = LiveContext(trader, account_hash)
+        self.log = Log()
+        self._last = {} # symbol -> datetime of the last bar handed to the strategy
+        self._stop = threading.Event()
+
+    def poll(self):
+        """Fetch new bars and dispatch them, returns how many bars the strategy saw."""
+        now_ms = int(time.time() * 1000)
+        start_ms = now_ms - self.lookback_days * 86400 * 1000
+        seen = 0
+        for symbol in self.strategy.symbols:
+            columns = self.store.get(symbol, self.strategy.frequency_type, self.strategy.frequency, start_ms, now_ms)
+            stamps = columns['datetime']
+            if not len(stamps):
+                continue
+            last = self._last.get(symbol)
+            if last is None: # First poll only sets the high water mark, history isn't replayed live.
+                self._last[symbol] = int(stamps[-2]) if len(stamps) > 1 else int(stamps[0]) - 1
+                self.ctx._columns[symbol] = columns
+                continue
+            # The newest bar may still be forming, only bars before it are complete.
+            first = int(stamps.searchsorted(last, side='right'))
+            for row in range(first, len(stamps) - 1):
+                self.ctx._columns[symbol] = {name: column[:row + 1] for name, column in columns.items()}
+                self.ctx.now = int(stamps[row])
+                self.strategy.on_bar(self.ctx, symbol, Bar(*(columns[name][row] for name in Bar._fields)))
+                self._last[symbol] = int(stamps[row])
+                seen += 1
+        return seen
+
+    def run(self):
+        self.strategy.on_start(self.ctx)
+        try:
+            while not self._stop.is_set():
+                try:
+                    self.poll()
+                except Exception as e:
+                    self.log.error(f"{type(self.strategy).__name__} poll failed: {e}")
+                self._stop.wait(self.interval)
+        finally:
+            self.strategy.on_stop(self.ctx)
+
+    def stop(self):
+        self._stop.set()
@@ -0,0 +1,269 @@
+# strategy_host.py
+# Runs several strategies at once, one worker process each, with the parent owning Tokens and brokering the access token.
+# Author: Calvin Seamons
+# Last Updated: 18 October, 2026
+
+# Imports
+# ------------------ #
+import argparse
+import importlib
+import importlib.util
+import inspect
+import multiprocessing
+import os
+import threading
+import time
+
+# From Imports
+# ------------------ #
+from multiprocessing.connection import wait
+
+# Local File Imports
+# ------------------ #
+from log_obj import Log
+
+TOKEN_BYTES = 8192 # Room for the access token in shared memory, schwab's are a few hundred bytes.
+
+def load_strategies(spec):
+    """'module:Class', 'path/to/file.py:Class', or either without ':Class' for every Strategy subclass in it."""
+    from strategy import Strategy
+    target, _, class_name = spec.partition(':')
+    if target.endswith('.py'):
+        name = os.path.splitext(os.path.basename(target))[0]
+        module_spec = importlib.util.spec_from_file_location(name, target)
+        module = importlib.util.module_from_spec(module_spec)
+        module_spec.loader.exec_module(module)
+    else:
+        module = importlib.import_module(target)
+    if class_name:
+        return [getattr(module, class_name)]
+    found = [value for value in vars(module).values()
+             if inspect.isclass(value) and issubclass(value, Strategy) and value is not Strategy
+             and value.__module__ == module.__name__]
+    if not found:
+        raise ValueError(f"No Strategy subclasses in {target}.")
+    return found
+
+class TokenBroker:
+    """Parent side. The current access token lives in shared memory with a version counter, workers
+    pick up a refresh by comparing one integer. A worker that still gets a 401 asks over its pipe and
+    the parent runs the usual single flight refresh.
+    """
+
+    def __init__(self, tokens, context):
+        self.tokens = tokens
+        self.token = context.Array('c', TOKEN_BYTES)
+        self.version = context.Value('Q', 0, lock=False) # Written only under token's lock.
+        self.connections = [] # parent ends of each worker's pipe
+        self.log = Log()
+        self._stop = threading.Event()
+        self._thread = None
+        self.publish(tokens.access_token)
+        tokens.on_refresh.append(self.publish)
+
+    def publish(self, access_token):
+        encoded = (access_token or "").encode()
+        if len(encoded) >= TOKEN_BYTES:
+            raise ValueError(f"Access token is {len(encoded)} bytes, broker only has room for {TOKEN_BYTES - 1}.")
+        with self.token.get_lock():
+            self.token.value = encoded
+            self.version.value += 1
+
+    def add(self, connection):
+        self.connections.append(connection)
+
+    def remove(self, connection):
+        # Only the broker thread calls this, when a dead worker's pipe reads EOF.
+        if connection in self.connections:
+            self.connections.remove(connection)
+        connection.close()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._serve, name="token-broker", daemon=True)
+        self._thread.start()
+
+    def _serve(self):
+        while not self._stop.is_set():
+            for connection in wait(list(self.connections), timeout=0.5) if self.connections else ():
+                try:
+                    request = connection.recv()
+                except (EOFError, OSError):
+                    self.remove(connection) # Worker went away, the host notices and restarts it.
+                    continue
+                try:
+                    if request.get('op') == 'refresh':
+                        reply = {'ok': True, 'token': self.tokens.refresh_if_stale(request.get('seen'))}
+                    else:
+                        reply = {'ok': True, 'token': self.tokens.access_token}
+                except Exception as e:
+                    self.log.error(f"Token broker failed a {request.get('op')} request: {e}")
+                    reply = {'ok': False, 'error': str(e)}
+                try:
+                    connection.send(reply)
+                except (OSError, EOFError):
+                    self.remove(connection) # Died while we were refreshing, the others still need the broker.
+            if not self.connections:
+                self._stop.wait(0.5)
+
+    def stop(self):
+        self._stop.set()
+        if self.publish in self.tokens.on_refresh:
+            self.tokens.on_refresh.remove(self.publish)
+
+class BrokeredTokens:
+    """Worker side stand in for Tokens. No password, no decryption and no oauth, the bearer comes from the
+    parent. Trader only touches access_token, account_hash, base_install and refresh_if_stale.
+    """
+
+    def __init__(self, client, connection, token, version, account_hash, base_install, poll=0.25):
+        self.client = client
+        self.connection = connection
+        self.token = token
+        self.version = version
+        self.account_hash = account_hash
+        self.base_install = base_install
+        self.base_url = client.base_url
+        self._seen_version = -1
+        self._lock = threading.Lock()
+        self._sync()
+        client.on_unauthorized = self.refresh_if_stale
+        threading.Thread(target=self._watch, args=(poll,), name="token-watch", daemon=True).start()
+
+    @property
+    def access_token(self):
+        return self.client.access_token
+
+    def _sync(self):
+        if self.version.value != self._seen_version:
+            with self.token.get_lock():
+                self._seen_version = self.version.value
+                self.client.set_bearer(self.token.value.decode())
+
+    def _watch(self, poll):
+        while True:
+            time.sleep(poll)
+            self._sync()
+
+    def refresh_if_stale(self, seen_token=None):
+        self._sync()
+        if seen_token is not None and seen_token != self.access_token:
+            return self.access_token # Parent already refreshed, the shared token was newer.
+        with self._lock:
+            self.connection.send({'op': 'refresh', 'seen': seen_token})
+            reply = self.connection.recv()
+        if not reply['ok']:
+            raise PermissionError(f"Token broker couldn't refresh: {reply['error']}")
+        self.client.set_bearer(reply['token'])
+        return reply['token']
+
+def _worker_main(spec, class_name, connection, token, version, account_hash, settings, stop):
+    # Runs in the child. Imports happen here so a spawned worker only loads what its strategy needs.
+    from client import Client
+    from rate_limiter import RateLimiter
+    from strategy import LiveRunner
+    from trader import Trader
+
+    log = Log()
+    strategy_class = next(cls for cls in load_strategies(spec) if cls.__name__ == class_name)
+    args = argparse.Namespace(**settings)
+    # Same file backed bucket as the parent, every process on the host shares schwab's request budget.
+    limiter = RateLimiter(rate=2.0, capacity=10, path=os.path.join(args.install_path, 'ratelimit.bucket'))
+    client = Client(base_url=args.base_url, limiter=limiter)
+    trader = Trader(args, client=client)
+    trader._tokens = BrokeredTokens(client, connection, token, version, account_hash, args.install_path)
+    client.authenticate = None
+    runner = LiveRunner(trader, strategy_class(), interval=args.interval)
+
+    parent = os.getppid()
+
+    def watch_stop():
+        # A polled flag rather than a multiprocessing.Event, a worker that dies inside Event.wait
+        # leaves the condition's sleeper count behind and the parent's set() blocks forever.
+        # A worker whose host died stops too, nothing would refresh its token anymore.
+        while not stop.value and os.getppid() == parent:
+            time.sleep(0.5)
+        runner.stop()
+
+    threading.Thread(target=watch_stop, name="stop-watch", daemon=True).start()
+    log.success(f"{class_name} running in pid {os.getpid()}")
+    runner.run()
+
+class StrategyHost:
+    """Owns the one Trader/Tokens and runs each strategy class in its own process.
+
+    Workers are spawned, not forked, so they don't inherit the parent's threads or locks. A worker that
+    dies is restarted with backoff, up to max_restarts times.
+    """
+
+    def __init__(self, trader, specs, interval=60, max_restarts=5):
+        self.trader = trader
+        self.specs = list(specs)
+        self.interval = interval
+        self.max_restarts = max_restarts
+        self.context = multiprocessing.get_context('spawn')
+        self.stop_event = threading.Event()
+        self.stop_flag = self.context.Value('b', 0, lock=False) # What workers watch, see _worker_main.
+        self.log = Log()
+        self.broker = None
+        self.workers = {} # class name -> [spec, process, parent connection, restarts]
+
+    def _settings(self):
+        args = self.trader.args
+        return {'install_path': args.install_path, 'base_url': self.trader.client.base_url,
+                'startup': False, 'refresh_token': False, 'auto_refresh_token': False, 'interval': self.interval}
+
+    def _spawn(self, spec, class_name, restarts=0):
+        parent_end, child_end = self.context.Pipe()
+        process = self.context.Process(target=_worker_main, name=f"strategy-{class_name}",
+                                       args=(spec, class_name, child_end, self.broker.token, self.broker.version,
+                                             self.trader.tokens.account_hash, self._settings(), self.stop_flag))
+        process.start()
+        child_end.close()
+        self.broker.add(parent_end)
+        self.workers[class_name] = [spec, process, parent_end, restarts]
+
+    def start(self):
+        tokens = self.trader.tokens # Decrypt, refresh and fetch account hashes once, here.
+        tokens.account_hash
+        tokens.start_refresher()
+        self.broker = TokenBroker(tokens, self.context)
+        self.broker.start()
+        for spec in self.specs:
+            for strategy_class in load_strategies(spec):
+                self._spawn(spec, strategy_class.__name__)
+
+    def check(self):
+        """Restart any worker that exited while the host is still running."""
+        for class_name, (spec, process, connection, restarts) in list(self.workers.items()):
+            if process.is_alive() or self.stop_event.is_set():
+                continue
+            if restarts >= self.max_restarts:
+                self.log.error(f"{class_name} exited with {process.exitcode} {restarts} times, giving up on it.")
+                del self.workers[class_name]
+                continue
+            delay = min(2 ** restarts, 60)
+            self.log.warning(f"{class_name} exited with {process.exitcode}, restarting in {delay}s.")
+            time.sleep(delay)
+            self._spawn(spec, class_name, restarts + 1)
+
+    def run_forever(self):
+        self.start()
+        try:
+            while self.workers and not self.stop_event.is_set():
+                self.check()
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def stop(self, timeout=10):
+        self.stop_event.set()
+        self.stop_flag.value = 1
+        for _, process, connection, _ in self.workers.values():
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        if self.broker is not None:
+            self.broker.stop()
+        self.trader.tokens.stop_refresher()
@@ -0,0 +1,273 @@
+# streamer.py
+# First party asyncio client for the Schwab streamer websocket, level one quotes and order books.
+# Author: Calvin Seamons
+# Last Updated: 18 October, 2026
+
+# Imports
+# ------------------ #
+import asyncio
+import inspect
+import itertools
+import json
+import websockets
+
+# From Imports
+# ------------------ #
+from collections import deque, OrderedDict
+
+# Local File Imports
+# ------------------ #
+from log_obj import Log
+
+LEVEL_ONE_FIELDS = "0,1,2,3,4,5,8,9,34,35" # symbol, bid, ask, last, bid/ask size, volume, last size, quote/trade time
+BOOK_FIELDS = "0,1,2,3"                    # symbol, book time, bids, asks
+
+class StreamQueue:
+    """Bounded queue between the socket reader and a subscription's consumer.
+
+    When full, 'drop_oldest' throws away the oldest message and 'coalesce' keeps one pending message per
+    symbol, merging newer fields into it, so a slow handler costs stale data instead of unbounded memory.
+    """
+
+    def __init__(self, maxsize=1000, overflow="drop_oldest"):
+        if overflow not in ("drop_oldest", "coalesce"):
+            raise ValueError(f"Unknown overflow policy '{overflow}', use 'drop_oldest' or 'coalesce'.")
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.dropped = 0
+        self._items = OrderedDict() if overflow == "coalesce" else deque()
+        self._ready = asyncio.Event()
+        self._sequence = itertools.count()
+
+    def __len__(self):
+        return len(self._items)
+
+    def put(self, message):
+        if self.overflow == "coalesce":
+            key = message.get("key")
+            if key is None:
+                key = ("seq", next(self._sequence)) # Nothing to coalesce on, behaves like drop_oldest.
+            pending = self._items.get(key)
+            if pending is not None:
+                pending.update(message) # Same symbol still waiting, newer fields win, queue doesn't grow.
+            else:
+                if len(self._items) >= self.maxsize:
+                    self._items.popitem(last=False)
+                    self.dropped += 1
+                self._items[key] = dict(message)
+        else:
+            if len(self._items) >= self.maxsize:
+                self._items.popleft()
+                self.dropped += 1
+            self._items.append(message)
+        self._ready.set()
+
+    def converted(self, maxsize=None, overflow=None):
+        """New queue with another size or policy, holding whatever is still pending here."""
+        queue = StreamQueue(maxsize or self.maxsize, overflow or self.overflow)
+        for message in (self._items.values() if self.overflow == "coalesce" else self._items):
+            queue.put(message)
+        queue.dropped = self.dropped
+        return queue
+
+    async def get(self):
+        while not self._items:
+            self._ready.clear()
+            await self._ready.wait()
+        if self.overflow == "coalesce":
+            return self._items.popitem(last=False)[1]
+        return self._items.popleft()
+
+class Streamer:
+    """Streams schwab market data over one websocket on the caller's event loop.
+
+    Logs in with the Tokens access token, keeps every subscription so a dropped connection is reopened
+    and resubscribed automatically. Pass url/streamer_info to point it at a local stand-in server.
+    """
+
+    def __init__(self, tokens, url=None, streamer_info=None, max_queue=1000, overflow="drop_oldest",
+                 reconnect_delay=1, max_reconnect_delay=30):
+        self.tokens = tokens
+        self.url = url
+        self.streamer_info = streamer_info
+        self.max_queue = max_queue
+        self.overflow = overflow
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.log = Log()
+        self.subscriptions = {} # service -> {'keys': [...], 'fields': str, 'queue': StreamQueue}
+        self.handlers = {}      # service -> [handler tasks]
+        self._websocket = None
+        self._request_id = itertools.count()
+        self._closed = False
+        self._logged_in = asyncio.Event()
+
+    async def _load_streamer_info(self):
+        if self.streamer_info is None:
+            response = await asyncio.to_thread(self.tokens.client.get, '/trader/v1/userPreference')
+            response.raise_for_status()
+            self.streamer_info = response.json()['streamerInfo'][0]
+        if self.url is None:
+            self.url = self.streamer_info['streamerSocketUrl']
+
+    def _request(self, service, command, parameters):
+        return {"requestid": str(next(self._request_id)), "service": service, "command": command,
+                "SchwabClientCustomerId": self.streamer_info.get('schwabClientCustomerId'),
+                "SchwabClientCorrelId": self.streamer_info.get('schwabClientCorrelId'),
+                "parameters": parameters}
+
+    async def _send(self, *requests):
+        await self._websocket.send(json.dumps({"requests": list(requests)}, separators=(',', ':')))
+
+    async def _login(self):
+        await self._send(self._request("ADMIN", "LOGIN", {
+            "Authorization": self.tokens.access_token,
+            "SchwabClientChannel": self.streamer_info.get('schwabClientChannel'),
+            "SchwabClientFunctionId": self.streamer_info.get('schwabClientFunctionId')}))
+        while True: # Anything before the login response (heartbeats) is ignored.
+            message = json.loads(await self._websocket.recv())
+            for response in message.get("response", []):
+                if response.get("command") == "LOGIN":
+                    content = response.get("content", {})
+                    if content.get("code") != 0:
+                        raise PermissionError(f"Streamer login failed: {content.get('msg')}")
+                    return
+
+    async def connect(self):
+        await self._load_streamer_info()
+        self._websocket = await websockets.connect(self.url)
+        await self._login()
+        if self.subscriptions: # Reconnects put every subscription back in one frame.
+            await self._send(*(self._request(service, "SUBS", {"keys": ",".join(sub['keys']), "fields": sub['fields']})
+                               for service, sub in self.subscriptions.items()))
+        self._logged_in.set()
+        self.log.success(f"Streamer connected, {len(self.subscriptions)} subscriptions active.")
+
+    def queue(self, service) -> StreamQueue:
+        return self.subscriptions[service]['queue']
+
+    async def subscribe(self, service, keys, fields) -> StreamQueue:
+        keys = [key.upper() for key in keys]
+        sub = self.subscriptions.get(service)
+        if sub is None:
+            sub = self.subscriptions[service] = {'keys': [], 'fields': fields,
+                                                 'queue': StreamQueue(self.max_queue, self.overflow)}
+        command = "ADD" if sub['keys'] else "SUBS"
+        new_keys = [key for key in keys if key not in sub['keys']]
+        sub['keys'].extend(new_keys)
+        sub['fields'] = fields
+        if self._logged_in.is_set() and new_keys:
+            await self._send(self._request(service, command, {"keys": ",".join(new_keys), "fields": fields}))
+        return sub['queue']
+
+    async def unsubscribe(self, service, keys):
+        sub = self.subscriptions.get(service)
+        if sub is None:
+            return
+        keys = [key.upper() for key in keys]
+        sub['keys'] = [key for key in sub['keys'] if key not in keys]
+        if self._logged_in.is_set():
+            await self._send(self._request(service, "UNSUBS", {"keys": ",".join(keys)}))
+
+    async def level_one_equities(self, keys, fields=LEVEL_ONE_FIELDS) -> StreamQueue:
+        return await self.subscribe("LEVELONE_EQUITIES", keys, fields)
+
+    async def nasdaq_book(self, keys, fields=BOOK_FIELDS) -> StreamQueue:
+        return await self.subscribe("NASDAQ_BOOK", keys, fields)
+
+    async def nyse_book(self, keys, fields=BOOK_FIELDS) -> StreamQueue:
+        return await self.subscribe("NYSE_BOOK", keys, fields)
+
+    def add_handler(self, service, handler, max_queue=None, overflow=None):
+        """Run handler(message) for every message of service, sync or async, on its own task.
+
+        max_queue/overflow apply to the service's queue. If subscribe() already made it with other settings
+        it's rebuilt with them, unless another handler is consuming it, then they're ignored with a warning.
+        """
+        sub = self.subscriptions.setdefault(service, {'keys': [], 'fields': BOOK_FIELDS if service.endswith("BOOK") else LEVEL_ONE_FIELDS,
+                                                      'queue': StreamQueue(max_queue or self.max_queue, overflow or self.overflow)})
+        queue = sub['queue']
+        if (overflow or queue.overflow) != queue.overflow or (max_queue or queue.maxsize) != queue.maxsize:
+            if any(not task.done() for task in self.handlers.get(service, [])):
+                self.log.warning(f"{service} queue already has a handler, keeping its {queue.overflow} policy "
+                                 f"(maxsize {queue.maxsize}) instead of {overflow or queue.overflow} (maxsize {max_queue or queue.maxsize}).")
+            else:
+                queue = sub['queue'] = queue.converted(max_queue, overflow)
+
+        async def consume():
+            while True:
+                message = await queue.get()
+                try:
+                    result = handler(message)
+                    if inspect.isawaitable(result):
+                        await result
+                except Exception as e:
+                    self.log.error(f"{service} handler failed: {e}")
+
+        task = asyncio.ensure_future(consume())
+        self.handlers.setdefault(service, []).append(task)
+        return task
+
+    def _dispatch(self, message):
+        for data in message.get("data", []):
+            sub = self.subscriptions.get(data.get("service"))
+            if sub is None:
+                continue
+            for content in data.get("content", []):
+                content["service"] = data["service"]
+                content["timestamp"] = data.get("timestamp")
+                sub['queue'].put(content)
+
+    async def _drop_socket(self):
+        websocket, self._websocket = self._websocket, None
+        self._logged_in.clear()
+        if websocket is not None:
+            try:
+                await websocket.close()
+            except Exception:
+                pass # Already broken, all we want is the socket released.
+
+    async def run(self):
+        """Receive until close(), reconnecting with exponential backoff whenever the socket drops.
+
+        Anything short of cancellation reconnects: dropped sockets, rejected handshakes (InvalidStatus),
+        a failed userPreference lookup or a bad frame. A rejected login refreshes the token first.
+        """
+        delay = self.reconnect_delay
+        while not self._closed:
+            try:
+                if self._websocket is None:
+                    await self.connect()
+                async for raw in self._websocket:
+                    self._dispatch(json.loads(raw))
+                    delay = self.reconnect_delay
+            except PermissionError as e:
+                # Usually an access token that expired while we were disconnected.
+                self.log.warning(f"{e}, refreshing token before reconnecting.")
+                try:
+                    await asyncio.to_thread(self.tokens.refresh_if_stale, self.tokens.access_token)
+                except Exception as refresh_error:
+                    self.log.error(f"Streamer token refresh failed: {refresh_error}")
+            except Exception as e:
+                if self._closed:
+                    break
+                self.log.warning(f"Streamer disconnected ({type(e).__name__}: {e}), reconnecting in {delay}s.")
+            await self._drop_socket()
+            if self._closed:
+                break
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def close(self):
+        self._closed = True
+        self._logged_in.clear()
+        for tasks in self.handlers.values():
+            for task in tasks:
+                task.cancel()
+        if self._websocket is not None:
+            try:
+                await self._send(self._request("ADMIN", "LOGOUT", {}))
+            except websockets.ConnectionClosed:
+                pass
+            await self._websocket.close()
+            self._websocket = None
@@ -0,0 +1,13 @@
+# conftest.py
+# Puts the repo root and benchmarks/ on sys.path, the modules are flat files.
+# Author: Calvin Seamons
+# Last Updated: 18 October, 2026
+
+# Imports
+# ------------------ #
+import os
+import sys
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+sys.path.insert(0, os.path.join(REPO, 'benchmarks')) # mock_server and mock_streamer
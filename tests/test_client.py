@@ -0,0 +1,53 @@
+# test_client.py
+# Client retry/breaker behaviour that doesn't need a server.
+# Author: Calvin Seamons
+# Last Updated: 18 October, 2026
+
+# Imports
+# ------------------ #
+import pytest
+import requests
+import time
+
+# Local File Imports
+# ------------------ #
+from client import Client
+from resilience import CircuitOpenError
+
+class TimingOutLimiter:
+    def acquire(self, priority, timeout=None):
+        raise TimeoutError("No rate limit token in time.")
+
+def half_open(client, path):
+    breaker = client.breakers.get(f"GET {path.strip('/')}")
+    breaker.opened_at = time.monotonic() - breaker.reset_timeout - 1
+    assert breaker.state == "half_open"
+    return breaker
+
+def test_limiter_timeout_during_trial_releases_breaker():
+    client = Client(base_url="http://127.0.0.1:9", limiter=TimingOutLimiter())
+    breaker = half_open(client, "/trader/v1/accounts")
+    for _ in range(2): # The second call would be CircuitOpenError if the first left the trial running.
+        with pytest.raises(TimeoutError):
+            client.get("/trader/v1/accounts")
+    assert not breaker.trial_running
+    assert breaker.state == "half_open"
+
+def test_unexpected_error_during_trial_releases_breaker(monkeypatch):
+    client = Client(base_url="http://127.0.0.1:9")
+    breaker = half_open(client, "/trader/v1/accounts")
+
+    def broken(*args, **kwargs):
+        raise requests.exceptions.ChunkedEncodingError("Connection broken mid body.")
+
+    monkeypatch.setattr(client.session, "request", broken)
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        client.get("/trader/v1/accounts")
+    assert not breaker.trial_running
+
+def test_open_breaker_still_rejects():
+    client = Client(base_url="http://127.0.0.1:9")
+    breaker = client.breakers.get("GET trader/v1/accounts")
+    breaker.opened_at = time.monotonic()
+    with pytest.raises(CircuitOpenError):
+        client.get("/trader/v1/accounts")
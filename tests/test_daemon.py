@@ -0,0 +1,78 @@
+# test_daemon.py
+# Orders going through the daemon socket come out the other side as the same Order.
+# Author: Calvin Seamons
+# Last Updated: 18 October, 2026
+
+# Imports
+# ------------------ #
+import os
+import pytest
+import time
+
+# Local File Imports
+# ------------------ #
+from daemon import DaemonClient, TraderDaemon
+from orders import Order
+
+class RecordingTrader:
+    """Stands in for Trader, keeps whatever the daemon hands it."""
+
+    def __init__(self):
+        self.placed = []
+
+    def __getattr__(self, name): # The daemon maps every op up front, only orders are exercised here.
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        def unsupported(*args, **kwargs):
+            raise NotImplementedError(name)
+        return unsupported
+
+    def place_order(self, order, account_hash=None):
+        self.placed.append((order, account_hash))
+        return f"order-{len(self.placed)}"
+
+    def place_orders(self, orders, account_hash=None):
+        return [self.place_order(order, account_hash) for order in orders]
+
+@pytest.fixture
+def daemon(tmp_path):
+    trader = RecordingTrader()
+    path = os.path.join(tmp_path, 'trader.sock')
+    server = TraderDaemon(trader, path)
+    server.start()
+    deadline = time.monotonic() + 5
+    while not os.path.exists(path):
+        assert time.monotonic() < deadline, "Daemon never started listening."
+        time.sleep(0.01)
+    client = DaemonClient(path)
+    yield trader, client
+    client.close()
+    server.shutdown()
+
+def bracket():
+    entry = Order('AAPL', 'BUY', 1, 'LIMIT', price=180)
+    exits = Order.oco(Order('AAPL', 'SELL', 1, 'LIMIT', price=200), Order('AAPL', 'SELL', 1, 'STOP', stop_price=150))
+    return Order.trigger(entry, exits)
+
+def test_order_round_trips_positionally(daemon):
+    trader, client = daemon
+    order = bracket()
+    assert client.place_order(order, 'HASH1') == "order-1" # Same call shape as Trader.place_order.
+    placed, account_hash = trader.placed[0]
+    assert isinstance(placed, Order)
+    assert placed.payload == order.payload
+    assert account_hash == 'HASH1'
+
+def test_order_fields_as_keywords(daemon):
+    trader, client = daemon
+    client.place_order(symbol='MSFT', instruction='BUY', quantity=2, account_hash='HASH2')
+    placed, account_hash = trader.placed[0]
+    assert placed.payload == Order('MSFT', 'BUY', 2).payload
+    assert account_hash == 'HASH2'
+
+def test_place_orders_round_trip(daemon):
+    trader, client = daemon
+    orders = [bracket(), Order('MSFT', 'BUY', 1)]
+    assert client.place_orders(orders) == ["order-1", "order-2"]
+    assert [placed.payload for placed, _ in trader.placed] == [order.payload for order in orders]
@@ -0,0 +1,57 @@
+# test_indicators.py
+# Batch indicators over stacked, NaN padded histories.
+# Author: Calvin Seamons
+# Last Updated: 18 October, 2026
+
+# Imports
+# ------------------ #
+import numpy as np
+import pytest
+
+# Local File Imports
+# ------------------ #
+import indicators
+
+LONG = 100 + np.sin(np.arange(30) / 3.0) * 5 + np.arange(30) * 0.1
+SHORT = 50 + np.cos(np.arange(10) / 2.0) * 2
+
+@pytest.mark.parametrize("name, args", [("sma", (3,)), ("ema", (5,)), ("rsi", (4,))])
+def test_padded_rows_match_unpadded(name, args):
+    function = getattr(indicators, name)
+    stacked = indicators.stack([{'close': LONG}, {'close': SHORT}])
+    out = function(stacked, *args)
+    np.testing.assert_allclose(out[0], function(LONG, *args), equal_nan=True)
+    np.testing.assert_allclose(out[1, -len(SHORT):], function(SHORT, *args), equal_nan=True)
+    assert np.isnan(out[1, :-len(SHORT)]).all()
+    assert np.isfinite(out[1, -3:]).all()
+
+def test_padded_atr_matches_unpadded():
+    stacked = indicators.stack([{'close': LONG}, {'close': SHORT}])
+    out = indicators.atr(stacked + 1, stacked - 1, stacked, 3)
+    np.testing.assert_allclose(out[1, -len(SHORT):], indicators.atr(SHORT + 1, SHORT - 1, SHORT, 3))
+
+def test_ema_span_one_is_the_input():
+    np.testing.assert_array_equal(indicators.ema([1.0, 2.0, 3.0], 1), [1.0, 2.0, 3.0])
+
+@pytest.mark.parametrize("seeded", [5, 15, 25]) # Short row: all padding, all padding, partly padding.
+@pytest.mark.parametrize("batch, rolling", [
+    (lambda c: indicators.sma(c, 8), lambda h: indicators.RollingSMA(8, history=h)),
+    (lambda c: indicators.ema(c, 5), lambda h: indicators.RollingEMA(5, history=h)),
+    (lambda c: indicators.rsi(c, 4), lambda h: indicators.RollingRSI(4, history=h)),
+])
+def test_rolling_matches_batch_on_stacked_histories(seeded, batch, rolling):
+    stacked = indicators.stack([{'close': LONG}, {'close': SHORT}])
+    expected = batch(stacked)
+    live = rolling(stacked[:, :seeded])
+    for t in range(seeded, stacked.shape[1]):
+        np.testing.assert_allclose(live.update(stacked[:, t]), expected[:, t], equal_nan=True, err_msg=f"t={t}")
+
+@pytest.mark.parametrize("seeded", [5, 15, 25])
+def test_rolling_atr_matches_batch_on_stacked_histories(seeded):
+    stacked = indicators.stack([{'close': LONG}, {'close': SHORT}])
+    high, low = stacked + 1, stacked - 1.5
+    expected = indicators.atr(high, low, stacked, 3)
+    live = indicators.RollingATR(3, high[:, :seeded], low[:, :seeded], stacked[:, :seeded])
+    for t in range(seeded, stacked.shape[1]):
+        np.testing.assert_allclose(live.update(high[:, t], low[:, t], stacked[:, t]), expected[:, t], equal_nan=True,
+                                   err_msg=f"t={t}")
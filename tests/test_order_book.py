@@ -0,0 +1,34 @@
+# test_order_book.py
+# BookSide's running cumulative sizes against a plain sum after random level changes.
+# Author: Calvin Seamons
+# Last Updated: 18 October, 2026
+
+# Imports
+# ------------------ #
+import pytest
+import random
+
+# Local File Imports
+# ------------------ #
+from order_book import ASK, BID, BookSide
+
+@pytest.mark.parametrize("side", [BID, ASK])
+def test_depth_matches_sum_of_best_levels(side):
+    rng = random.Random(7)
+    book = BookSide(side)
+    for step in range(2000):
+        price = round(100 + rng.randint(-40, 40) * 0.01, 2)
+        size = 0 if rng.random() < 0.3 else rng.randint(1, 50) * 100
+        book.update(price, size)
+        sizes = [size for _, size in book.levels()]
+        for n in (0, 1, 3, 10, len(sizes), len(sizes) + 5):
+            assert book.depth(n) == pytest.approx(sum(sizes[:n])), f"step {step}, n={n}"
+
+def test_clear_resets_depth():
+    book = BookSide(BID)
+    book.update(10.0, 100)
+    book.update(9.99, 200)
+    book.clear()
+    assert book.depth(5) == 0.0
+    book.update(9.98, 300)
+    assert book.depth(5) == 300
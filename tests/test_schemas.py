@@ -0,0 +1,26 @@
+# test_schemas.py
+# Typed quote decoding, the 'errors' entry stays out of the Quote structs.
+# Author: Calvin Seamons
+# Last Updated: 18 October, 2026
+
+# Imports
+# ------------------ #
+import json
+
+# Local File Imports
+# ------------------ #
+import schemas
+
+def test_quotes_with_errors_entry():
+    raw = json.dumps({'AAPL': {'symbol': 'AAPL', 'assetMainType': 'EQUITY', 'quote': {'lastPrice': 190.5}},
+                      'errors': {'invalidSymbols': ['BAD1'], 'invalidSSIDs': ['123']}}).encode()
+    quotes = schemas.decode_quotes(raw)
+    assert quotes['errors'] == {'invalidSymbols': ['BAD1'], 'invalidSSIDs': ['123']}
+    assert type(quotes['AAPL']) is schemas.Quote
+    assert quotes['AAPL'].quote.last_price == 190.5
+    assert schemas.Quote.__struct_fields__ == ('symbol', 'asset_main_type', 'realtime', 'quote')
+
+def test_quotes_without_errors_entry():
+    quotes = schemas.decode_quotes(b'{"MSFT": {"symbol": "MSFT", "quote": {"bidPrice": 410.1}}}')
+    assert list(quotes) == ['MSFT']
+    assert quotes['MSFT'].quote.bid_price == 410.1
@@ -0,0 +1,113 @@
+# test_streamer.py
+# Streamer reconnects against benchmarks/mock_streamer.py, and handler queue policies.
+# Author: Calvin Seamons
+# Last Updated: 18 October, 2026
+
+# Imports
+# ------------------ #
+import asyncio
+import os
+import pytest
+
+# Local File Imports
+# ------------------ #
+from client import Client
+from mock_server import MockSchwab
+from quote_bus import QuoteBus
+from streamer import Streamer
+
+class FakeTokens:
+    # What Streamer touches on Tokens: client, access_token and refresh_if_stale.
+    def __init__(self, mock, client, access_token):
+        self.mock = mock
+        self.client = client
+        self.access_token = access_token
+        self.refreshes = 0
+
+    def refresh_if_stale(self, seen_token=None):
+        self.refreshes += 1
+        self.access_token = self.mock.issue()['access_token']
+        self.client.set_bearer(self.access_token)
+        return self.access_token
+
+@pytest.fixture
+def mock():
+    server = MockSchwab(stream_interval=0.02)
+    server.start()
+    yield server
+    server.stop()
+
+def make_streamer(mock, access_token):
+    client = Client(base_url=mock.url())
+    # userPreference gets a valid bearer, access_token is what the streamer logs in with.
+    client.set_bearer(mock.issue()['access_token'])
+    tokens = FakeTokens(mock, client, access_token)
+    return Streamer(tokens, reconnect_delay=0.05, max_reconnect_delay=0.2), tokens
+
+async def next_tick(queue, timeout=5):
+    return await asyncio.wait_for(queue.get(), timeout)
+
+def test_reconnects_after_drop_and_rejected_handshakes(mock):
+    async def scenario():
+        streamer, _ = make_streamer(mock, mock.issue()['access_token'])
+        queue = await streamer.level_one_equities(['AAPL'])
+        runner = asyncio.ensure_future(streamer.run())
+        try:
+            assert (await next_tick(queue))['key'] == 'AAPL'
+            mock.streamer.reject_next(2) # InvalidStatus twice, then a normal handshake.
+            await asyncio.to_thread(mock.streamer.drop) # Blocks until the client answers the close.
+            while queue._items: # Ticks that arrived before the drop.
+                await queue.get()
+            await asyncio.sleep(0.1)
+            assert (await next_tick(queue))['key'] == 'AAPL' # Resubscribed on the new connection.
+            assert mock.streamer.rejected == 2
+            assert mock.streamer.logins == 2
+            assert not runner.done()
+        finally:
+            await streamer.close()
+            await asyncio.wait_for(runner, 5)
+
+    asyncio.run(scenario())
+
+def test_denied_login_refreshes_token_and_reconnects(mock):
+    async def scenario():
+        streamer, tokens = make_streamer(mock, "expired-token")
+        queue = await streamer.level_one_equities(['MSFT'])
+        runner = asyncio.ensure_future(streamer.run())
+        try:
+            assert (await next_tick(queue))['key'] == 'MSFT'
+            assert tokens.refreshes == 1
+            assert mock.streamer.logins == 1
+        finally:
+            await streamer.close()
+            await asyncio.wait_for(runner, 5)
+        for _ in range(100): # The server thread notices the close a moment later.
+            if not mock.streamer.connections:
+                break
+            await asyncio.sleep(0.02)
+        assert not mock.streamer.connections # The denied socket was closed too, not leaked.
+
+    asyncio.run(scenario())
+
+def test_quote_bus_gets_coalesce_after_subscribe():
+    async def scenario():
+        streamer = Streamer(tokens=None)
+        queue = await streamer.level_one_equities(['AAPL']) # Not connected, only records the subscription.
+        queue.put({'key': 'AAPL', '1': 10.0})
+        bus = QuoteBus(name=f"test_bus_{os.getpid()}", capacity=16, max_symbols=4)
+        try:
+            bus.attach(streamer)
+            converted = streamer.queue("LEVELONE_EQUITIES")
+            assert converted.overflow == "coalesce"
+            for _ in range(100): # The pending tick moved over and reaches the bus.
+                if bus.ids:
+                    break
+                await asyncio.sleep(0.01)
+            assert 'AAPL' in bus.ids
+            streamer.add_handler("LEVELONE_EQUITIES", lambda message: None, overflow="drop_oldest")
+            assert streamer.queue("LEVELONE_EQUITIES") is converted # In use, only warned about.
+        finally:
+            await streamer.close()
+            bus.close()
+
+    asyncio.run(scenario())
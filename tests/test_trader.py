@@ -0,0 +1,69 @@
+# test_trader.py
+# Trader against benchmarks/mock_server.py, lazy token loading and account fan out.
+# Author: Calvin Seamons
+# Last Updated: 18 October, 2026
+
+# Imports
+# ------------------ #
+import argparse
+import os
+import pytest
+import threading
+import time
+
+# Local File Imports
+# ------------------ #
+import startup
+from client import Client
+from mock_server import MockSchwab
+from token_store import TokenStore
+from trader import Trader
+
+@pytest.fixture
+def mock():
+    server = MockSchwab(accounts=2)
+    server.issue(startup.ACCESS_TOKEN, startup.REFRESH_TOKEN)
+    server.start()
+    yield server
+    server.stop()
+
+def build_trader(install_path, mock):
+    args = argparse.Namespace(install_path=str(install_path), base_url=mock.url(), startup=False,
+                              refresh_token=False, auto_refresh_token=False)
+    return Trader(args, client=Client(base_url=mock.url()))
+
+def in_thread(call, timeout=10):
+    # A deadlock would hang pytest forever, run it on a daemon thread and give up after timeout.
+    result = {}
+
+    def run():
+        try:
+            result['value'] = call()
+        except BaseException as e:
+            result['error'] = e
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "call deadlocked"
+    if 'error' in result:
+        raise result['error']
+    return result['value']
+
+def test_tokens_with_stale_access_token_refresh_without_deadlock(tmp_path, mock):
+    startup.build_install(str(tmp_path))
+    stale = time.time() - 2000 # Past Tokens.ACCESS_TOKEN_LIFETIME, Tokens.__init__ refreshes over http.
+    TokenStore(str(tmp_path)).update(access_token_time=stale, refresh_token_time=stale)
+    trader = build_trader(tmp_path, mock)
+    tokens = in_thread(lambda: trader.tokens)
+    assert tokens.access_token != startup.ACCESS_TOKEN # Refreshed through the mock's oauth endpoint.
+    assert in_thread(lambda: tokens.account_hash)[0]['hashValue'] == "MOCKHASH0000"
+    assert trader.client.get('/marketdata/v1/AAPL/quotes').status_code == 200
+
+def test_all_transactions_defaults_to_a_window(tmp_path, mock):
+    startup.build_install(str(tmp_path))
+    trader = build_trader(tmp_path, mock)
+    result = in_thread(trader.all_transactions) # The mock 400s, like schwab, when either date is missing.
+    assert result == {'transactions': [], 'errors': {}}
+    start, end = trader._transaction_window()
+    assert start.endswith('.000Z') and end.endswith('.000Z') and start < end
@@ -0,0 +1,126 @@
+# token_store.py
+# Single encrypted token store, replaces tokens.yaml + timer.yaml with one atomically written file.
+# Author: Calvin Seamons
+# Last Updated: 18 October, 2026
+
+# Imports
+# ------------------ #
+import json
+import os
+import tempfile
+import threading
+import yaml
+
+# Local File Imports
+# ------------------ #
+from encryption import decrypt_file_with_password, is_file_encrypted
+from vault import vault, SALT_SIZE
+
+MAGIC = b"SATS"  # Schwab Auto Trader Store
+VERSION = 1
+
+class TokenStore:
+    """tokens, issue times and account hashes in one encrypted, versioned file.
+
+    File layout is MAGIC + version byte + 16 byte salt + fernet(compact json). Writes go to a temp file
+    in the same directory, get fsync'd and are renamed over the old store, so a reader in any process
+    sees either the old snapshot or the new one, never a half written or plaintext file.
+    """
+
+    FILENAME = "token-store.bin"
+
+    def __init__(self, install_path):
+        self.install_path = install_path
+        self.path = os.path.join(install_path, self.FILENAME)
+        self._lock = threading.Lock()
+        self._salt = None
+        self._mtime = None
+        self._data = None
+
+    def _empty(self):
+        return {'tokens': {}, 'access_token_time': 0, 'refresh_token_time': 0, 'account_hash': None}
+
+    def load(self) -> dict:
+        """Return the current snapshot, only decrypting again when the file was replaced."""
+        with self._lock:
+            try:
+                stat = os.stat(self.path)
+            except FileNotFoundError:
+                if self._data is None:
+                    self._data = self._migrate_legacy()
+                return dict(self._data)
+            if self._data is not None and self._mtime == stat.st_mtime_ns:
+                return dict(self._data)
+
+            with open(self.path, 'rb') as store:
+                blob = store.read()
+            if blob[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"{self.path} is not a schwab-auto-trader token store.")
+            version = blob[len(MAGIC)]
+            if version != VERSION:
+                raise ValueError(f"Unsupported token store version {version}, expected {VERSION}.")
+            offset = len(MAGIC) + 1
+            self._salt = blob[offset:offset + SALT_SIZE]
+            payload = vault.fernet(self._salt).decrypt(blob[offset + SALT_SIZE:])
+            self._data = {**self._empty(), **json.loads(payload)}
+            self._mtime = stat.st_mtime_ns
+            return dict(self._data)
+
+    def update(self, **fields) -> dict:
+        """Merge fields into the snapshot and persist it with a single atomic write."""
+        self.load()
+        with self._lock:
+            data = {**self._data, **fields}
+            self._write(data)
+            self._data = data
+            return dict(data)
+
+    def _write(self, data):
+        if self._salt is None:
+            self._salt = os.urandom(SALT_SIZE)
+        payload = json.dumps(data, separators=(',', ':')).encode()
+        blob = MAGIC + bytes([VERSION]) + self._salt + vault.fernet(self._salt).encrypt(payload)
+
+        os.makedirs(self.install_path, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".token-store.", dir=self.install_path)
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                tmp.write(blob)
+                tmp.flush()
+                os.fsync(tmp.fileno())
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._fsync_dir()
+        self._mtime = os.stat(self.path).st_mtime_ns
+
+    def _fsync_dir(self):
+        try:
+            dir_fd = os.open(self.install_path, os.O_RDONLY)
+        except OSError:
+            return # Not every platform lets you open a directory, the rename is still atomic.
+        try:
+            os.fsync(dir_fd)
+        except OSError:
+            pass
+        finally:
+            os.close(dir_fd)
+
+    def _migrate_legacy(self) -> dict:
+        """Seed the store from the old tokens.yaml and timer.yaml if they are still around."""
+        data = self._empty()
+        token_file = os.path.join(self.install_path, 'tokens.yaml')
+        timer_file = os.path.join(self.install_path, 'timer.yaml')
+        if is_file_encrypted(token_file) and os.path.getsize(token_file) > SALT_SIZE:
+            data['tokens'] = decrypt_file_with_password(token_file) or {}
+        if os.path.isfile(timer_file):
+            with open(timer_file, 'r') as yaml_file:
+                timer = yaml.safe_load(yaml_file) or {}
+            data['access_token_time'] = timer.get('access_token_time', 0)
+            data['refresh_token_time'] = timer.get('refresh_token_time', 0)
+        if data['tokens']:
+            self._write(data)
+        return data
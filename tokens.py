@@ -8,11 +8,9 @@
 import base64
 import logging
 import os
-import requests
 import sys
+import threading
 import time
-import webbrowser
-import yaml
 
 # From Imports
 # ------------------ #
@@ -21,16 +19,27 @@ from pathlib import Path
 
 # Local File Imports
 # ------------------ #
-from encryption import decrypt_file_with_password, encrypt_file_with_password
+from client import Client
+from encryption import decrypt_file_with_password
+from token_store import TokenStore
 
 class Tokens:
-    
-    def __init__(self, args):
-        self.base_url =  "https://api.schwabapi.com"
+    ACCESS_TOKEN_LIFETIME = 1700  # Seconds we trust an access token for, schwab expires them at 1800.
+    REFRESH_TOKEN_WARNING = 475200 # 5 days 12 hours, refresh token is close to its 7 day limit.
+    REFRESH_TOKEN_LIFETIME = 604800 # 7 days, refresh token is expired and --startup is needed.
+
+    def __init__(self, args, client=None):
+        self.client = client if client is not None else Client()
+        self.access_token_time = 0
+        self.refresh_token_time = 0
+        self._refresh_lock = threading.Lock() # Single flight, only one refresh hits schwab at a time.
+        self._refresher = None
+        self._refresher_stop = threading.Event()
+        self.on_refresh = [] # Called with the new access token after every refresh, the strategy host's broker listens here.
+        self.base_url = self.client.base_url
         self.base_install = args.install_path
-        self.tokenfile = os.path.join(self.base_install, 'tokens.yaml')
         self.credfile = os.path.join(self.base_install, 'schwab-credentials.yaml')
-        self.timefile = os.path.join(self.base_install, 'timer.yaml')
+        self.store = TokenStore(self.base_install) # tokens, timers and account hashes, one encrypted file.
         self.log = Log()
 
         time_experation = self.check_time()
@@ -46,18 +55,28 @@ class Tokens:
         token_cred = self.get_token_creds()
         self.refresh_token = token_cred['refresh_token']
         self.access_token = token_cred['access_token']
-        self.account_hash = self.get_account_hash()
+        self.client.set_bearer(self.access_token)
+        self.client.on_unauthorized = self.refresh_if_stale # A 401 anywhere triggers one shared refresh.
+        self._account_hash = None
+        if self.client.metrics is not None:
+            self.client.metrics.token_age = self.token_age
+
+    @property
+    def account_hash(self):
+        # Fetched on first use, scripts that only pull market data never hit accountNumbers.
+        if self._account_hash is None:
+            self._account_hash = self.get_account_hash()
+        return self._account_hash
 
 
     def get_account_hash(self):
         try:
-            hash = requests.get(f'https://api.schwabapi.com/trader/v1/accounts/accountNumbers',
-                           headers={'Authorization': f'Bearer {self.access_token}'},
-                            timeout=5)
-            hash = hash.json()
+            hash = self.client.get_json('/trader/v1/accounts/accountNumbers') # Cached for a day when the client has a cache.
+            if hash != self.store.load()['account_hash']: # Only costs a write when the accounts changed.
+                self.store.update(account_hash=hash)
             return hash
         except Exception as e:
-            self.log.error("Unable to get AccountHash. Account Trades cannot be conducted.",True)
+            self.log.error("Unable to get AccountHash. Account Trades cannot be conducted.", kill=True)
 
 
     def get_app_creds(self):
@@ -73,32 +92,34 @@ class Tokens:
             self.log.error("schwab-credentials.yaml doesn't exist in ~/.schwab_auto_trader. run --startup.")
 
     def get_token_creds(self):
-        if os.path.isfile(self.tokenfile):
-            return decrypt_file_with_password(self.tokenfile)
+        tokens = self.store.load()['tokens']
+        if tokens:
+            return tokens
         else:
-            self.log.error("tokens.yaml doesn't exist in ~/.schwab_auto_trader. run --startup.")
+            self.log.error(f"No tokens in {self.store.path}. run --startup.")
 
-    def check_time(self): # Checks the experation time of the tokenfile.
+    def check_time(self): # Checks the experation time of the token store.
         current_time = time.time() # Get Current Time.
         access_time = None
         refresh_time = None
         try:
-            with open(self.timefile, 'rb') as timefile:
-                data = yaml.safe_load(timefile)
-                old_refresh_time = data['refresh_token_time']  
-                old_access_time = data['access_token_time']  
+            data = self.store.load()
+            old_refresh_time = data['refresh_token_time']
+            old_access_time = data['access_token_time']
         except Exception as e:
-            self.log.error(str(e) + " Something went wrong, check the timer.yaml file and make sure there at ints set.")
+            self.log.error(str(e) + f" Something went wrong, check {self.store.path} or run --startup.", kill=True)
 
+        self.access_token_time = old_access_time
+        self.refresh_token_time = old_refresh_time
         access_time = current_time - old_access_time # Age of Schwab Access Token.
         refresh_time = current_time - old_refresh_time # Age of Schwab Refresh Token.
 
-        if  access_time > 1700 and refresh_time < 475200:
+        if  access_time > self.ACCESS_TOKEN_LIFETIME and refresh_time < self.REFRESH_TOKEN_WARNING:
             self._refresh_token()
             # We dont return becuase we still want to see refresh age.
-        elif refresh_time > 604800: # Your token is most likely expired, refresh needed.
+        elif refresh_time > self.REFRESH_TOKEN_LIFETIME: # Your token is most likely expired, refresh needed.
             return True
-        elif refresh_time > 475200: # If token file hasn't been updated in 5days12hr it is expiring soon.
+        elif refresh_time > self.REFRESH_TOKEN_WARNING: # If token file hasn't been updated in 5days12hr it is expiring soon.
             self.log.warning("Your refresh token may expire soon. Please run --startup")
             return False
         else:
@@ -113,7 +134,7 @@ class Tokens:
         except Exception as e:
             self.log.error(e)
         
-        auth_url = f"https://api.schwabapi.com/v1/oauth/authorize?client_id={app_key}&redirect_uri=https://127.0.0.1"
+        auth_url = f"{self.base_url}/v1/oauth/authorize?client_id={app_key}&redirect_uri=https://127.0.0.1"
 
         self.log.info("Click to authenticate:")
         return app_key, app_secret, auth_url
@@ -140,17 +161,14 @@ class Tokens:
         return headers, payload
     
     def retrieve_tokens(self,headers, payload) -> dict:
-        init_token_response = requests.post(
-            url="https://api.schwabapi.com/v1/oauth/token",
-            headers=headers,
-            data=payload,
-        )
+        init_token_response = self.client.post('/v1/oauth/token', headers=headers, data=payload)
 
         init_tokens_dict = init_token_response.json()
         return init_tokens_dict
 
     def build_cred(self):
         app_key, app_secret, cs_auth_url = self.construct_init_auth_url()
+        import webbrowser # Only needed for the interactive login.
         webbrowser.open(cs_auth_url)
         self.log.info("Paste Returned URL:")
         returned_url = input("\nPaste Returned URL:")
@@ -158,21 +176,14 @@ class Tokens:
         init_tokens_dict = self.retrieve_tokens(headers=init_token_headers, payload=init_token_payload)
         self.log.success("Authentication with Schwab successful.")
 
-        # Setting timer file to track refresh token expiration 
-        # We can use yaml.dump becuase all values need to be changed so we just overwrite it.
+        # Tokens and both timers are reset together, one atomic write to the store.
         refresh_token_time = time.time() # Both access and refresh are reset here so i reuse the var.
-        refresh_data = {'refresh_token_time': refresh_token_time, 'access_token_time': refresh_token_time}
-        with open(self.timefile, 'w') as yaml_file:
-            yaml.dump(refresh_data, yaml_file, default_flow_style=False)
-
-
-        if os.path.isfile(self.tokenfile): #We are resetting tokens so delete if present. 
-            os.remove(self.tokenfile)
-        with open(self.tokenfile, 'w') as yaml_file:
-            yaml.dump(init_tokens_dict, yaml_file, default_flow_style=False)
-        encrypt_file_with_password(self.tokenfile)
+        self.refresh_token_time = self.access_token_time = refresh_token_time
+        self.store.update(tokens=init_tokens_dict, refresh_token_time=refresh_token_time,
+                          access_token_time=refresh_token_time)
 
     def _refresh_token(self):
+        start = time.perf_counter()
         app_cred = self.get_app_creds() # Retrieve 
         app_key = app_cred['app_key']
         app_secret = app_cred['app_secret']
@@ -188,11 +199,7 @@ class Tokens:
             "Content-Type": "application/x-www-form-urlencoded",
         }
 
-        refresh_token_response = requests.post(
-            url="https://api.schwabapi.com/v1/oauth/token",
-            headers=headers,
-            data=payload,
-        )
+        refresh_token_response = self.client.post('/v1/oauth/token', headers=headers, data=payload)
 
         if refresh_token_response.status_code == 200:
             self.log.success("Retrieved new tokens successfully using refresh token.")
@@ -200,36 +207,76 @@ class Tokens:
             self.log.error(
                 f"Error refreshing access token: {refresh_token_response.text}"
             )
+            self._observe_refresh(start, ok=False)
             return None
 
         refresh_token_dict = refresh_token_response.json()
 
         access_token_time = time.time()
-        refresh_data = {'access_token_time': access_token_time}
-
-        with open(self.timefile, 'r') as yaml_file:
-            yaml_content = yaml.safe_load(yaml_file)
-            print(yaml_content)
-            for key, value in refresh_data.items():
-                if isinstance(value, dict) and key in yaml_content:
-                    yaml_content[key].update(value)
-                else:
-                    yaml_content[key] = value
-            # Write the updated content back to the file
-            print(yaml_content)
-        with open(self.timefile, 'w') as file:
-            #print(str(refresh_data))
-            yaml.dump(yaml_content, file, default_flow_style=False)
-
-        if os.path.isfile(self.tokenfile): #We are resetting tokens so delete if present. 
-            os.remove(self.tokenfile)
-
-        with open(self.tokenfile, 'w') as yaml_file:
-            yaml.dump(refresh_token_dict, yaml_file, default_flow_style=False)
-        encrypt_file_with_password(self.tokenfile)
+        self.access_token_time = access_token_time
+        # New tokens and access time land in the store together, readers never see a half refresh.
+        self.store.update(tokens={**token_cred, **refresh_token_dict}, access_token_time=access_token_time)
 
         os.environ['secret_access_token'] = refresh_token_dict['access_token']
+        self.access_token = refresh_token_dict['access_token']
+        self.refresh_token = refresh_token_dict.get('refresh_token', getattr(self, 'refresh_token', None))
+        self.client.set_bearer(self.access_token) # Every request on the shared session now uses the new token.
+        for callback in self.on_refresh:
+            callback(self.access_token)
         self.log.info("Token dict refreshed.")
+        self._observe_refresh(start)
 
         return refresh_token_dict
 
+    def _observe_refresh(self, start, ok=True):
+        if self.client.metrics is not None:
+            self.client.metrics.observe_token_refresh(time.perf_counter() - start, ok)
+
+    def refresh_if_stale(self, seen_token=None):
+        """Refresh the access token once no matter how many threads ask at the same time.
+
+        seen_token is the bearer the caller was rejected with, if another thread already swapped it
+        out while we waited on the lock we just hand back the new one instead of refreshing again.
+        """
+        with self._refresh_lock:
+            if seen_token is not None and seen_token != self.access_token:
+                return self.access_token
+            self._refresh_token()
+            return self.access_token
+
+    def token_age(self):
+        current_time = time.time()
+        return current_time - self.access_token_time, current_time - self.refresh_token_time
+
+    def start_refresher(self, margin=120, interval=15):
+        """Start a daemon thread that refreshes the access token margin seconds before it goes stale."""
+        if self._refresher is not None and self._refresher.is_alive():
+            return self._refresher
+        self._refresher_stop.clear()
+        self._refresher = threading.Thread(target=self._refresh_loop, args=(margin, interval),
+                                           name="token-refresher", daemon=True)
+        self._refresher.start()
+        return self._refresher
+
+    def stop_refresher(self):
+        self._refresher_stop.set()
+        if self._refresher is not None:
+            self._refresher.join(timeout=5)
+            self._refresher = None
+
+    def _refresh_loop(self, margin, interval):
+        warned = False
+        while not self._refresher_stop.wait(interval):
+            access_age, refresh_age = self.token_age()
+            if refresh_age > self.REFRESH_TOKEN_LIFETIME:
+                self.log.error("Your refresh token has expired, run --startup to sign into schwab again.")
+                return
+            if refresh_age > self.REFRESH_TOKEN_WARNING and not warned:
+                self.log.warning("Your refresh token may expire soon. Please run --startup")
+                warned = True
+            if access_age > self.ACCESS_TOKEN_LIFETIME - margin:
+                stale = self.access_token
+                try:
+                    self.refresh_if_stale(stale)
+                except Exception as e:
+                    self.log.error(f"Background token refresh failed: {e}")
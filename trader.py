@@ -3,92 +3,367 @@
 import datetime
 import os
 import requests
+import threading
 import urllib.parse
 import json
 
+from concurrent.futures import ThreadPoolExecutor
+
+from client import Client
+from orders import Order, order_id_from_location
+from rate_limiter import RateLimiter
+from response_cache import ResponseCache
 from tokens import Tokens
 from log_obj import Log
 
 class Trader:
+    QUOTE_CHUNK_SIZE = 100 # Symbols per /quotes call, keeps the query string well under schwab's url limit.
+    TRANSACTION_WINDOW_DAYS = 60 # Used when no dates are given, schwab rejects a transactions call without both.
 
-    def __init__(self, args):
-        self.tokens = Tokens(args)
+    def __init__(self, args, client=None):
+        # Trader and Tokens share one pooled session so auth and trade calls reuse the same sockets.
+        # The default limiter's bucket is a file in the install path, so every process on this host
+        # running against the same app shares schwab's 120 requests a minute.
+        if client is None:
+            limiter = RateLimiter(rate=2.0, capacity=10, path=os.path.join(args.install_path, 'ratelimit.bucket'))
+            cache = ResponseCache(path=os.path.join(args.install_path, 'response-cache.bin'))
+            metrics = None
+            if getattr(args, 'metrics_port', None) or getattr(args, 'metrics_file', None):
+                from metrics import Metrics # Only processes that export metrics pay for measuring.
+                metrics = Metrics()
+            client = Client(base_url=getattr(args, 'base_url', None), limiter=limiter, cache=cache, metrics=metrics)
+        self.client = client
+        self.args = args
+        self._tokens = None
+        self._tokens_lock = threading.RLock()
+        self._tokens_loading = False
+        # Decrypting, refreshing and the accounts call wait for the first request instead of startup.
+        self.client.authenticate = self._load_tokens
         self.log = Log()
-        self.timeout = 5
+        self.timeout = self.client.timeout
+
+    def _load_tokens(self):
+        if self._tokens is None:
+            with self._tokens_lock:
+                # Tokens.__init__ may refresh over http, that request comes back here through
+                # client.authenticate on the same thread. Let it through, Tokens handles its own auth.
+                if self._tokens is None and not self._tokens_loading:
+                    self._tokens_loading = True
+                    try:
+                        tokens = Tokens(self.args, client=self.client)
+                        if getattr(self.args, 'auto_refresh_token', False):
+                            tokens.start_refresher() # Keeps long running strategies authenticated past 30min.
+                        self._tokens = tokens
+                    finally:
+                        self._tokens_loading = False
+        return self._tokens
+
+    @property
+    def tokens(self) -> Tokens:
+        return self._load_tokens()
 
     def _params_parser(self, params: dict):
         for key in list(params.keys()):
             if params[key] is None: del params[key]
         return params
 
+    def accounts(self, fields: str = None, typed: bool = False) -> list:
+        """Every linked account, fields='positions' adds holdings. typed returns schemas.Account structs."""
+        data = self.client.get('/trader/v1/accounts', params=self._params_parser({'fields': fields}))
+        data.raise_for_status()
+        if typed:
+            import schemas # msgspec only loads for callers that ask for structs.
+            return schemas.decode_accounts(data.content)
+        return data.json()
+
+    def orders(self, account_hash: str = None, from_entered_time: str = None, to_entered_time: str = None,
+               max_results: int = None, status: str = None, typed: bool = False) -> list:
+        # Without an account hash schwab returns orders for every linked account.
+        path = f'/trader/v1/accounts/{account_hash}/orders' if account_hash else '/trader/v1/orders'
+        data = self.client.get(path, params=self._params_parser({'fromEnteredTime': from_entered_time,
+                                                                 'toEnteredTime': to_entered_time,
+                                                                 'maxResults': max_results,
+                                                                 'status': status}))
+        data.raise_for_status()
+        if typed:
+            import schemas
+            return schemas.decode_orders(data.content)
+        return data.json()
+
+    def _transaction_window(self, start_date: str = None, end_date: str = None) -> tuple:
+        # ISO-8601 in UTC with milliseconds, e.g. 2026-08-19T00:00:00.000Z, the only format schwab takes here.
+        end = datetime.datetime.now(datetime.timezone.utc)
+        start = end - datetime.timedelta(days=self.TRANSACTION_WINDOW_DAYS)
+        return (start_date or start.strftime('%Y-%m-%dT%H:%M:%S.000Z'),
+                end_date or end.strftime('%Y-%m-%dT%H:%M:%S.000Z'))
+
+    def transactions(self, account_hash: str = None, start_date: str = None, end_date: str = None,
+                     types: str = None, symbol: str = None, typed: bool = False) -> list:
+        """Transactions for one account, the last TRANSACTION_WINDOW_DAYS days unless start_date/end_date say otherwise."""
+        account_hash = account_hash or self._default_account_hash()
+        start_date, end_date = self._transaction_window(start_date, end_date)
+        data = self.client.get(f'/trader/v1/accounts/{account_hash}/transactions',
+                               params=self._params_parser({'startDate': start_date, 'endDate': end_date,
+                                                           'types': types, 'symbol': symbol}))
+        data.raise_for_status()
+        if typed:
+            import schemas
+            return schemas.decode_transactions(data.content)
+        return data.json()
+
+    def positions_tracker(self):
+        """PositionsTracker fed by this Trader, call poll() on it and subscribe() to the deltas."""
+        from positions import PositionsTracker # numpy only loads for code that tracks positions.
+        return PositionsTracker(self)
+
     def get_account_balance(self, fields: str = None):
-        data = requests.get(f'{self.tokens.base_url}/trader/v1/accounts/',
-                            headers={'Authorization': f'Bearer {self.tokens.access_token}'},
-                            params={'fields': fields},
-                            timeout=self.timeout)
+        data = self.client.get('/trader/v1/accounts/', params=self._params_parser({'fields': fields}))
         data = data.json()
         print(data)
     
 
     def quote(self, symbol_id: str, fields: str = None) -> requests.Response:
         
-        data =  requests.get(f'{self.tokens.base_url}/marketdata/v1/{urllib.parse.quote(symbol_id,safe="")}/quotes',
-                            headers={'Authorization': f'Bearer {self.tokens.access_token}'},
-                            params=self._params_parser({'fields': fields}),
-                            timeout=self.timeout)
+        data = self.client.get(f'/marketdata/v1/{urllib.parse.quote(symbol_id,safe="")}/quotes',
+                               params=self._params_parser({'fields': fields}))
         print(data)
 
-        
+    def quotes(self, symbols, fields: str = None, indicative: bool = None,
+               chunk_size: int = None, max_workers: int = 8, typed: bool = False) -> dict:
+        """Quote many symbols through /marketdata/v1/quotes, chunked and fetched concurrently.
+
+        Returns one symbol keyed dict. Symbols that failed are listed under 'errors' as
+        {symbol: reason}, a bad chunk or unknown symbol never fails the rest of the batch.
+        typed decodes each quote into a schemas.Quote struct instead of nested dicts.
+        """
+        if typed:
+            import schemas
+        decode = schemas.decode_quotes if typed else json.loads
+        chunk_size = chunk_size or self.QUOTE_CHUNK_SIZE
+        symbols = list(dict.fromkeys(s.strip().upper() for s in symbols if s and s.strip()))
+        chunks = [symbols[i:i + chunk_size] for i in range(0, len(symbols), chunk_size)]
+
+        def fetch(chunk):
+            try:
+                response = self.client.get('/marketdata/v1/quotes',
+                                           params=self._params_parser({'symbols': ','.join(chunk),
+                                                                       'fields': fields,
+                                                                       'indicative': indicative}))
+                if response.status_code != 200:
+                    return chunk, None, f"HTTP {response.status_code}"
+                return chunk, decode(response.content), None
+            except Exception as e:
+                return chunk, None, str(e)
+
+        result = {}
+        errors = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as pool:
+            for chunk, data, error in pool.map(fetch, chunks):
+                if error is not None:
+                    errors.update({symbol: error for symbol in chunk})
+                    continue
+                chunk_errors = data.pop('errors', None) or {}
+                for reason, bad_symbols in chunk_errors.items():
+                    errors.update({symbol: reason for symbol in bad_symbols})
+                result.update(data)
+                for symbol in chunk: # Anything schwab silently left out is still reported.
+                    if symbol not in data and symbol not in errors:
+                        errors[symbol] = "missing from response"
+        result['errors'] = errors
+        return result
+
+    def price_history(self, symbol: str, period_type: str = None, period: int = None,
+                      frequency_type: str = None, frequency: int = None,
+                      start_date: int = None, end_date: int = None,
+                      need_extended_hours_data: bool = None, need_previous_close: bool = None) -> dict:
+        return self._price_history_response(symbol, period_type, period, frequency_type, frequency, start_date,
+                                            end_date, need_extended_hours_data, need_previous_close).json()
+
+    def _price_history_response(self, symbol: str, period_type: str = None, period: int = None,
+                                frequency_type: str = None, frequency: int = None,
+                                start_date: int = None, end_date: int = None,
+                                need_extended_hours_data: bool = None, need_previous_close: bool = None):
+        # Dates are epoch milliseconds, same as the pricehistory endpoint expects.
+        data = self.client.get('/marketdata/v1/pricehistory',
+                               params=self._params_parser({'symbol': symbol, 'periodType': period_type,
+                                                           'period': period, 'frequencyType': frequency_type,
+                                                           'frequency': frequency, 'startDate': start_date,
+                                                           'endDate': end_date,
+                                                           'needExtendedHoursData': need_extended_hours_data,
+                                                           'needPreviousClose': need_previous_close}))
+        data.raise_for_status()
+        return data
+
+    def price_history_arrays(self, symbol: str, **params) -> dict:
+        """price_history decoded straight into {column: numpy array}, no per candle dicts get built."""
+        import schemas
+        return schemas.decode_candles(self._price_history_response(symbol, **params).content)
+
+    def option_chain(self, symbol: str, contract_type: str = None, strike_count: int = None,
+                     from_date: str = None, to_date: str = None, typed: bool = False):
+        data = self.client.get('/marketdata/v1/chains',
+                               params=self._params_parser({'symbol': symbol, 'contractType': contract_type,
+                                                           'strikeCount': strike_count,
+                                                           'fromDate': from_date, 'toDate': to_date}))
+        data.raise_for_status()
+        if typed:
+            import schemas
+            return schemas.decode_option_chain(data.content)
+        return data.json()
+
+    def history_store(self, root: str = None):
+        """PriceHistoryStore under the install path, fetching missing candles through this Trader."""
+        from price_history import PriceHistoryStore # numpy only gets imported by code that wants candles.
+        if root is None:
+            root = os.path.join(self.tokens.base_install, 'pricehistory')
+        return PriceHistoryStore(root, trader=self)
+
+    def _default_account_hash(self):
+        return self.tokens.account_hash[0]['hashValue']
+
+    def place_order(self, order: Order, account_hash: str = None) -> str:
+        """Submit one Order, returns the order id schwab puts in the Location header."""
+        account_hash = account_hash or self._default_account_hash()
+        response = self.client.post(f'/trader/v1/accounts/{account_hash}/orders',
+                                    data=order.body, headers={'Content-Type': 'application/json'})
+        if self.client.cache is not None:
+            self.client.cache.invalidate_account_state() # Balances and positions are stale now.
+        response.raise_for_status()
+        return order_id_from_location(response.headers.get('Location'))
+
+    def cancel_order(self, order_id, account_hash: str = None):
+        account_hash = account_hash or self._default_account_hash()
+        response = self.client.delete(f'/trader/v1/accounts/{account_hash}/orders/{order_id}')
+        if self.client.cache is not None:
+            self.client.cache.invalidate_account_state()
+        response.raise_for_status()
+        return order_id
+
+    def place_orders(self, batch, account_hash: str = None, max_workers: int = 16) -> list:
+        """Submit a basket of Orders concurrently over the pooled session.
+
+        Returns order ids in the same order as batch, an order that failed holds its exception instead.
+        """
+        account_hash = account_hash or self._default_account_hash()
+
+        def submit(order):
+            try:
+                return self.place_order(order, account_hash)
+            except Exception as e:
+                self.log.error(f"Order {order!r} failed: {e}")
+                return e
+
+        batch = list(batch)
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(batch)))) as pool:
+            return list(pool.map(submit, batch))
+
+    # ----------------------------------------- Multi Account ----------------------------------------- #
+    # Every linked account (IRA, brokerage, ...) queried at once over the pooled session. One account
+    # failing lands in 'errors' under its account number, the rest of the view is still returned.
+
+    def account(self, account_hash: str, fields: str = None) -> dict:
+        data = self.client.get(f'/trader/v1/accounts/{account_hash}', params=self._params_parser({'fields': fields}))
+        data.raise_for_status()
+        return data.json()
+
+    def _fan_out(self, fetch, max_workers: int = 8) -> tuple:
+        """fetch(account_hash) for every linked account concurrently -> ({number: result}, {number: reason})."""
+        linked = [(str(entry['accountNumber']), entry['hashValue']) for entry in self.tokens.account_hash]
+
+        def run(entry):
+            number, account_hash = entry
+            try:
+                return number, fetch(account_hash), None
+            except Exception as e:
+                self.log.error(f"Account ...{number[-4:]} failed: {e}")
+                return number, None, f"{type(e).__name__}: {e}"
+
+        results, errors = {}, {}
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(linked)))) as pool:
+            for number, result, error in pool.map(run, linked):
+                if error is None:
+                    results[number] = result
+                else:
+                    errors[number] = error
+        return results, errors
+
+    def all_balances(self) -> dict:
+        """currentBalances per account plus a 'total' with every numeric field summed."""
+        accounts, errors = self._fan_out(lambda account_hash: self.account(account_hash))
+        balances = {number: data['securitiesAccount'].get('currentBalances', {}) for number, data in accounts.items()}
+        total = {}
+        for account_balances in balances.values():
+            for key, value in account_balances.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    total[key] = total.get(key, 0) + value
+        return {'accounts': balances, 'total': total, 'errors': errors}
+
+    def all_positions(self) -> dict:
+        """Every position tagged with its account, plus 'by_symbol' netted across accounts."""
+        accounts, errors = self._fan_out(lambda account_hash: self.account(account_hash, fields='positions'))
+        positions, by_symbol = [], {}
+        for number, data in accounts.items():
+            for position in data['securitiesAccount'].get('positions') or []:
+                symbol = position.get('instrument', {}).get('symbol')
+                quantity = position.get('longQuantity', 0) - position.get('shortQuantity', 0)
+                positions.append({**position, 'accountNumber': number})
+                merged = by_symbol.setdefault(symbol, {'quantity': 0, 'marketValue': 0, 'cost': 0, 'accounts': []})
+                merged['quantity'] += quantity
+                merged['marketValue'] += position.get('marketValue', 0)
+                merged['cost'] += position.get('averagePrice', 0) * abs(quantity)
+                merged['accounts'].append(number)
+        for merged in by_symbol.values():
+            merged['averagePrice'] = merged.pop('cost') / abs(merged['quantity']) if merged['quantity'] else 0
+        return {'positions': positions, 'by_symbol': by_symbol, 'errors': errors}
+
+    def all_orders(self, from_entered_time: str = None, to_entered_time: str = None,
+                   max_results: int = None, status: str = None) -> dict:
+        """Orders from every account, newest first, each tagged with accountNumber."""
+        accounts, errors = self._fan_out(lambda account_hash: self.orders(account_hash, from_entered_time,
+                                                                          to_entered_time, max_results, status))
+        orders = [{**order, 'accountNumber': number} for number, rows in accounts.items() for order in rows]
+        orders.sort(key=lambda order: order.get('enteredTime', ''), reverse=True)
+        return {'orders': orders, 'errors': errors}
+
+    def all_transactions(self, start_date: str = None, end_date: str = None, types: str = None,
+                         symbol: str = None) -> dict:
+        """Transactions from every account, newest first, each tagged with accountNumber."""
+        start_date, end_date = self._transaction_window(start_date, end_date) # One window for every account.
+        accounts, errors = self._fan_out(lambda account_hash: self.transactions(account_hash, start_date,
+                                                                                end_date, types, symbol))
+        transactions = [{**row, 'accountNumber': number} for number, rows in accounts.items() for row in rows]
+        transactions.sort(key=lambda row: row.get('time', ''), reverse=True)
+        return {'transactions': transactions, 'errors': errors}
+
     def test(self):
         ticker = 'APPL'
-        url = f"https://api.schwab.com/marketdata/v1/{urllib.parse.quote({ticker},safe="")}/quotes"
-        headers = {
-            "Authorization": f"Bearer {self.tokens.access_token}",
-            "Content-Type": "application/json"
-        }
-        response = requests.get(url, headers=headers)
+        response = self.client.get(f'/marketdata/v1/{urllib.parse.quote(ticker, safe="")}/quotes')
         data = response.json()
         market_price = data.get("marketPrice")
         print("APPLE PRICE IS: " + str(market_price))
 
     def test2(self):
-        data = requests.get(f'{self.tokens.base_url}/marketdata/v1/pricehistory',
-                            headers={'Authorization': f'Bearer {self.tokens.access_token}'},
-                            params=({'symbol': 'AAPL'}))
+        data = self.client.get('/marketdata/v1/pricehistory', params=({'symbol': 'AAPL'}))
         
         data = data.json()
         print(data)
 
 
     def endpoint_discovery(self):
-        data = requests.get(f'{self.tokens.base_url}/marketdata/v1',
-                             headers = {'Authorization': f'Bearer {self.tokens.access_token}'},
-                             params=None)
+        data = self.client.get('/marketdata/v1', params=None)
         
         data = data.json()
         print(data)
 
     def account_info_stock_holdings(self):
-        hash = str(self.tokens.account_hash[0]['accountNumber'])
-        url = self.tokens.base_url + f'trader/v1/accounts'
-        headers = {"Authorization": "Bearer " + self.tokens.access_token}
-        payload = ({'symbol': 'AAPL'})
-
-        data = requests.get(f'{self.tokens.base_url}/trader/v1/accounts',
-                            headers={'Authorization': f'Bearer {self.tokens.access_token}'},
-                            params=(None))
-
-        #response = requests.get(url, headers=headers, params=payload)
-
-        if data.status_code == 200:
-            data = data.json()
-            #share_count = data["positionQuantity"]  
-            #print(f"You own {share_count} shares of AAPL") 
-            print(data)
-        else:
-            print("You are a Retard , fuck you! -- ", data.status_code)
-            data = data.json()
-            print(data)
+        # Every linked account, not just the first one.
+        holdings = self.all_positions()
+        #share_count = holdings['by_symbol']['AAPL']['quantity']
+        #print(f"You own {share_count} shares of AAPL")
+        print(holdings)
+        for number, reason in holdings['errors'].items():
+            # Retries and the 401 refresh already happened in the client, this is a real failure.
+            self.log.error(f"Account holdings request for ...{number[-4:]} failed: {reason}")
 
 
 
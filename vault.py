@@ -0,0 +1,104 @@
+# vault.py
+# In-memory credential vault, PBKDF2 runs once per salt and decrypted files stay cached for the process.
+# Author: Calvin Seamons
+# Last Updated: 18 October, 2026
+
+# Imports
+# ------------------ #
+import atexit
+import copy
+import hashlib
+import os
+import threading
+import yaml
+
+# From Imports
+# ------------------ #
+from cryptography.fernet import Fernet
+
+SALT_SIZE = 16 # Encrypted files are the 16 byte salt followed by the fernet token.
+
+class CredentialVault:
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._keys = {}    # salt -> (password digest, Fernet)
+        self._entries = {} # abs path -> (mtime_ns, size, salt, decrypted data)
+        self._salts = {}   # abs path -> last salt seen, so re-encryption can reuse the derived key.
+
+    def _password(self):
+        password = os.getenv("super_secret_sauce")
+        if not password:
+            raise ValueError("Environment variable 'super_secret_sauce' is not set.")
+        return password
+
+    def fernet(self, salt, password=None):
+        """Return the Fernet for this salt, deriving the key only the first time it is seen."""
+        from encryption import derive_key_from_password # Late import, encryption imports the vault.
+        password = password if password is not None else self._password()
+        digest = hashlib.sha256(password.encode()).digest()
+        with self._lock:
+            cached = self._keys.get(salt)
+            if cached is not None and cached[0] == digest:
+                return cached[1]
+            fernet = Fernet(derive_key_from_password(password, salt))
+            self._keys[salt] = (digest, fernet)
+            return fernet
+
+    def read(self, file_path):
+        """Decrypt file_path, served from memory until the file's mtime, size or salt changes."""
+        path = os.path.abspath(file_path)
+        with self._lock:
+            stat = os.stat(path)
+            with open(path, 'rb') as encrypted_file:
+                salt = encrypted_file.read(SALT_SIZE)
+                entry = self._entries.get(path)
+                if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size and entry[2] == salt:
+                    return copy.deepcopy(entry[3])
+                encrypted_data = encrypted_file.read()
+
+            data = yaml.safe_load(self.fernet(salt).decrypt(encrypted_data).decode())
+            self._entries[path] = (stat.st_mtime_ns, stat.st_size, salt, data)
+            self._salts[path] = salt
+            return copy.deepcopy(data)
+
+    def encrypt(self, file_path, plaintext: bytes):
+        """Encrypt plaintext into file_path, reusing the file's previous salt (and derived key) when known."""
+        path = os.path.abspath(file_path)
+        with self._lock:
+            salt = self._salts.get(path) or os.urandom(SALT_SIZE)
+            encrypted_data = self.fernet(salt).encrypt(plaintext)
+            with open(path, 'wb') as encrypted_file:
+                encrypted_file.write(salt + encrypted_data)
+            stat = os.stat(path)
+            self._salts[path] = salt
+            self._entries[path] = (stat.st_mtime_ns, stat.st_size, salt, yaml.safe_load(plaintext.decode()))
+            return encrypted_data
+
+    def write(self, file_path, data):
+        """Dump data as yaml and encrypt it straight to file_path, no plaintext copy touches disk."""
+        return self.encrypt(file_path, yaml.dump(data, default_flow_style=False).encode())
+
+    def invalidate(self, file_path=None):
+        with self._lock:
+            if file_path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(os.path.abspath(file_path), None)
+
+    def clear(self):
+        """Drop every cached key and decrypted file, registered to run at interpreter exit.
+
+        Best effort only. Fernet and the decrypted yaml hold immutable bytes/str copies that python can't
+        overwrite, this releases our references so they're freed, it doesn't zero the memory.
+        """
+        with self._lock:
+            self._keys.clear()
+            for entry in self._entries.values():
+                if isinstance(entry[3], dict):
+                    entry[3].clear()
+            self._entries.clear()
+            self._salts.clear()
+
+vault = CredentialVault()
+atexit.register(vault.clear)